@@ -32,7 +32,7 @@ async def quick_test():
             pagination={"page_size": 3, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**response)
+        api_response = GrantsAPIResponse.model_validate(response)
         opportunities = api_response.get_opportunities()
         
         print(f"   ✅ Found {len(opportunities)} opportunities")
@@ -50,7 +50,7 @@ async def quick_test():
             pagination={"page_size": 3, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**agency_response)
+        api_response = GrantsAPIResponse.model_validate(agency_response)
         agencies = api_response.get_agencies()
         
         print(f"   ✅ Found {len(agencies)} agencies")
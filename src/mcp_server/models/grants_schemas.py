@@ -1,9 +1,10 @@
 """Pydantic models for Simpler Grants API responses."""
 
+import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class OpportunitySummary(BaseModel):
@@ -25,6 +26,14 @@ class OpportunitySummary(BaseModel):
     applicant_types: Optional[List[str]] = None
     funding_category: Optional[str] = None
     funding_instrument: Optional[str] = None
+    
+    model_config = {"frozen": True}
+    
+    @field_validator("funding_category")
+    @classmethod
+    def intern_funding_category(cls, value: Optional[str]) -> Optional[str]:
+        """Intern the category, a lookup key repeated across a batch."""
+        return sys.intern(value) if value is not None else None
 
 
 class OpportunityV1(BaseModel):
@@ -41,7 +50,13 @@ class OpportunityV1(BaseModel):
     category: Optional[str] = None
     category_explanation: Optional[str] = None
     
-    model_config = {"extra": "allow"}  # Allow additional fields from API
+    model_config = {"extra": "allow", "frozen": True}  # Allow additional fields from API
+    
+    @field_validator("agency_code")
+    @classmethod
+    def intern_agency_code(cls, value: str) -> str:
+        """Intern the agency code, a lookup key repeated across a batch."""
+        return sys.intern(value)
 
 
 class AgencyV1(BaseModel):
@@ -89,7 +104,7 @@ class GrantsAPIResponse(BaseModel):
         opportunities = []
         for item in self.data:
             try:
-                opportunities.append(OpportunityV1(**item))
+                opportunities.append(OpportunityV1.model_validate(item))
             except Exception as e:
                 # Log but don't fail on individual item parsing errors
                 print(f"Error parsing opportunity: {e}")
@@ -100,7 +115,7 @@ class GrantsAPIResponse(BaseModel):
         agencies = []
         for item in self.data:
             try:
-                agencies.append(AgencyV1(**item))
+                agencies.append(AgencyV1.model_validate(item))
             except Exception as e:
                 # Log but don't fail on individual item parsing errors
                 print(f"Error parsing agency: {e}")
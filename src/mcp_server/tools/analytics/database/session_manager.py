@@ -10,8 +10,33 @@ from typing import Any, Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 import threading
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+GRANT_SCORE_INSERT = """
+    INSERT OR REPLACE INTO grant_scores (
+        opportunity_id, opportunity_title, overall_score,
+        technical_fit_score, competition_index, roi_score,
+        timing_score, success_probability,
+        score_breakdown, recommendation, calculation_version
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _dumps_score_breakdown(score_breakdown: Dict[str, Any]) -> str:
+    """Serialize a score breakdown to JSON text for the score_breakdown column."""
+    if orjson is not None:
+        try:
+            # Breakdowns built from batch arrays may hold NumPy scalars
+            return orjson.dumps(score_breakdown, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:  # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(score_breakdown)
+
 
 class AsyncSQLiteManager:
     """
@@ -175,22 +200,10 @@ class AsyncSQLiteManager:
             cursor = conn.cursor()
             
             try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO grant_scores (
-                        opportunity_id, opportunity_title, overall_score,
-                        technical_fit_score, competition_index, roi_score,
-                        timing_score, success_probability,
-                        score_breakdown, recommendation, calculation_version
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(GRANT_SCORE_INSERT, self._grant_score_row(
                     opportunity_id, opportunity_title, overall_score,
-                    score_components.get('technical_fit', 0),
-                    score_components.get('competition_index', 0),
-                    score_components.get('roi_score', 0),
-                    score_components.get('timing_score', 0),
-                    score_components.get('success_probability', 0),
-                    json.dumps(score_breakdown),
-                    recommendation, calculation_version
+                    score_components, score_breakdown, recommendation,
+                    calculation_version
                 ))
                 
                 conn.commit()
@@ -203,6 +216,60 @@ class AsyncSQLiteManager:
         
         return await asyncio.get_event_loop().run_in_executor(None, _store)
     
+    async def store_grant_scores_batch(
+        self,
+        scores: List[Tuple[str, str, float, Dict[str, float], Dict[str, Any], str]],
+        calculation_version: str = "3.0.0"
+    ) -> bool:
+        """
+        Store many grant scores in a single transaction.
+        
+        Each score holds the store_grant_score arguments up to recommendation.
+        """
+        if not scores:
+            return True
+        
+        def _store():
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                cursor.executemany(GRANT_SCORE_INSERT, [
+                    self._grant_score_row(*score, calculation_version) for score in scores
+                ])
+                
+                conn.commit()
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error storing grant scores: {e}")
+                conn.rollback()
+                return False
+        
+        return await asyncio.get_event_loop().run_in_executor(None, _store)
+    
+    @staticmethod
+    def _grant_score_row(
+        opportunity_id: str,
+        opportunity_title: str,
+        overall_score: float,
+        score_components: Dict[str, float],
+        score_breakdown: Dict[str, Any],
+        recommendation: str,
+        calculation_version: str
+    ) -> Tuple:
+        """Build the GRANT_SCORE_INSERT parameters for a grant score."""
+        return (
+            opportunity_id, opportunity_title, overall_score,
+            score_components.get('technical_fit', 0),
+            score_components.get('competition_index', 0),
+            score_components.get('roi_score', 0),
+            score_components.get('timing_score', 0),
+            score_components.get('success_probability', 0),
+            _dumps_score_breakdown(score_breakdown),
+            recommendation, calculation_version
+        )
+    
     async def get_grant_score(
         self, 
         opportunity_id: str,
@@ -280,7 +280,7 @@ def register_grant_match_scorer_tool(mcp: Any, context: Dict[str, Any]) -> None:
                         pagination=pagination_params
                     )
                     
-                    api_response = GrantsAPIResponse(**response_data)
+                    api_response = GrantsAPIResponse.model_validate(response_data)
                     opportunities = api_response.get_opportunities()
                     
                     # Cache the results
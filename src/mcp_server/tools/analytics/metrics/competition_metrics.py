@@ -2,6 +2,7 @@
 
 import logging
 import math
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
@@ -10,6 +11,47 @@ from mcp_server.models.analytics_schemas import ScoreBreakdown, IndustryConstant
 
 logger = logging.getLogger(__name__)
 
+# Agency-specific application volume multipliers (based on historical data)
+APPLICATION_AGENCY_MULTIPLIERS = {
+    'NIH': 1.2,      # NIH grants tend to be more competitive
+    'NSF': 1.0,      # Baseline
+    'DOE': 0.8,      # Slightly less competitive
+    'DOD': 0.7,      # More specialized, fewer applicants
+    'NASA': 0.9,
+    'EPA': 0.8,
+    'USDA': 0.7,
+}
+
+# Category-specific application volume adjustments
+APPLICATION_CATEGORY_MULTIPLIERS = {
+    'Health': 1.3,           # Very competitive
+    'Science/Technology': 1.2,
+    'Education': 1.1,
+    'Environment': 1.0,
+    'Agriculture': 0.8,
+    'Transportation': 0.7,
+}
+
+
+@lru_cache(maxsize=512)
+def get_category_multiplier(funding_category: Optional[str]) -> float:
+    """
+    Get the application volume multiplier for a funding category.
+    
+    Cached, since the opportunities of a batch share a few dozen categories.
+    
+    Args:
+        funding_category: Category of funding
+        
+    Returns:
+        Multiplier of the first matching category, or 1.0
+    """
+    if funding_category:
+        for cat, mult in APPLICATION_CATEGORY_MULTIPLIERS.items():
+            if cat.lower() in funding_category.lower():
+                return mult
+    return 1.0
+
 
 class CompetitionIndexCalculator:
     """
@@ -81,42 +123,78 @@ class CompetitionIndexCalculator:
         else:
             base_applications = 150
         
-        # Agency-specific multipliers (based on historical data)
-        agency_multipliers = {
-            'NIH': 1.2,      # NIH grants tend to be more competitive
-            'NSF': 1.0,      # Baseline
-            'DOE': 0.8,      # Slightly less competitive
-            'DOD': 0.7,      # More specialized, fewer applicants
-            'NASA': 0.9,
-            'EPA': 0.8,
-            'USDA': 0.7,
-        }
-        
         # Extract main agency code (first part)
         main_agency = agency_code.split('-')[0] if agency_code else 'OTHER'
-        multiplier = agency_multipliers.get(main_agency, 1.0)
+        multiplier = APPLICATION_AGENCY_MULTIPLIERS.get(main_agency, 1.0)
         
         # Category-specific adjustments
-        category_multipliers = {
-            'Health': 1.3,           # Very competitive
-            'Science/Technology': 1.2,
-            'Education': 1.1,
-            'Environment': 1.0,
-            'Agriculture': 0.8,
-            'Transportation': 0.7,
-        }
-        
-        if funding_category:
-            for cat, mult in category_multipliers.items():
-                if cat.lower() in funding_category.lower():
-                    multiplier *= mult
-                    break
+        multiplier *= get_category_multiplier(funding_category)
         
         estimated_apps = int(base_applications * multiplier)
         logger.debug(f"Estimated applications: {estimated_apps} for {agency_code} ${award_ceiling}")
         
         return max(5, estimated_apps)  # Minimum 5 applications
     
+    def estimate_applications_batch(
+        self,
+        award_ceiling: np.ndarray,
+        award_floor: np.ndarray,
+        agencies: np.ndarray,
+        agency_index: np.ndarray,
+        funding_categories: List[Optional[str]]
+    ) -> np.ndarray:
+        """
+        Estimate number of applications for a batch of opportunities.
+        
+        Vectorized form of estimate_applications_from_funding.
+        
+        Args:
+            award_ceiling: Maximum award amounts (NaN where missing)
+            award_floor: Minimum award amounts (NaN where missing)
+            agencies: Distinct main agency codes in the batch
+            agency_index: Index into agencies for each opportunity
+            funding_categories: Category of funding for each opportunity
+            
+        Returns:
+            Array of estimated numbers of applications
+        """
+        award_amount = np.where(
+            np.isnan(award_ceiling),
+            np.where(np.isnan(award_floor), 100000.0, award_floor),
+            award_ceiling
+        )
+        base_applications = np.select(
+            [award_amount < 50000, award_amount < 100000, award_amount < 500000, award_amount < 1000000],
+            [20, 35, 60, 100],
+            default=150
+        )
+        
+        agency_table = np.array([APPLICATION_AGENCY_MULTIPLIERS.get(a, 1.0) for a in agencies])
+        category_multipliers = np.array([get_category_multiplier(c) for c in funding_categories])
+        multiplier = np.take(agency_table, agency_index) * category_multipliers
+        
+        estimated_apps = (base_applications * multiplier).astype(np.int64)
+        return np.maximum(5, estimated_apps)  # Minimum 5 applications
+    
+    def calculate_basic_competition_index_batch(
+        self,
+        estimated_applications: np.ndarray,
+        number_of_awards: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate basic Competition Index for a batch of opportunities.
+        
+        Args:
+            estimated_applications: Estimated numbers of applications
+            number_of_awards: Numbers of awards to be made
+            
+        Returns:
+            Array of Competition Index values
+        """
+        no_awards = number_of_awards <= 0
+        ci = (estimated_applications / np.where(no_awards, 1, number_of_awards)) * 100
+        return np.where(no_awards, 100.0, ci)  # Maximum competition if no awards
+    
     def calculate_weighted_competition_index(
         self,
         basic_ci: float,
@@ -257,7 +335,9 @@ class CompetitionIndexCalculator:
     def calculate_competition_score(
         self,
         opportunity: OpportunityV1,
-        reference_opportunities: Optional[List[OpportunityV1]] = None
+        reference_opportunities: Optional[List[OpportunityV1]] = None,
+        estimated_applications: Optional[int] = None,
+        basic_ci: Optional[float] = None
     ) -> ScoreBreakdown:
         """
         Calculate comprehensive Competition Index score.
@@ -265,6 +345,8 @@ class CompetitionIndexCalculator:
         Args:
             opportunity: Grant opportunity to score
             reference_opportunities: Optional list for percentile calculation
+            estimated_applications: Precomputed application estimate (optional)
+            basic_ci: Precomputed basic Competition Index (optional)
             
         Returns:
             ScoreBreakdown with transparent calculation
@@ -278,12 +360,15 @@ class CompetitionIndexCalculator:
             category = opportunity.summary.funding_category
             
             # Estimate applications
-            estimated_apps = self.estimate_applications_from_funding(
-                ceiling, floor, agency, category
-            )
+            estimated_apps = estimated_applications
+            if estimated_apps is None:
+                estimated_apps = self.estimate_applications_from_funding(
+                    ceiling, floor, agency, category
+                )
             
             # Calculate basic CI
-            basic_ci = self.calculate_basic_competition_index(estimated_apps, awards)
+            if basic_ci is None:
+                basic_ci = self.calculate_basic_competition_index(estimated_apps, awards)
             
             # Calculate weighted CI
             weighted_ci = self.calculate_weighted_competition_index(
@@ -9,6 +9,17 @@ from mcp_server.models.analytics_schemas import ScoreBreakdown, IndustryConstant
 
 logger = logging.getLogger(__name__)
 
+# Agency-specific application complexity multipliers
+AGENCY_COMPLEXITY_MULTIPLIERS = {
+    'NIH': 1.5,      # Complex requirements, detailed budgets
+    'NSF': 1.3,      # Moderate complexity
+    'DOE': 1.4,      # Technical complexity
+    'DOD': 1.6,      # High security/compliance requirements
+    'NASA': 1.4,     # Technical complexity
+    'EPA': 1.2,      # Moderate requirements
+    'USDA': 1.1,     # Simpler applications
+}
+
 
 class ROICalculator:
     """
@@ -55,18 +66,8 @@ class ROICalculator:
             base_hours = 200   # Very large grants
         
         # Agency-specific complexity multipliers
-        agency_multipliers = {
-            'NIH': 1.5,      # Complex requirements, detailed budgets
-            'NSF': 1.3,      # Moderate complexity
-            'DOE': 1.4,      # Technical complexity
-            'DOD': 1.6,      # High security/compliance requirements
-            'NASA': 1.4,     # Technical complexity
-            'EPA': 1.2,      # Moderate requirements
-            'USDA': 1.1,     # Simpler applications
-        }
-        
         main_agency = agency_code.split('-')[0] if agency_code else 'OTHER'
-        complexity_multiplier = agency_multipliers.get(main_agency, 1.2)
+        complexity_multiplier = AGENCY_COMPLEXITY_MULTIPLIERS.get(main_agency, 1.2)
         
         # Additional complexity factors
         if complexity_factors:
@@ -84,6 +85,38 @@ class ROICalculator:
         
         return cost_dollars, total_hours
     
+    def estimate_application_cost_batch(
+        self,
+        award_amount: np.ndarray,
+        agencies: np.ndarray,
+        agency_index: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Estimate application costs for a batch of opportunities.
+        
+        Vectorized form of estimate_application_cost without complexity factors.
+        
+        Args:
+            award_amount: Award amounts used to size the application
+            agencies: Distinct main agency codes in the batch
+            agency_index: Index into agencies for each opportunity
+            
+        Returns:
+            Tuple of (cost_dollars, hours_required) arrays
+        """
+        base_hours = np.select(
+            [award_amount < 50000, award_amount < 100000, award_amount < 500000, award_amount < 1000000],
+            [40, 60, 100, 150],
+            default=200
+        )
+        
+        agency_table = np.array([AGENCY_COMPLEXITY_MULTIPLIERS.get(a, 1.2) for a in agencies])
+        total_hours = (base_hours * np.take(agency_table, agency_index)).astype(np.int64)
+        
+        cost_dollars = total_hours * self.constants.ACADEMIC_HOURLY_RATE
+        
+        return cost_dollars, total_hours
+    
     def calculate_basic_roi(
         self,
         award_amount: float,
@@ -106,6 +139,25 @@ class ROICalculator:
         
         return ((award_amount - application_cost) / application_cost) * 100
     
+    def calculate_basic_roi_batch(
+        self,
+        award_amount: np.ndarray,
+        application_cost: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate basic ROI percentages for a batch of opportunities.
+        
+        Args:
+            award_amount: Expected award amounts
+            application_cost: Costs to prepare each application
+            
+        Returns:
+            Array of ROI percentages
+        """
+        no_cost = application_cost <= 0
+        roi = ((award_amount - application_cost) / np.where(no_cost, 1, application_cost)) * 100
+        return np.where(no_cost, 0.0, roi)
+    
     def calculate_effort_adjusted_roi(
         self,
         grant_roi: float,
@@ -228,7 +280,10 @@ class ROICalculator:
         self,
         opportunity: OpportunityV1,
         success_probability: float,
-        user_profile: Optional[Dict] = None
+        user_profile: Optional[Dict] = None,
+        application_cost: Optional[float] = None,
+        hours_required: Optional[int] = None,
+        basic_roi: Optional[float] = None
     ) -> ScoreBreakdown:
         """
         Calculate comprehensive ROI score.
@@ -237,6 +292,9 @@ class ROICalculator:
             opportunity: Grant opportunity to score
             success_probability: Success probability (0-100)
             user_profile: User research profile (optional)
+            application_cost: Precomputed application cost (optional)
+            hours_required: Precomputed application hours (optional)
+            basic_roi: Precomputed basic ROI (optional)
             
         Returns:
             ScoreBreakdown with transparent calculation
@@ -251,12 +309,14 @@ class ROICalculator:
             award_amount = (award_ceiling + award_floor) / 2 if award_floor else award_ceiling
             
             # Estimate application costs
-            application_cost, hours_required = self.estimate_application_cost(
-                award_ceiling, award_floor, agency
-            )
+            if application_cost is None or hours_required is None:
+                application_cost, hours_required = self.estimate_application_cost(
+                    award_ceiling, award_floor, agency
+                )
             
             # Calculate basic ROI
-            basic_roi = self.calculate_basic_roi(award_amount, application_cost)
+            if basic_roi is None:
+                basic_roi = self.calculate_basic_roi(award_amount, application_cost)
             
             # Calculate effort-adjusted ROI
             hourly_rate = user_profile.get('hourly_opportunity_cost', self.constants.ACADEMIC_HOURLY_RATE) if user_profile else self.constants.ACADEMIC_HOURLY_RATE
@@ -44,6 +44,25 @@ class SuccessProbabilityCalculator:
         
         return min(100.0, (number_of_awards / estimated_applications) * 100)
     
+    def calculate_base_success_probability_batch(
+        self,
+        number_of_awards: np.ndarray,
+        estimated_applications: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate base success probability for a batch of opportunities.
+        
+        Args:
+            number_of_awards: Numbers of awards to be made
+            estimated_applications: Estimated numbers of applications
+            
+        Returns:
+            Array of base success probabilities (0-100)
+        """
+        no_applications = estimated_applications <= 0
+        sps = (number_of_awards / np.where(no_applications, 1, estimated_applications)) * 100
+        return np.where(no_applications, 0.0, np.minimum(100.0, sps))
+    
     def calculate_eligibility_score(
         self,
         opportunity: OpportunityV1,
@@ -212,7 +231,8 @@ class SuccessProbabilityCalculator:
         self,
         opportunity: OpportunityV1,
         estimated_applications: int,
-        user_profile: Optional[Dict] = None
+        user_profile: Optional[Dict] = None,
+        base_sps: Optional[float] = None
     ) -> ScoreBreakdown:
         """
         Calculate comprehensive Success Probability Score.
@@ -221,6 +241,7 @@ class SuccessProbabilityCalculator:
             opportunity: Grant opportunity to score
             estimated_applications: Estimated number of applications
             user_profile: User research profile (optional)
+            base_sps: Precomputed base success probability (optional)
             
         Returns:
             ScoreBreakdown with transparent calculation
@@ -231,7 +252,8 @@ class SuccessProbabilityCalculator:
             agency = opportunity.agency_code
             
             # Calculate base success probability
-            base_sps = self.calculate_base_success_probability(awards, estimated_applications)
+            if base_sps is None:
+                base_sps = self.calculate_base_success_probability(awards, estimated_applications)
             
             # Calculate adjustment factors
             eligibility_score = self.calculate_eligibility_score(opportunity, user_profile)
@@ -1,7 +1,9 @@
 """Timing Score calculations for preparation adequacy assessment."""
 
 import logging
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
@@ -10,6 +12,62 @@ from mcp_server.models.analytics_schemas import ScoreBreakdown, IndustryConstant
 
 logger = logging.getLogger(__name__)
 
+# ISO deadlines that parse_deadline reads with "%Y-%m-%d" or "%Y-%m-%d[T ]%H:%M:%S"
+ISO_DEADLINE_PATTERN = re.compile(r'\s*([0-9]{4}-[0-9]{2}-[0-9]{2})(?:[T ]([0-9]{2}:[0-9]{2}:[0-9]{2}))?\s*')
+
+# Agency-specific preparation time adjustments
+PREPARATION_AGENCY_ADJUSTMENTS = {
+    'NIH': 1.3,      # Complex requirements need more time
+    'NSF': 1.1,      # Moderate additional time
+    'DOE': 1.2,      # Technical complexity
+    'DOD': 1.4,      # High compliance requirements
+    'NASA': 1.2,     # Technical complexity
+    'EPA': 1.1,      # Moderate requirements
+    'USDA': 1.0,     # Standard time
+}
+
+# Common date formats in grant data
+DEADLINE_FORMATS = [
+    "%Y-%m-%d",           # 2024-03-15
+    "%m/%d/%Y",           # 03/15/2024
+    "%d/%m/%Y",           # 15/03/2024
+    "%Y-%m-%dT%H:%M:%S",  # 2024-03-15T23:59:59
+    "%Y-%m-%d %H:%M:%S",  # 2024-03-15 23:59:59
+    "%B %d, %Y",          # March 15, 2024
+    "%b %d, %Y",          # Mar 15, 2024
+]
+
+
+@lru_cache(maxsize=4096)
+def parse_deadline(close_date: str) -> Optional[datetime]:
+    """
+    Parse a grant deadline string, trying each known date format.
+    
+    Cached because the same close dates are parsed again for deadline
+    competition and resubmission checks across a batch.
+    
+    Args:
+        close_date: Non-empty close date string from grant data
+        
+    Returns:
+        Parsed datetime object or None
+    """
+    for fmt in DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(close_date.strip(), fmt)
+        except ValueError:
+            continue
+    
+    # Try parsing just the date part if there's time information
+    try:
+        date_part = close_date.split('T')[0].split(' ')[0]
+        return datetime.strptime(date_part, "%Y-%m-%d")
+    except (ValueError, IndexError):
+        pass
+    
+    logger.warning(f"Could not parse deadline: {close_date}")
+    return None
+
 
 class TimingCalculator:
     """
@@ -34,40 +92,59 @@ class TimingCalculator:
         """
         if not close_date:
             return None
+        return parse_deadline(close_date)
+    
+    def parse_deadlines_batch(self, close_dates: List[Optional[str]]) -> np.ndarray:
+        """
+        Parse a batch of grant deadlines.
         
-        # Common date formats in grant data
-        date_formats = [
-            "%Y-%m-%d",           # 2024-03-15
-            "%m/%d/%Y",           # 03/15/2024
-            "%d/%m/%Y",           # 15/03/2024
-            "%Y-%m-%dT%H:%M:%S",  # 2024-03-15T23:59:59
-            "%Y-%m-%d %H:%M:%S",  # 2024-03-15 23:59:59
-            "%B %d, %Y",          # March 15, 2024
-            "%b %d, %Y",          # Mar 15, 2024
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(close_date.strip(), fmt)
-            except ValueError:
+        ISO dates, the common case, are converted by NumPy in one call; other
+        formats fall back to parse_deadline.
+        
+        Args:
+            close_dates: Close date strings from grant data
+            
+        Returns:
+            datetime64[s] array of deadlines, NaT where missing or unparseable
+        """
+        deadlines = np.full(len(close_dates), np.datetime64('NaT'), dtype='datetime64[s]')
+        
+        iso_index, iso_dates, other_index = [], [], []
+        for i, close_date in enumerate(close_dates):
+            if not close_date:
                 continue
+            match = ISO_DEADLINE_PATTERN.fullmatch(close_date)
+            if match:
+                date_part, time_part = match.groups()
+                iso_index.append(i)
+                iso_dates.append(f"{date_part}T{time_part}" if time_part else date_part)
+            else:
+                other_index.append(i)
         
-        # Try parsing just the date part if there's time information
         try:
-            date_part = close_date.split('T')[0].split(' ')[0]
-            return datetime.strptime(date_part, "%Y-%m-%d")
-        except (ValueError, IndexError):
-            pass
+            deadlines[iso_index] = np.array(iso_dates, dtype='datetime64[s]')
+        except ValueError:
+            # Out of range fields such as 2024-02-30; let parse_deadline decide
+            other_index.extend(iso_index)
+        
+        for i in other_index:
+            deadline = self.parse_deadline(close_dates[i])
+            if deadline:
+                deadlines[i] = deadline
         
-        logger.warning(f"Could not parse deadline: {close_date}")
-        return None
+        return deadlines
     
-    def calculate_days_until_deadline(self, close_date: Optional[str]) -> Optional[int]:
+    def calculate_days_until_deadline(
+        self,
+        close_date: Optional[str],
+        now: Optional[datetime] = None
+    ) -> Optional[int]:
         """
         Calculate days remaining until deadline.
         
         Args:
             close_date: Grant close date string
+            now: Reference time in UTC (default: current time)
             
         Returns:
             Number of days until deadline, or None if unparseable
@@ -76,11 +153,34 @@ class TimingCalculator:
         if not deadline:
             return None
         
-        today = datetime.utcnow()
+        today = now or datetime.utcnow()
         days_remaining = (deadline - today).days
         
         return max(0, days_remaining)  # Don't return negative days
     
+    def calculate_days_until_deadline_batch(
+        self,
+        deadlines: np.ndarray,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Calculate days remaining until a batch of deadlines.
+        
+        Args:
+            deadlines: Deadlines from parse_deadlines_batch
+            now: Reference time in UTC (default: current time)
+            
+        Returns:
+            Array of days until each deadline, NaN where the deadline is unknown
+        """
+        today = np.datetime64(now or datetime.utcnow(), 'us')
+        known = ~np.isnat(deadlines)
+        
+        days_remaining = np.full(len(deadlines), np.nan)
+        days_remaining[known] = np.maximum(0, (deadlines[known] - today) // np.timedelta64(1, 'D'))
+        
+        return days_remaining
+    
     def get_optimal_preparation_days(
         self,
         award_ceiling: Optional[float],
@@ -109,18 +209,8 @@ class TimingCalculator:
             base_days = self.constants.OPTIMAL_PREP_DAYS_LARGE
         
         # Agency-specific adjustments
-        agency_adjustments = {
-            'NIH': 1.3,      # Complex requirements need more time
-            'NSF': 1.1,      # Moderate additional time
-            'DOE': 1.2,      # Technical complexity
-            'DOD': 1.4,      # High compliance requirements
-            'NASA': 1.2,     # Technical complexity
-            'EPA': 1.1,      # Moderate requirements
-            'USDA': 1.0,     # Standard time
-        }
-        
         main_agency = agency_code.split('-')[0] if agency_code else 'OTHER'
-        adjustment = agency_adjustments.get(main_agency, 1.1)
+        adjustment = PREPARATION_AGENCY_ADJUSTMENTS.get(main_agency, 1.1)
         
         # Complexity factor adjustments
         if complexity_factors:
@@ -133,6 +223,46 @@ class TimingCalculator:
         
         return int(base_days * adjustment)
     
+    def get_optimal_preparation_days_batch(
+        self,
+        award_ceiling: np.ndarray,
+        agencies: np.ndarray,
+        agency_index: np.ndarray,
+        complexity_factors: Optional[Dict] = None
+    ) -> np.ndarray:
+        """
+        Determine optimal preparation time for a batch of opportunities.
+        
+        Args:
+            award_ceiling: Maximum award amounts (NaN where missing)
+            agencies: Distinct main agency codes in the batch
+            agency_index: Index into agencies for each opportunity
+            complexity_factors: Complexity factors shared by the batch
+            
+        Returns:
+            Array of optimal preparation days
+        """
+        award_amount = np.where(np.isnan(award_ceiling), 100000.0, award_ceiling)
+        base_days = np.select(
+            [award_amount < 100000, award_amount < 1000000],
+            [self.constants.OPTIMAL_PREP_DAYS_SMALL, self.constants.OPTIMAL_PREP_DAYS_MEDIUM],
+            default=self.constants.OPTIMAL_PREP_DAYS_LARGE
+        )
+        
+        agency_table = np.array([PREPARATION_AGENCY_ADJUSTMENTS.get(a, 1.1) for a in agencies])
+        adjustment = np.take(agency_table, agency_index)
+        
+        # Complexity factor adjustments
+        if complexity_factors:
+            if complexity_factors.get('requires_partnerships', False):
+                adjustment *= 1.2
+            if complexity_factors.get('requires_preliminary_data', False):
+                adjustment *= 1.1
+            if complexity_factors.get('first_submission', True):
+                adjustment *= 1.1
+        
+        return (base_days * adjustment).astype(np.int64)
+    
     def calculate_preparation_adequacy_score(
         self,
         days_available: Optional[int],
@@ -168,11 +298,43 @@ class TimingCalculator:
         
         return min(100, max(0, score))
     
+    def calculate_preparation_adequacy_score_batch(
+        self,
+        days_available: np.ndarray,
+        optimal_days: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate preparation adequacy scores for a batch of opportunities.
+        
+        Args:
+            days_available: Days available until deadline (NaN if unknown)
+            optimal_days: Optimal preparation days
+            
+        Returns:
+            Array of preparation adequacy scores (0-100)
+        """
+        no_optimum = optimal_days <= 0
+        adequacy_ratio = days_available / np.where(no_optimum, 1, optimal_days)
+        
+        # Bonus for extra time with diminishing returns, penalty for insufficient time
+        # (both branches are evaluated, so the unused one may divide by zero)
+        with np.errstate(divide='ignore'):
+            score = np.where(
+                adequacy_ratio >= 1.0,
+                100 - (10 * (1 / (1 + adequacy_ratio - 1))),
+                adequacy_ratio * 100
+            )
+        score = np.clip(score, 0, 100)
+        
+        score = np.where(no_optimum, 100.0, score)
+        return np.where(np.isnan(days_available), 50.0, score)  # Neutral if deadline unknown
+    
     def assess_deadline_competition(
         self,
         close_date: Optional[str],
         concurrent_deadlines: Optional[List[str]] = None,
-        max_concurrent_capacity: int = 3
+        max_concurrent_capacity: int = 3,
+        concurrent_count: Optional[int] = None
     ) -> float:
         """
         Assess competition from concurrent deadlines.
@@ -181,6 +343,8 @@ class TimingCalculator:
             close_date: This grant's deadline
             concurrent_deadlines: List of other deadlines in same period
             max_concurrent_capacity: Maximum grants user can handle simultaneously
+            concurrent_count: Precomputed number of deadlines within 2 weeks,
+                used instead of parsing concurrent_deadlines (optional)
             
         Returns:
             Deadline competition factor (0.0-1.0)
@@ -188,20 +352,21 @@ class TimingCalculator:
         if not close_date:
             return 1.0  # Neutral if no deadline
         
-        deadline = self.parse_deadline(close_date)
-        if not deadline:
-            return 1.0
-        
-        # Count concurrent deadlines within +/- 2 weeks
-        concurrent_count = 0
-        
-        if concurrent_deadlines:
-            for other_deadline in concurrent_deadlines:
-                other_date = self.parse_deadline(other_deadline)
-                if other_date:
-                    days_diff = abs((deadline - other_date).days)
-                    if days_diff <= 14:  # Within 2 weeks
-                        concurrent_count += 1
+        if concurrent_count is None:
+            deadline = self.parse_deadline(close_date)
+            if not deadline:
+                return 1.0
+            
+            # Count concurrent deadlines within +/- 2 weeks
+            concurrent_count = 0
+            
+            if concurrent_deadlines:
+                for other_deadline in concurrent_deadlines:
+                    other_date = self.parse_deadline(other_deadline)
+                    if other_date:
+                        days_diff = abs((deadline - other_date).days)
+                        if days_diff <= 14:  # Within 2 weeks
+                            concurrent_count += 1
         
         # Calculate competition factor
         if concurrent_count == 0:
@@ -211,6 +376,32 @@ class TimingCalculator:
         else:
             return max(0.3, 1.0 - (concurrent_count * 0.2))  # Higher penalty, minimum 30%
     
+    def count_concurrent_deadlines_batch(self, deadlines: np.ndarray) -> np.ndarray:
+        """
+        Count the deadlines in a batch that fall within two weeks of each deadline.
+        
+        Matches the count assess_deadline_competition makes when the batch is
+        passed as the concurrent deadlines, so each deadline counts itself.
+        
+        Args:
+            deadlines: Deadlines from parse_deadlines_batch
+            
+        Returns:
+            Array of concurrent deadline counts, 0 where the deadline is unknown
+        """
+        unknown = np.isnat(deadlines)
+        sorted_deadlines = np.sort(deadlines[~unknown])
+        
+        # The scalar check floors (deadline - other) to whole days, so earlier
+        # deadlines count while less than 15 days before and later ones while
+        # at most 14 days after
+        counts = (
+            np.searchsorted(sorted_deadlines, deadlines + np.timedelta64(14, 'D'), side='right')
+            - np.searchsorted(sorted_deadlines, deadlines - np.timedelta64(15, 'D'), side='right')
+        )
+        
+        return np.where(unknown, 0, counts)
+    
     def assess_resubmission_possibility(
         self,
         agency_code: str,
@@ -253,11 +444,32 @@ class TimingCalculator:
         
         return base_factor
     
+    def get_complexity_factors(self, user_profile: Optional[Dict] = None) -> Dict[str, bool]:
+        """
+        Get the preparation complexity factors for a user.
+        
+        Args:
+            user_profile: User profile with preferences
+            
+        Returns:
+            Complexity factors for get_optimal_preparation_days
+        """
+        return {
+            'first_submission': user_profile.get('first_time_applicant', True) if user_profile else True,
+            'requires_partnerships': False,  # Would need to analyze description
+            'requires_preliminary_data': False,  # Would need to analyze requirements
+        }
+    
     def calculate_timing_score(
         self,
         opportunity: OpportunityV1,
         user_profile: Optional[Dict] = None,
-        concurrent_opportunities: Optional[List[OpportunityV1]] = None
+        concurrent_opportunities: Optional[List[OpportunityV1]] = None,
+        days_available: Optional[int] = None,
+        optimal_days: Optional[int] = None,
+        preparation_adequacy: Optional[float] = None,
+        concurrent_count: Optional[int] = None,
+        now: Optional[datetime] = None
     ) -> ScoreBreakdown:
         """
         Calculate comprehensive Timing score.
@@ -266,6 +478,12 @@ class TimingCalculator:
             opportunity: Grant opportunity to score
             user_profile: User profile with preferences
             concurrent_opportunities: Other opportunities being considered
+            days_available: Precomputed days until deadline (optional)
+            optimal_days: Precomputed optimal preparation days (optional)
+            preparation_adequacy: Precomputed preparation adequacy score; when
+                given, days_available and optimal_days are used as passed
+            concurrent_count: Precomputed number of concurrent deadlines (optional)
+            now: Reference time in UTC for days until deadline (default: current time)
             
         Returns:
             ScoreBreakdown with transparent calculation
@@ -276,22 +494,18 @@ class TimingCalculator:
             award_ceiling = opportunity.summary.award_ceiling
             agency = opportunity.agency_code
             
-            # Calculate days until deadline
-            days_available = self.calculate_days_until_deadline(close_date)
-            
-            # Get optimal preparation time
-            complexity_factors = {
-                'first_submission': user_profile.get('first_time_applicant', True) if user_profile else True,
-                'requires_partnerships': False,  # Would need to analyze description
-                'requires_preliminary_data': False,  # Would need to analyze requirements
-            }
-            
-            optimal_days = self.get_optimal_preparation_days(
-                award_ceiling, agency, complexity_factors
-            )
-            
-            # Calculate preparation adequacy
-            prep_score = self.calculate_preparation_adequacy_score(days_available, optimal_days)
+            prep_score = preparation_adequacy
+            if prep_score is None:
+                # Calculate days until deadline
+                days_available = self.calculate_days_until_deadline(close_date, now)
+                
+                # Get optimal preparation time
+                optimal_days = self.get_optimal_preparation_days(
+                    award_ceiling, agency, self.get_complexity_factors(user_profile)
+                )
+                
+                # Calculate preparation adequacy
+                prep_score = self.calculate_preparation_adequacy_score(days_available, optimal_days)
             
             # Assess deadline competition
             concurrent_deadlines = []
@@ -299,7 +513,9 @@ class TimingCalculator:
                 concurrent_deadlines = [opp.summary.close_date for opp in concurrent_opportunities if opp.summary.close_date]
             
             max_capacity = user_profile.get('max_concurrent_applications', 3) if user_profile else 3
-            competition_factor = self.assess_deadline_competition(close_date, concurrent_deadlines, max_capacity)
+            competition_factor = self.assess_deadline_competition(
+                close_date, concurrent_deadlines, max_capacity, concurrent_count
+            )
             
             # Assess resubmission possibility
             resubmission_factor = self.assess_resubmission_possibility(agency, close_date)
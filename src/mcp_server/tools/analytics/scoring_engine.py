@@ -2,13 +2,14 @@
 
 import logging
 import time
+from operator import attrgetter
 from typing import Dict, List, Optional, Any
 import numpy as np
 
 from mcp_server.models.grants_schemas import OpportunityV1
 from mcp_server.models.analytics_schemas import (
     GrantScore, HiddenOpportunityScore, BatchScoreResult, 
-    ScoreCalculationRequest, IndustryConstants
+    ScoreCalculationRequest, IndustryConstants, ScoreBreakdown
 )
 from mcp_server.tools.analytics.metrics.competition_metrics import CompetitionIndexCalculator
 from mcp_server.tools.analytics.metrics.success_metrics import SuccessProbabilityCalculator
@@ -19,6 +20,14 @@ from mcp_server.tools.analytics.database.session_manager import AsyncSQLiteManag
 
 logger = logging.getLogger(__name__)
 
+# Order of the component scores in weight vectors and score matrices
+SCORE_COMPONENTS = ('technical_fit', 'competition', 'roi', 'timing', 'success_probability')
+
+# Summary fields read by batch scoring, fetched as one tuple per opportunity
+_summary_fields = attrgetter(
+    'award_ceiling', 'award_floor', 'expected_number_of_awards', 'close_date', 'funding_category'
+)
+
 
 class GrantScoringEngine:
     """
@@ -42,6 +51,9 @@ class GrantScoringEngine:
         # Database manager for persistence
         self.db_manager = db_manager
         
+        # Weight vectors by the profile settings they depend on
+        self._weights_cache: Dict[tuple, np.ndarray] = {}
+        
         logger.info("Initialized Grant Scoring Engine with all metric calculators")
     
     def get_custom_weights(
@@ -152,6 +164,186 @@ class GrantScoringEngine:
         
         return " ".join(recommendations)
     
+    def get_weight_vector(
+        self,
+        user_profile: Optional[Dict] = None,
+        scoring_weights: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Get custom scoring weights as a vector ordered like SCORE_COMPONENTS.
+        
+        Weights only depend on the career stage and scoring priorities in the
+        profile and on the explicit weights, so vectors are cached by those.
+        
+        Args:
+            user_profile: User research profile
+            scoring_weights: Explicit custom weights
+            
+        Returns:
+            Read-only array of normalized scoring weights
+        """
+        profile = user_profile or {}
+        key = (
+            profile.get('career_stage', 'mid-career'),
+            tuple(sorted(profile.get('scoring_priorities', {}).items())),
+            tuple(sorted((scoring_weights or {}).items()))
+        )
+        
+        weight_vector = self._weights_cache.get(key)
+        if weight_vector is None:
+            weights = self.get_custom_weights(user_profile, scoring_weights)
+            weight_vector = np.array([weights[component] for component in SCORE_COMPONENTS])
+            weight_vector.flags.writeable = False
+            self._weights_cache[key] = weight_vector
+        
+        return weight_vector
+    
+    async def _get_cached_score(self, opportunity: OpportunityV1) -> Optional[Dict[str, Any]]:
+        """Look up a previously stored score for an opportunity."""
+        cached_score = await self.db_manager.get_grant_score(opportunity.opportunity_id)
+        if cached_score:
+            logger.info(f"Using cached score for {opportunity.opportunity_id}")
+            # Convert cached data back to GrantScore (simplified)
+            # In production, you'd want full deserialization
+        return cached_score
+    
+    def _calculate_component_scores(
+        self,
+        opportunity: OpportunityV1,
+        user_profile: Optional[Dict] = None,
+        concurrent_opportunities: Optional[List[OpportunityV1]] = None,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, ScoreBreakdown]:
+        """
+        Calculate the component scores of an opportunity.
+        
+        Args:
+            opportunity: Grant opportunity to score
+            user_profile: User research profile (optional)
+            concurrent_opportunities: Other opportunities for timing analysis
+            precomputed: Base metrics from _batch_score_vectorized (optional)
+            
+        Returns:
+            Score breakdowns keyed like SCORE_COMPONENTS
+        """
+        # Base metrics computed for the whole batch, if any
+        precomputed = precomputed or {}
+        
+        # Calculate competition score and get estimated applications for other metrics
+        competition_score = self.competition_calculator.calculate_competition_score(
+            opportunity,
+            estimated_applications=precomputed.get('estimated_applications'),
+            basic_ci=precomputed.get('basic_ci')
+        )
+        
+        # Extract estimated applications for success probability calculation
+        estimated_applications = competition_score.components.get('estimated_applications', 100)
+        
+        # Calculate success probability score
+        success_score = self.success_calculator.calculate_success_probability_score(
+            opportunity, estimated_applications, user_profile,
+            base_sps=precomputed.get('base_sps')
+        )
+        
+        # Calculate ROI score
+        roi_score = self.roi_calculator.calculate_roi_score(
+            opportunity, success_score.value, user_profile,
+            application_cost=precomputed.get('application_cost'),
+            hours_required=precomputed.get('hours_required'),
+            basic_roi=precomputed.get('basic_roi')
+        )
+        
+        # Calculate timing score
+        timing_score = self.timing_calculator.calculate_timing_score(
+            opportunity, user_profile, concurrent_opportunities,
+            days_available=precomputed.get('days_available'),
+            optimal_days=precomputed.get('optimal_days'),
+            preparation_adequacy=precomputed.get('preparation_adequacy'),
+            concurrent_count=precomputed.get('concurrent_count')
+        )
+        
+        # Calculate technical fit score (simplified version)
+        technical_fit_score = self._calculate_technical_fit_score(opportunity, user_profile)
+        
+        return {
+            'technical_fit': technical_fit_score,
+            'competition': competition_score,
+            'roi': roi_score,
+            'timing': timing_score,
+            'success_probability': success_score
+        }
+    
+    def _build_grant_score(
+        self,
+        opportunity: OpportunityV1,
+        score_breakdowns: Dict[str, ScoreBreakdown],
+        overall_score: float
+    ) -> GrantScore:
+        """
+        Build the GrantScore of an opportunity from its component scores.
+        
+        Args:
+            opportunity: Grant opportunity that was scored
+            score_breakdowns: Component score breakdowns
+            overall_score: Overall weighted score
+            
+        Returns:
+            Comprehensive GrantScore
+        """
+        component_scores = {
+            component: breakdown.value for component, breakdown in score_breakdowns.items()
+        }
+        
+        # Generate recommendation
+        recommendation = self.generate_recommendation(
+            opportunity, overall_score, component_scores
+        )
+        
+        # Create comprehensive GrantScore
+        return GrantScore(
+            opportunity_id=opportunity.opportunity_id,
+            opportunity_title=opportunity.opportunity_title,
+            technical_fit_score=score_breakdowns['technical_fit'],
+            competition_index=score_breakdowns['competition'],
+            roi_score=score_breakdowns['roi'],
+            timing_score=score_breakdowns['timing'],
+            success_probability=score_breakdowns['success_probability'],
+            overall_score=overall_score,
+            recommendation=recommendation
+        )
+    
+    def _score_record(
+        self,
+        grant_score: GrantScore,
+        score_breakdowns: Dict[str, ScoreBreakdown],
+        weight_vector: np.ndarray
+    ) -> tuple:
+        """
+        Build the database cache record of a score.
+        
+        Args:
+            grant_score: Score to store
+            score_breakdowns: Component score breakdowns
+            weight_vector: Weights the overall score was calculated with
+            
+        Returns:
+            Arguments for AsyncSQLiteManager.store_grant_score
+        """
+        return (
+            grant_score.opportunity_id,
+            grant_score.opportunity_title,
+            grant_score.overall_score,
+            {component: breakdown.value for component, breakdown in score_breakdowns.items()},
+            {
+                **{
+                    component: breakdown.dict()
+                    for component, breakdown in score_breakdowns.items()
+                },
+                'weights': dict(zip(SCORE_COMPONENTS, weight_vector.tolist()))
+            },
+            grant_score.recommendation
+        )
+    
     async def score_single_opportunity(
         self,
         opportunity: OpportunityV1,
@@ -178,90 +370,25 @@ class GrantScoringEngine:
             
             # Check cache first
             if use_cache and self.db_manager:
-                cached_score = await self.db_manager.get_grant_score(opportunity.opportunity_id)
-                if cached_score:
-                    logger.info(f"Using cached score for {opportunity.opportunity_id}")
-                    # Convert cached data back to GrantScore (simplified)
-                    # In production, you'd want full deserialization
-                    pass
+                await self._get_cached_score(opportunity)
             
             # Get custom weights
-            weights = self.get_custom_weights(user_profile, scoring_weights)
-            
-            # Calculate competition score and get estimated applications for other metrics
-            competition_score = self.competition_calculator.calculate_competition_score(
-                opportunity
-            )
+            weight_vector = self.get_weight_vector(user_profile, scoring_weights)
             
-            # Extract estimated applications for success probability calculation
-            estimated_applications = competition_score.components.get('estimated_applications', 100)
-            
-            # Calculate success probability score
-            success_score = self.success_calculator.calculate_success_probability_score(
-                opportunity, estimated_applications, user_profile
-            )
-            
-            # Calculate ROI score
-            roi_score = self.roi_calculator.calculate_roi_score(
-                opportunity, success_score.value, user_profile
-            )
-            
-            # Calculate timing score
-            timing_score = self.timing_calculator.calculate_timing_score(
+            score_breakdowns = self._calculate_component_scores(
                 opportunity, user_profile, concurrent_opportunities
             )
             
-            # Calculate technical fit score (simplified version)
-            technical_fit_score = self._calculate_technical_fit_score(opportunity, user_profile)
-            
             # Calculate overall weighted score
-            component_scores = {
-                'technical_fit': technical_fit_score.value,
-                'competition': competition_score.value,
-                'roi': roi_score.value,
-                'timing': timing_score.value,
-                'success_probability': success_score.value
-            }
-            
-            overall_score = sum(
-                component_scores[component] * weights[component]
-                for component in component_scores
-            )
+            component_vector = np.array([score_breakdowns[c].value for c in SCORE_COMPONENTS])
+            overall_score = float(component_vector @ weight_vector)
             
-            # Generate recommendation
-            recommendation = self.generate_recommendation(
-                opportunity, overall_score, component_scores
-            )
-            
-            # Create comprehensive GrantScore
-            grant_score = GrantScore(
-                opportunity_id=opportunity.opportunity_id,
-                opportunity_title=opportunity.opportunity_title,
-                technical_fit_score=technical_fit_score,
-                competition_index=competition_score,
-                roi_score=roi_score,
-                timing_score=timing_score,
-                success_probability=success_score,
-                overall_score=overall_score,
-                recommendation=recommendation
-            )
+            grant_score = self._build_grant_score(opportunity, score_breakdowns, overall_score)
             
             # Store in database cache
             if self.db_manager:
                 await self.db_manager.store_grant_score(
-                    opportunity.opportunity_id,
-                    opportunity.opportunity_title,
-                    overall_score,
-                    component_scores,
-                    {
-                        'technical_fit': technical_fit_score.dict(),
-                        'competition': competition_score.dict(),
-                        'roi': roi_score.dict(),
-                        'timing': timing_score.dict(),
-                        'success_probability': success_score.dict(),
-                        'weights': weights
-                    },
-                    recommendation
+                    *self._score_record(grant_score, score_breakdowns, weight_vector)
                 )
             
             scoring_time = time.time() - start_time
@@ -326,6 +453,85 @@ class GrantScoringEngine:
                 industry_benchmark=None
             )
     
+    def _batch_score_vectorized(
+        self,
+        opportunities: List[OpportunityV1],
+        user_profile: Optional[Dict] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute the base metrics of a batch of opportunities at once.
+        
+        Opportunity fields are laid out as one array per field, so competition
+        index, base success probability, basic ROI and preparation adequacy
+        are computed for the whole batch with NumPy instead of per opportunity.
+        Deadline competition is counted against the batch itself, as the
+        concurrent opportunities batch_score_opportunities passes along.
+        
+        Args:
+            opportunities: List of opportunities to score
+            user_profile: User research profile
+            
+        Returns:
+            Precomputed metrics for each opportunity, for score_single_opportunity
+        """
+        # Transpose per-opportunity field tuples into one column per field
+        columns = list(zip(*(_summary_fields(opp.summary) for opp in opportunities)))
+        ceilings, floors, award_counts, close_dates, funding_categories = columns or [()] * 5
+        ceiling = np.array([c or np.nan for c in ceilings], dtype=float)
+        floor = np.array([f or np.nan for f in floors], dtype=float)
+        awards = np.array([n or 1 for n in award_counts], dtype=np.int64)
+        deadlines = self.timing_calculator.parse_deadlines_batch(close_dates)
+        
+        # Resolve each distinct agency once; multiplier tables are indexed by position
+        agencies, agency_index = np.unique(
+            [opp.agency_code.split('-')[0] if opp.agency_code else 'OTHER' for opp in opportunities],
+            return_inverse=True
+        )
+        
+        # Competition index and base success probability
+        estimated_applications = self.competition_calculator.estimate_applications_batch(
+            ceiling, floor, agencies, agency_index, funding_categories
+        )
+        basic_ci = self.competition_calculator.calculate_basic_competition_index_batch(
+            estimated_applications, awards
+        )
+        base_sps = self.success_calculator.calculate_base_success_probability_batch(
+            awards, estimated_applications
+        )
+        
+        # Basic ROI on the average award amount
+        roi_ceiling = np.where(np.isnan(ceiling), 100000.0, ceiling)
+        award_amount = np.where(np.isnan(floor), roi_ceiling, (roi_ceiling + floor) / 2)
+        application_cost, hours_required = self.roi_calculator.estimate_application_cost_batch(
+            roi_ceiling, agencies, agency_index
+        )
+        basic_roi = self.roi_calculator.calculate_basic_roi_batch(award_amount, application_cost)
+        
+        # Preparation adequacy and deadline competition within the batch
+        days_available = self.timing_calculator.calculate_days_until_deadline_batch(deadlines)
+        concurrent_counts = self.timing_calculator.count_concurrent_deadlines_batch(deadlines)
+        optimal_days = self.timing_calculator.get_optimal_preparation_days_batch(
+            ceiling, agencies, agency_index,
+            self.timing_calculator.get_complexity_factors(user_profile)
+        )
+        preparation_adequacy = self.timing_calculator.calculate_preparation_adequacy_score_batch(
+            days_available, optimal_days
+        )
+        
+        columns = {
+            'estimated_applications': estimated_applications.tolist(),
+            'basic_ci': basic_ci.tolist(),
+            'base_sps': base_sps.tolist(),
+            'application_cost': application_cost.tolist(),
+            'hours_required': hours_required.tolist(),
+            'basic_roi': basic_roi.tolist(),
+            'days_available': [None if np.isnan(days) else int(days) for days in days_available],
+            'optimal_days': optimal_days.tolist(),
+            'preparation_adequacy': preparation_adequacy.tolist(),
+            'concurrent_count': concurrent_counts.tolist(),
+        }
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    
     async def batch_score_opportunities(
         self,
         opportunities: List[OpportunityV1],
@@ -356,16 +562,42 @@ class GrantScoringEngine:
             scored_opportunities = []
             hidden_opportunities = []
             
-            for i, opportunity in enumerate(opportunities):
+            # Weights are shared by the whole batch
+            weight_vector = self.get_weight_vector(user_profile, scoring_weights)
+            precomputed_metrics = self._batch_score_vectorized(opportunities, user_profile)
+            
+            # Calculate component scores, then all overall scores in one product
+            batch_breakdowns = []
+            for i, (opportunity, precomputed) in enumerate(zip(opportunities, precomputed_metrics)):
                 try:
-                    # Score the opportunity
-                    grant_score = await self.score_single_opportunity(
+                    if self.db_manager:
+                        await self._get_cached_score(opportunity)
+                    
+                    score_breakdowns = self._calculate_component_scores(
                         opportunity,
                         user_profile,
-                        scoring_weights,
-                        opportunities  # Pass all for timing analysis
+                        opportunities,  # Pass all for timing analysis
+                        precomputed
                     )
+                    batch_breakdowns.append((i, opportunity, score_breakdowns))
+                    
+                except Exception as e:
+                    logger.error(f"Error scoring opportunity {opportunity.opportunity_id}: {e}")
+            
+            component_matrix = np.array([
+                [score_breakdowns[c].value for c in SCORE_COMPONENTS]
+                for _, _, score_breakdowns in batch_breakdowns
+            ]).reshape(-1, len(SCORE_COMPONENTS))
+            overall_scores = (component_matrix @ weight_vector).tolist()
+            
+            score_records = []
+            for (i, opportunity, score_breakdowns), overall_score in zip(batch_breakdowns, overall_scores):
+                try:
+                    grant_score = self._build_grant_score(opportunity, score_breakdowns, overall_score)
                     scored_opportunities.append(grant_score)
+                    score_records.append(
+                        self._score_record(grant_score, score_breakdowns, weight_vector)
+                    )
                     
                     # Calculate hidden opportunity score if requested
                     if include_hidden:
@@ -381,6 +613,10 @@ class GrantScoringEngine:
                     logger.error(f"Error scoring opportunity {opportunity.opportunity_id}: {e}")
                     continue
             
+            # Store all scores in the database cache in one transaction
+            if self.db_manager:
+                await self.db_manager.store_grant_scores_batch(score_records)
+            
             # Calculate batch statistics
             total_opportunities = len(opportunities)
             scoring_time_ms = (time.time() - start_time) * 1000
@@ -499,7 +499,7 @@ def register_strategic_application_planner_tool(mcp: Any, context: Dict[str, Any
                     pagination=pagination_params
                 )
                 
-                api_response = GrantsAPIResponse(**response_data)
+                api_response = GrantsAPIResponse.model_validate(response_data)
                 opportunities = api_response.get_opportunities()
                 
                 # Cache the results
@@ -3,9 +3,13 @@
 import logging
 import time
 from collections import defaultdict
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from src.mcp_server.models.grants_schemas import AgencyV1, GrantsAPIResponse, OpportunityV1
+from src.mcp_server.tools.discovery.opportunity_discovery_tool import award_columns
 from src.mcp_server.tools.utils.api_client import APIError, SimplerGrantsAPIClient
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
 from src.mcp_server.tools.utils.cache_utils import CacheKeyGenerator
@@ -43,10 +47,6 @@ def analyze_agency_portfolio(
         "eligibility_patterns": defaultdict(int),
     }
     
-    award_ceilings = []
-    award_floors = []
-    total_funding = 0
-    
     for opp in opportunities:
         # Status breakdown
         portfolio["status_breakdown"][opp.opportunity_status] += 1
@@ -55,30 +55,7 @@ def analyze_agency_portfolio(
         if opp.category:
             portfolio["category_breakdown"][opp.category] += 1
         
-        # Funding analysis
         summary = opp.summary
-        if summary.award_ceiling:
-            award_ceilings.append(summary.award_ceiling)
-            if portfolio["funding_stats"]["max_award"] is None:
-                portfolio["funding_stats"]["max_award"] = summary.award_ceiling
-            else:
-                portfolio["funding_stats"]["max_award"] = max(
-                    portfolio["funding_stats"]["max_award"],
-                    summary.award_ceiling
-                )
-        
-        if summary.award_floor:
-            award_floors.append(summary.award_floor)
-            if portfolio["funding_stats"]["min_award"] is None:
-                portfolio["funding_stats"]["min_award"] = summary.award_floor
-            else:
-                portfolio["funding_stats"]["min_award"] = min(
-                    portfolio["funding_stats"]["min_award"],
-                    summary.award_floor
-                )
-        
-        if summary.estimated_total_program_funding:
-            total_funding += summary.estimated_total_program_funding
         
         # Deadline distribution
         if summary.close_date:
@@ -94,12 +71,22 @@ def analyze_agency_portfolio(
             for applicant_type in summary.applicant_types:
                 portfolio["eligibility_patterns"][applicant_type] += 1
     
-    # Calculate averages
-    if award_ceilings:
-        portfolio["funding_stats"]["average_award_ceiling"] = sum(award_ceilings) / len(award_ceilings)
-    if award_floors:
-        portfolio["funding_stats"]["average_award_floor"] = sum(award_floors) / len(award_floors)
-    portfolio["funding_stats"]["total_estimated_funding"] = total_funding
+    # Funding analysis over award columns, ignoring missing and zero amounts
+    awards = award_columns(opportunities)
+    ceilings = awards["award_ceiling"]
+    ceilings = ceilings[~np.isnan(ceilings) & (ceilings != 0)]
+    floors = awards["award_floor"]
+    floors = floors[~np.isnan(floors) & (floors != 0)]
+    funding = awards["estimated_total_program_funding"]
+    
+    funding_stats = portfolio["funding_stats"]
+    if ceilings.size:
+        funding_stats["max_award"] = ceilings.max().item()
+        funding_stats["average_award_ceiling"] = ceilings.mean().item()
+    if floors.size:
+        funding_stats["min_award"] = floors.min().item()
+        funding_stats["average_award_floor"] = floors.mean().item()
+    funding_stats["total_estimated_funding"] = funding[~np.isnan(funding)].sum().item()
     
     # Convert defaultdicts to regular dicts for JSON serialization
     portfolio["status_breakdown"] = dict(portfolio["status_breakdown"])
@@ -179,15 +166,15 @@ def format_agency_landscape_report(
     Returns:
         Formatted report string
     """
-    report = """
+    lines = ["""
 AGENCY LANDSCAPE ANALYSIS
 =========================
 
 OVERVIEW
---------"""
+--------"""]
     
-    report += f"\nTotal Active Agencies: {funding_landscape['total_active_agencies']}"
-    report += f"\nTotal Opportunities Analyzed: {sum(p['total_opportunities'] for p in agency_profiles.values())}"
+    lines.append(f"Total Active Agencies: {funding_landscape['total_active_agencies']}")
+    lines.append(f"Total Opportunities Analyzed: {sum(p['total_opportunities'] for p in agency_profiles.values())}")
     
     # Top agencies by opportunity count
     top_agencies = sorted(
@@ -196,45 +183,45 @@ OVERVIEW
         reverse=True
     )[:5]
     
-    report += "\n\nTOP AGENCIES BY OPPORTUNITY COUNT\n" + "-" * 35
+    lines.append("\nTOP AGENCIES BY OPPORTUNITY COUNT\n" + "-" * 35)
     for agency_code, profile in top_agencies:
         agency_name = next((a.agency_name for a in agencies if a.agency_code == agency_code), agency_code)
-        report += f"\n{agency_code}: {agency_name}"
-        report += f"\n  • Opportunities: {profile['total_opportunities']}"
-        report += f"\n  • Categories: {', '.join(profile['category_breakdown'].keys())[:100]}"
+        lines.append(f"{agency_code}: {agency_name}")
+        lines.append(f"  • Opportunities: {profile['total_opportunities']}")
+        lines.append(f"  • Categories: {', '.join(profile['category_breakdown'].keys())[:100]}")
         if profile['funding_stats']['average_award_ceiling']:
-            report += f"\n  • Avg Award Ceiling: ${profile['funding_stats']['average_award_ceiling']:,.0f}"
+            lines.append(f"  • Avg Award Ceiling: ${profile['funding_stats']['average_award_ceiling']:,.0f}")
     
     # Cross-agency patterns
     if cross_agency_analysis['overlap_areas']:
-        report += "\n\nCROSS-AGENCY COLLABORATION AREAS\n" + "-" * 33
+        lines.append("\nCROSS-AGENCY COLLABORATION AREAS\n" + "-" * 33)
         for overlap in cross_agency_analysis['overlap_areas'][:5]:
-            report += f"\n• {overlap['category']}: {', '.join(overlap['agencies'])}"
+            lines.append(f"• {overlap['category']}: {', '.join(overlap['agencies'])}")
     
     # Unique specializations
     if cross_agency_analysis['unique_specializations']:
-        report += "\n\nUNIQUE AGENCY SPECIALIZATIONS\n" + "-" * 30
+        lines.append("\nUNIQUE AGENCY SPECIALIZATIONS\n" + "-" * 30)
         for agency, specializations in list(cross_agency_analysis['unique_specializations'].items())[:5]:
-            report += f"\n{agency}: {', '.join(specializations[:3])}"
+            lines.append(f"{agency}: {', '.join(specializations[:3])}")
     
     # Funding distribution
-    report += "\n\nFUNDING LANDSCAPE\n" + "-" * 17
+    lines.append("\nFUNDING LANDSCAPE\n" + "-" * 17)
     total_funding = sum(
         p['funding_stats']['total_estimated_funding'] 
         for p in agency_profiles.values()
     )
     if total_funding > 0:
-        report += f"\nTotal Estimated Funding: ${total_funding:,.0f}"
+        lines.append(f"Total Estimated Funding: ${total_funding:,.0f}")
     
     # Category distribution
     if funding_landscape.get('category_specialization'):
-        report += "\n\nFUNDING BY CATEGORY\n" + "-" * 19
+        lines.append("\nFUNDING BY CATEGORY\n" + "-" * 19)
         for category, count in list(funding_landscape['category_specialization'].items())[:5]:
-            report += f"\n• {category}: {count} opportunities"
+            lines.append(f"• {category}: {count} opportunities")
     
-    report += "\n\n" + "=" * 60
+    lines.append("\n" + "=" * 60)
     
-    return report
+    return "\n".join(lines)
 
 
 def register_agency_landscape_tool(mcp: Any, context: Dict[str, Any]) -> None:
@@ -305,7 +292,7 @@ def register_agency_landscape_tool(mcp: Any, context: Dict[str, Any]) -> None:
             )
             
             # Parse response
-            api_response = GrantsAPIResponse(**agency_response)
+            api_response = GrantsAPIResponse.model_validate(agency_response)
             all_agencies = api_response.get_agencies()
             
             # Filter agencies if specific ones requested
@@ -338,7 +325,7 @@ def register_agency_landscape_tool(mcp: Any, context: Dict[str, Any]) -> None:
                             pagination={"page_size": 50, "page_offset": 1}
                         )
                         
-                        opp_api_response = GrantsAPIResponse(**opp_response)
+                        opp_api_response = GrantsAPIResponse.model_validate(opp_response)
                         opportunities = opp_api_response.get_opportunities()
                         
                         # Analyze this agency's portfolio
@@ -376,7 +363,7 @@ def register_agency_landscape_tool(mcp: Any, context: Dict[str, Any]) -> None:
             funding_landscape["category_specialization"] = dict(
                 sorted(
                     funding_landscape["category_specialization"].items(),
-                    key=lambda x: x[1],
+                    key=itemgetter(1),
                     reverse=True
                 )
             )
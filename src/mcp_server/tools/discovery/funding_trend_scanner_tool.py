@@ -1,22 +1,115 @@
 """Funding trend scanner tool for identifying patterns and emerging opportunities."""
 
+import asyncio
 import logging
+import re
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from src.mcp_server.models.grants_schemas import GrantsAPIResponse, OpportunityV1
+from src.mcp_server.tools.discovery.opportunity_discovery_tool import award_columns
 from src.mcp_server.tools.utils.api_client import APIError, SimplerGrantsAPIClient
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
 from src.mcp_server.tools.utils.cache_utils import CacheKeyGenerator
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (inclusive, in days until close) of the deadline buckets
+DEADLINE_BUCKET_EDGES = np.array([30, 60, 90])
+DEADLINE_BUCKET_LABELS = ("30_days", "60_days", "90_days", "90_plus_days")
+
+# Lower bounds of the funding tiers above "micro", by award ceiling
+FUNDING_TIER_EDGES = np.array([100000, 500000, 1000000, 5000000])
+FUNDING_TIER_NAMES = ("micro", "small", "medium", "large", "mega")
+
+# Common emerging technology and priority keywords
+EMERGING_KEYWORDS = (
+    "artificial intelligence", "ai", "machine learning", "ml",
+    "climate", "sustainability", "renewable", "clean energy",
+    "quantum", "biotechnology", "genomics", "precision medicine",
+    "cybersecurity", "data science", "blockchain", "iot",
+    "equity", "diversity", "inclusion", "underserved",
+    "pandemic", "resilience", "supply chain", "infrastructure"
+)
+# Keywords are matched as substrings, overlaps included (e.g. "ai" within
+# "sustainability"): the lookahead matches at every position, and since no
+# keyword is a prefix of another at most one can start at each position
+EMERGING_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, EMERGING_KEYWORDS)) + "))"
+)
+EMERGING_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(EMERGING_KEYWORDS)}
+
+
+def parse_iso_dates(values: List[str]) -> np.ndarray:
+    """
+    Parse ISO 8601 date strings into a ``datetime64[s]`` array.
+    
+    Strings are cut to seconds precision, which also drops any UTC offset,
+    so the result compares directly against naive datetimes. Empty or
+    unparseable strings become NaT.
+    
+    Args:
+        values: Date strings, empty where missing
+        
+    Returns:
+        Parsed dates
+    """
+    truncated = [value[:19] for value in values]
+    try:
+        return np.array(truncated, dtype="datetime64[s]")
+    except ValueError:
+        # Parse one at a time to isolate the malformed strings
+        dates = np.full(len(truncated), np.datetime64("NaT"), dtype="datetime64[s]")
+        for index, value in enumerate(truncated):
+            try:
+                dates[index] = np.datetime64(value, "s")
+            except ValueError:
+                logger.debug(f"Unparseable date: {value!r}")
+        return dates
+
+
+def filter_by_post_date(
+    opportunities: List[OpportunityV1],
+    cutoff_date: datetime,
+    include_undated: bool = True
+) -> List[OpportunityV1]:
+    """
+    Keep opportunities posted on or after a cutoff date.
+    
+    Opportunities with unparseable post dates are always kept.
+    
+    Args:
+        opportunities: Opportunities to filter
+        cutoff_date: Earliest post date to keep
+        include_undated: Whether to keep opportunities without a post date
+            (these might be forecasted)
+        
+    Returns:
+        Filtered opportunities, in their original order
+    """
+    get_post_date = attrgetter("summary.post_date")
+    raw_dates = [post_date or "" for post_date in map(get_post_date, opportunities)]
+    post_dates = parse_iso_dates(raw_dates)
+    cutoff = np.datetime64(cutoff_date.replace(tzinfo=None), "s")
+    
+    keep = post_dates >= cutoff
+    unparsed = np.isnat(post_dates)
+    if not include_undated:
+        unparsed &= np.array([bool(raw) for raw in raw_dates], dtype=bool)
+    keep |= unparsed
+    
+    return [opp for opp, kept in zip(opportunities, keep.tolist()) if kept]
+
 
 def analyze_temporal_trends(
     opportunities: List[OpportunityV1],
-    time_window_days: int = 90
+    time_window_days: int = 90,
+    awards: Optional[Dict[str, np.ndarray]] = None
 ) -> Dict[str, Any]:
     """
     Analyze temporal trends in grant opportunities.
@@ -24,6 +117,7 @@ def analyze_temporal_trends(
     Args:
         opportunities: List of opportunities to analyze
         time_window_days: Time window for trend analysis
+        awards: Award columns of the opportunities, if already extracted
         
     Returns:
         Temporal trend analysis
@@ -32,8 +126,8 @@ def analyze_temporal_trends(
     cutoff_date = now - timedelta(days=time_window_days)
     
     trends = {
-        "posting_frequency": defaultdict(int),
-        "deadline_distribution": defaultdict(int),
+        "posting_frequency": {},
+        "deadline_distribution": {},
         "category_emergence": defaultdict(list),
         "funding_velocity": {
             "recent": 0,
@@ -43,63 +137,71 @@ def analyze_temporal_trends(
         "seasonal_patterns": defaultdict(int)
     }
     
-    recent_opportunities = []
-    older_opportunities = []
-    
-    for opp in opportunities:
-        summary = opp.summary
-        
-        # Parse post date for temporal analysis
-        if summary.post_date:
-            try:
-                post_date = datetime.fromisoformat(summary.post_date.replace("Z", "+00:00"))
-                days_ago = (now - post_date).days
-                
-                # Categorize by recency
-                if post_date >= cutoff_date:
-                    recent_opportunities.append(opp)
-                    week_num = (now - post_date).days // 7
-                    trends["posting_frequency"][f"week_{week_num}"] += 1
-                else:
-                    older_opportunities.append(opp)
-                
-                # Track category emergence
-                if opp.category:
-                    trends["category_emergence"][opp.category].append(days_ago)
-                
-                # Seasonal patterns (by month)
-                month_name = post_date.strftime("%B")
-                trends["seasonal_patterns"][month_name] += 1
-                
-            except Exception as e:
-                logger.debug(f"Error parsing date for opportunity {opp.opportunity_id}: {e}")
+    recent_indexes = []
+    older_indexes = []
+    # Collected per opportunity, then bucketed in one pass each
+    recent_weeks = []
+    days_until_close = []
+    
+    # Parse all dates up front; they come out naive, so UTC-suffixed dates
+    # compare against now like plain ones, and None where missing or malformed
+    post_dates = parse_iso_dates(
+        [opp.summary.post_date or "" for opp in opportunities]
+    ).tolist()
+    close_dates = parse_iso_dates(
+        [opp.summary.close_date or "" for opp in opportunities]
+    ).tolist()
+    
+    for index, (opp, post_date, close_date) in enumerate(
+        zip(opportunities, post_dates, close_dates)
+    ):
+        # Post date for temporal analysis
+        if post_date is not None:
+            days_ago = (now - post_date).days
+            
+            # Categorize by recency
+            if post_date >= cutoff_date:
+                recent_indexes.append(index)
+                recent_weeks.append(days_ago // 7)
+            else:
+                older_indexes.append(index)
+            
+            # Track category emergence
+            if opp.category:
+                trends["category_emergence"][opp.category].append(days_ago)
+            
+            # Seasonal patterns (by month)
+            month_name = post_date.strftime("%B")
+            trends["seasonal_patterns"][month_name] += 1
         
         # Deadline distribution
-        if summary.close_date:
-            try:
-                close_date = datetime.fromisoformat(summary.close_date.replace("Z", "+00:00"))
-                if close_date > now:
-                    days_until = (close_date - now).days
-                    if days_until <= 30:
-                        trends["deadline_distribution"]["30_days"] += 1
-                    elif days_until <= 60:
-                        trends["deadline_distribution"]["60_days"] += 1
-                    elif days_until <= 90:
-                        trends["deadline_distribution"]["90_days"] += 1
-                    else:
-                        trends["deadline_distribution"]["90_plus_days"] += 1
-            except:
-                pass
+        if close_date is not None and close_date > now:
+            days_until_close.append((close_date - now).days)
+    
+    # Posting frequency by week; weeks may be negative for future post dates
+    weeks, week_counts = np.unique(np.array(recent_weeks, dtype=np.int64), return_counts=True)
+    trends["posting_frequency"] = {
+        f"week_{week}": count
+        for week, count in zip(weeks.tolist(), week_counts.tolist())
+    }
     
-    # Calculate funding velocity
-    recent_funding = sum(
-        opp.summary.estimated_total_program_funding or 0
-        for opp in recent_opportunities
-    )
-    older_funding = sum(
-        opp.summary.estimated_total_program_funding or 0
-        for opp in older_opportunities
+    # Deadline distribution, keeping only non-empty buckets
+    bucket_counts = np.bincount(
+        np.searchsorted(DEADLINE_BUCKET_EDGES, days_until_close),
+        minlength=len(DEADLINE_BUCKET_LABELS)
     )
+    trends["deadline_distribution"] = {
+        label: count
+        for label, count in zip(DEADLINE_BUCKET_LABELS, bucket_counts.tolist())
+        if count
+    }
+    
+    # Calculate funding velocity
+    if awards is None:
+        awards = award_columns(opportunities)
+    funding = awards["estimated_total_program_funding"]
+    recent_funding = np.nansum(funding[recent_indexes]).item()
+    older_funding = np.nansum(funding[older_indexes]).item()
     
     trends["funding_velocity"]["recent"] = recent_funding
     trends["funding_velocity"]["older"] = older_funding
@@ -122,8 +224,6 @@ def analyze_temporal_trends(
             trends["category_emergence"][category] = "limited_data"
     
     # Convert defaultdicts to regular dicts
-    trends["posting_frequency"] = dict(trends["posting_frequency"])
-    trends["deadline_distribution"] = dict(trends["deadline_distribution"])
     trends["seasonal_patterns"] = dict(trends["seasonal_patterns"])
     trends["category_emergence"] = dict(trends["category_emergence"])
     
@@ -131,13 +231,15 @@ def analyze_temporal_trends(
 
 
 def identify_funding_patterns(
-    opportunities: List[OpportunityV1]
+    opportunities: List[OpportunityV1],
+    awards: Optional[Dict[str, np.ndarray]] = None
 ) -> Dict[str, Any]:
     """
     Identify patterns in funding amounts and distributions.
     
     Args:
         opportunities: List of opportunities to analyze
+        awards: Award columns of the opportunities, if already extracted
         
     Returns:
         Funding pattern analysis
@@ -156,21 +258,18 @@ def identify_funding_patterns(
         "best_roi_opportunities": []  # High funding, low competition
     }
     
-    for opp in opportunities:
+    # Funding tier of every opportunity, from its award ceiling
+    if awards is None:
+        awards = award_columns(opportunities)
+    ceilings = awards["award_ceiling"]
+    tiers = np.digitize(ceilings, FUNDING_TIER_EDGES).tolist()
+    
+    for opp, tier in zip(opportunities, tiers):
         summary = opp.summary
         
         # Categorize by funding tier
         if summary.award_ceiling:
-            if summary.award_ceiling < 100000:
-                patterns["funding_tiers"]["micro"].append(opp)
-            elif summary.award_ceiling < 500000:
-                patterns["funding_tiers"]["small"].append(opp)
-            elif summary.award_ceiling < 1000000:
-                patterns["funding_tiers"]["medium"].append(opp)
-            elif summary.award_ceiling < 5000000:
-                patterns["funding_tiers"]["large"].append(opp)
-            else:
-                patterns["funding_tiers"]["mega"].append(opp)
+            patterns["funding_tiers"][FUNDING_TIER_NAMES[tier]].append(opp)
             
             # Track award sizes by category
             if opp.category:
@@ -258,16 +357,6 @@ def detect_emerging_topics(
         "cross_cutting_themes": []
     }
     
-    # Common emerging technology and priority keywords
-    emerging_keywords = [
-        "artificial intelligence", "ai", "machine learning", "ml",
-        "climate", "sustainability", "renewable", "clean energy",
-        "quantum", "biotechnology", "genomics", "precision medicine",
-        "cybersecurity", "data science", "blockchain", "iot",
-        "equity", "diversity", "inclusion", "underserved",
-        "pandemic", "resilience", "supply chain", "infrastructure"
-    ]
-    
     keyword_occurrences = defaultdict(list)
     
     for opp in opportunities:
@@ -276,14 +365,15 @@ def detect_emerging_topics(
                 (opp.summary.summary_description or "") + " " +
                 (opp.category_explanation or "")).lower()
         
-        for keyword in emerging_keywords:
-            if keyword in text:
-                topics["keyword_frequency"][keyword] += 1
-                keyword_occurrences[keyword].append({
-                    "opportunity_id": opp.opportunity_id,
-                    "title": opp.opportunity_title,
-                    "category": opp.category
-                })
+        # One scan per text; keywords are then visited in list order
+        found = set(EMERGING_KEYWORD_RE.findall(text))
+        for keyword in sorted(found, key=EMERGING_KEYWORD_RANK.__getitem__):
+            topics["keyword_frequency"][keyword] += 1
+            keyword_occurrences[keyword].append({
+                "opportunity_id": opp.opportunity_id,
+                "title": opp.opportunity_title,
+                "category": opp.category
+            })
         
         # Track category combinations
         if opp.category and opp.agency_code:
@@ -347,107 +437,109 @@ def format_funding_trends_report(
     Returns:
         Formatted report string
     """
-    report = """
+    lines = ["""
 FUNDING TRENDS ANALYSIS REPORT
 ==============================
 
 EXECUTIVE SUMMARY
------------------"""
+-----------------"""]
     
     # Summary stats
-    report += f"\nOpportunities Analyzed: {metadata.get('total_opportunities', 0)}"
-    report += f"\nTime Period: Last {metadata.get('time_window_days', 90)} days"
-    report += f"\nTotal Funding Available: ${metadata.get('total_funding', 0):,.0f}"
+    lines.append(f"Opportunities Analyzed: {metadata.get('total_opportunities', 0)}")
+    lines.append(f"Time Period: Last {metadata.get('time_window_days', 90)} days")
+    lines.append(f"Total Funding Available: ${metadata.get('total_funding', 0):,.0f}")
     
     # Temporal Trends
-    report += "\n\nTEMPORAL TRENDS\n" + "-" * 15
+    lines.append("\nTEMPORAL TRENDS\n" + "-" * 15)
     
     # Posting frequency
     if temporal_trends["posting_frequency"]:
-        report += "\n\nPosting Activity (by week):"
+        lines.append("\nPosting Activity (by week):")
         for week, count in sorted(temporal_trends["posting_frequency"].items()):
-            report += f"\n  • {week}: {count} opportunities"
+            lines.append(f"  • {week}: {count} opportunities")
     
     # Funding velocity
     velocity = temporal_trends["funding_velocity"]
     if velocity["recent"] or velocity["older"]:
-        report += f"\n\nFunding Velocity:"
-        report += f"\n  • Recent Period: ${velocity['recent']:,.0f}"
-        report += f"\n  • Previous Period: ${velocity['older']:,.0f}"
+        lines.append(f"\nFunding Velocity:")
+        lines.append(f"  • Recent Period: ${velocity['recent']:,.0f}")
+        lines.append(f"  • Previous Period: ${velocity['older']:,.0f}")
         if velocity["acceleration"] != 0:
             direction = "↑" if velocity["acceleration"] > 0 else "↓"
-            report += f"\n  • Acceleration: {direction} {abs(velocity['acceleration']):.1f}%"
+            lines.append(f"  • Acceleration: {direction} {abs(velocity['acceleration']):.1f}%")
     
     # Deadline distribution
     if temporal_trends["deadline_distribution"]:
-        report += "\n\nUpcoming Deadlines:"
+        lines.append("\nUpcoming Deadlines:")
         for period, count in sorted(temporal_trends["deadline_distribution"].items()):
-            report += f"\n  • {period}: {count} opportunities"
+            lines.append(f"  • {period}: {count} opportunities")
     
     # Funding Patterns
-    report += "\n\nFUNDING PATTERNS\n" + "-" * 16
+    lines.append("\nFUNDING PATTERNS\n" + "-" * 16)
     
     # Funding tiers
     if funding_patterns["funding_tier_summary"]:
-        report += "\n\nFunding Tiers Distribution:"
+        lines.append("\nFunding Tiers Distribution:")
         tiers = funding_patterns["funding_tier_summary"]
-        report += f"\n  • Micro (<$100K): {tiers.get('micro', 0)}"
-        report += f"\n  • Small ($100K-$500K): {tiers.get('small', 0)}"
-        report += f"\n  • Medium ($500K-$1M): {tiers.get('medium', 0)}"
-        report += f"\n  • Large ($1M-$5M): {tiers.get('large', 0)}"
-        report += f"\n  • Mega (>$5M): {tiers.get('mega', 0)}"
+        lines.append(f"  • Micro (<$100K): {tiers.get('micro', 0)}")
+        lines.append(f"  • Small ($100K-$500K): {tiers.get('small', 0)}")
+        lines.append(f"  • Medium ($500K-$1M): {tiers.get('medium', 0)}")
+        lines.append(f"  • Large ($1M-$5M): {tiers.get('large', 0)}")
+        lines.append(f"  • Mega (>$5M): {tiers.get('mega', 0)}")
     
     # High-value opportunities
     if funding_patterns["high_value_opportunities"]:
-        report += "\n\nTop High-Value Opportunities:"
+        lines.append("\nTop High-Value Opportunities:")
         for opp in funding_patterns["high_value_opportunities"][:5]:
-            report += f"\n  • {opp['title'][:60]}..."
-            report += f"\n    Total: ${opp['total_funding']:,.0f}"
+            lines.append(f"  • {opp['title'][:60]}...")
+            total_line = f"    Total: ${opp['total_funding']:,.0f}"
             if opp.get('close_date'):
-                report += f" | Deadline: {opp['close_date']}"
+                total_line += f" | Deadline: {opp['close_date']}"
+            lines.append(total_line)
     
     # Best ROI opportunities
     if funding_patterns["best_roi_opportunities"]:
-        report += "\n\nBest ROI Opportunities (Low Competition):"
+        lines.append("\nBest ROI Opportunities (Low Competition):")
         for opp in funding_patterns["best_roi_opportunities"][:3]:
-            report += f"\n  • {opp['title'][:60]}..."
-            report += f"\n    Avg Award: ${opp['avg_award']:,.0f} ({opp['num_awards']} awards)"
+            lines.append(f"  • {opp['title'][:60]}...")
+            lines.append(f"    Avg Award: ${opp['avg_award']:,.0f} ({opp['num_awards']} awards)")
     
     # Emerging Topics
-    report += "\n\nEMERGING THEMES & TOPICS\n" + "-" * 24
+    lines.append("\nEMERGING THEMES & TOPICS\n" + "-" * 24)
     
     if emerging_topics["emerging_themes"]:
-        report += "\n\nTrending Topics:"
+        lines.append("\nTrending Topics:")
         for theme in emerging_topics["emerging_themes"][:5]:
-            report += f"\n  • {theme['theme'].title()}: "
-            report += f"{theme['frequency']} occurrences ({theme['percentage']:.1f}%)"
+            lines.append(
+                f"  • {theme['theme'].title()}: "
+                f"{theme['frequency']} occurrences ({theme['percentage']:.1f}%)"
+            )
     
     if emerging_topics["cross_cutting_themes"]:
-        report += "\n\nCross-Cutting Themes:"
+        lines.append("\nCross-Cutting Themes:")
         for theme in emerging_topics["cross_cutting_themes"][:3]:
-            report += f"\n  • {theme['theme'].title()}: "
-            report += f"spans {theme['reach']} categories"
+            lines.append(f"  • {theme['theme'].title()}: spans {theme['reach']} categories")
     
     # Recommendations
-    report += "\n\nRECOMMENDATIONS\n" + "-" * 15
+    lines.append("\nRECOMMENDATIONS\n" + "-" * 15)
     
     # Based on trends
     if velocity.get("acceleration", 0) > 10:
-        report += "\n• ⚡ Funding is accelerating - consider increasing proposal activity"
+        lines.append("• ⚡ Funding is accelerating - consider increasing proposal activity")
     
     if temporal_trends["deadline_distribution"].get("30_days", 0) > 5:
-        report += "\n• ⏰ Multiple deadlines approaching - prioritize applications"
+        lines.append("• ⏰ Multiple deadlines approaching - prioritize applications")
     
     if funding_patterns["best_roi_opportunities"]:
-        report += "\n• 💰 High-value, low-competition opportunities available"
+        lines.append("• 💰 High-value, low-competition opportunities available")
     
     if emerging_topics["emerging_themes"]:
         top_theme = emerging_topics["emerging_themes"][0]["theme"]
-        report += f"\n• 🔬 Consider aligning proposals with '{top_theme}' theme"
+        lines.append(f"• 🔬 Consider aligning proposals with '{top_theme}' theme")
     
-    report += "\n\n" + "=" * 60
+    lines.append("\n" + "=" * 60)
     
-    return report
+    return "\n".join(lines)
 
 
 def register_funding_trend_scanner_tool(mcp: Any, context: Dict[str, Any]) -> None:
@@ -540,7 +632,7 @@ def register_funding_trend_scanner_tool(mcp: Any, context: Dict[str, Any]) -> No
                     pagination={"page_size": 100, "page_offset": page}
                 )
                 
-                api_response = GrantsAPIResponse(**response)
+                api_response = GrantsAPIResponse.model_validate(response)
                 opportunities = api_response.get_opportunities()
                 
                 if not opportunities:
@@ -555,33 +647,26 @@ def register_funding_trend_scanner_tool(mcp: Any, context: Dict[str, Any]) -> No
                 page += 1
             
             # Filter opportunities by date range
-            filtered_opportunities = []
-            for opp in all_opportunities:
-                if opp.summary.post_date:
-                    try:
-                        post_date = datetime.fromisoformat(opp.summary.post_date.replace("Z", "+00:00"))
-                        if post_date >= cutoff_date:
-                            filtered_opportunities.append(opp)
-                    except:
-                        # Include opportunities with unparseable dates
-                        filtered_opportunities.append(opp)
-                else:
-                    # Include opportunities without post dates (might be forecasted)
-                    if include_forecasted:
-                        filtered_opportunities.append(opp)
+            filtered_opportunities = filter_by_post_date(
+                all_opportunities, cutoff_date, include_undated=include_forecasted
+            )
             
             logger.info(f"Analyzing {len(filtered_opportunities)} opportunities for trends (filtered from {len(all_opportunities)})")
             
-            # Perform analyses
-            temporal_trends = analyze_temporal_trends(filtered_opportunities, time_window_days)
-            funding_patterns = identify_funding_patterns(filtered_opportunities)
-            emerging_topics = detect_emerging_topics(filtered_opportunities)
+            # Perform the independent analyses in worker threads, so a large
+            # scan does not block the event loop; award amounts are
+            # extracted once and shared read-only
+            awards = award_columns(filtered_opportunities)
+            temporal_trends, funding_patterns, emerging_topics = await asyncio.gather(
+                asyncio.to_thread(
+                    analyze_temporal_trends, filtered_opportunities, time_window_days, awards
+                ),
+                asyncio.to_thread(identify_funding_patterns, filtered_opportunities, awards),
+                asyncio.to_thread(detect_emerging_topics, filtered_opportunities),
+            )
             
             # Calculate metadata
-            total_funding = sum(
-                opp.summary.estimated_total_program_funding or 0
-                for opp in filtered_opportunities
-            )
+            total_funding = np.nansum(awards["estimated_total_program_funding"]).item()
             
             metadata = {
                 "total_opportunities": len(filtered_opportunities),
@@ -4,6 +4,8 @@ import logging
 import time
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from src.mcp_server.models.grants_schemas import GrantsAPIResponse, OpportunityV1
 from src.mcp_server.tools.utils.api_client import APIError
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
@@ -11,6 +13,9 @@ from src.mcp_server.tools.utils.cache_utils import CacheKeyGenerator
 
 logger = logging.getLogger(__name__)
 
+# Summary fields holding award amounts, as extracted by award_columns
+AWARD_FIELDS = ("award_floor", "award_ceiling", "estimated_total_program_funding")
+
 
 def format_grant_details(grant: OpportunityV1) -> str:
     """
@@ -193,6 +198,94 @@ def calculate_summary_statistics(opportunities: List[OpportunityV1]) -> Dict[str
     return stats
 
 
+def award_columns(opportunities: List[OpportunityV1]) -> Dict[str, np.ndarray]:
+    """
+    Extract the award amounts of opportunities as per-field float arrays.
+    
+    Args:
+        opportunities: List of opportunities
+        
+    Returns:
+        Mapping of award field name to a column array, NaN where missing
+    """
+    summaries = [opp.summary for opp in opportunities]
+    return {
+        field: np.array([getattr(summary, field) for summary in summaries], dtype=float)
+        for field in AWARD_FIELDS
+    }
+
+
+def opportunities_to_columns(opportunities: List[OpportunityV1]) -> Dict[str, np.ndarray]:
+    """
+    Convert opportunities into per-field arrays for batch statistics.
+    
+    Args:
+        opportunities: List of opportunities
+        
+    Returns:
+        Mapping of field name to a column array. Missing strings are empty
+        and missing award amounts are NaN.
+    """
+    return {
+        "agency_code": np.array([opp.agency_code for opp in opportunities], dtype=str),
+        "category": np.array([opp.category or "" for opp in opportunities], dtype=str),
+        "opportunity_status": np.array(
+            [opp.opportunity_status for opp in opportunities], dtype=str
+        ),
+        **award_columns(opportunities),
+        "close_date": np.array(
+            [opp.summary.close_date or "" for opp in opportunities], dtype=str
+        ),
+    }
+
+
+def _value_counts(values: np.ndarray) -> Dict[str, int]:
+    """Count occurrences of each distinct value in a column."""
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def calculate_summary_statistics_batch(columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Calculate summary statistics from columnar opportunity data.
+    
+    Produces the same result as calculate_summary_statistics, reducing
+    each field with numpy instead of accumulating per opportunity.
+    
+    Args:
+        columns: Per-field arrays as built by opportunities_to_columns
+        
+    Returns:
+        Summary statistics
+    """
+    categories = np.where(columns["category"] == "", "Uncategorized", columns["category"])
+    
+    floors = columns["award_floor"]
+    floors = floors[~np.isnan(floors) & (floors != 0)]
+    ceilings = columns["award_ceiling"]
+    ceilings = ceilings[~np.isnan(ceilings) & (ceilings != 0)]
+    
+    # Month is the segment after the first "-" of each close date
+    close_dates = columns["close_date"]
+    close_dates = close_dates[close_dates != ""]
+    months = close_dates
+    if close_dates.size:
+        _, dash, rest = np.char.partition(close_dates, "-").T
+        months = np.where(dash == "-", np.char.partition(rest, "-")[..., 0], "Unknown")
+    
+    return {
+        "agencies": _value_counts(columns["agency_code"]),
+        "funding_ranges": {
+            "min_floor": floors.min().item() if floors.size else None,
+            "max_ceiling": ceilings.max().item() if ceilings.size else None,
+            "avg_award": ceilings.mean().item() if ceilings.size else None,
+        },
+        "deadline_distribution": _value_counts(months),
+        "category_breakdown": _value_counts(categories),
+        "status_breakdown": _value_counts(columns["opportunity_status"]),
+    }
+
+
 def register_opportunity_discovery_tool(mcp: Any, context: Dict[str, Any]) -> None:
     """
     Register the opportunity discovery tool with the MCP server.
@@ -272,7 +365,7 @@ def register_opportunity_discovery_tool(mcp: Any, context: Dict[str, Any]) -> No
                 "sort_direction": "descending"
             }
             
-            # Make API call
+            # Make API call; the client joins identical searches already in flight
             logger.info(f"Searching opportunities with query: {query}")
             response_data = await api_client.search_opportunities(
                 query=query,
@@ -281,7 +374,7 @@ def register_opportunity_discovery_tool(mcp: Any, context: Dict[str, Any]) -> No
             )
             
             # Parse response
-            api_response = GrantsAPIResponse(**response_data)
+            api_response = GrantsAPIResponse.model_validate(response_data)
             opportunities = api_response.get_opportunities()
             
             # Calculate statistics
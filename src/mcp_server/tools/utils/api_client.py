@@ -1,18 +1,35 @@
 """API client for the Simpler Grants API."""
 
 import asyncio
+import copy
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 from tenacity import (
-    retry,
-    retry_if_exception_type,
+    AsyncRetrying,
+    RetryCallState,
+    before_sleep_log,
+    retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
+    stop_before_delay,
+    wait_random_exponential,
 )
 
+from .cache_manager import InMemoryCache
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
+try:
+    import h2  # Lets httpx speak HTTP/2
+except ImportError:  # Optional speedup, see the "speedups" extra
+    h2 = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +48,105 @@ class RateLimitError(APIError):
     pass
 
 
+class CircuitOpenError(APIError):
+    """Exception raised while the circuit breaker is rejecting requests."""
+    pass
+
+
+# Status codes worth retrying: 0 (timeout/network), rate limits, transient 5xx
+RETRYABLE_STATUS_CODES = frozenset({0, 429, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Check if a failed request should be retried."""
+    return isinstance(exc, APIError) and exc.status_code in RETRYABLE_STATUS_CODES
+
+
+def _copy_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a parsed JSON response, so callers sharing it cannot change each other's data."""
+    if orjson is not None:
+        try:
+            return orjson.loads(orjson.dumps(response))
+        except TypeError:  # e.g. integers wider than 64 bits
+            pass
+    return copy.deepcopy(response)
+
+
+class _PendingSearch:
+    """An in-flight search request and the number of callers awaiting it."""
+    
+    __slots__ = ("task", "waiters")
+    
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding the upstream API.
+    
+    Opens after `fail_max` consecutive transient failures and rejects requests
+    immediately until `reset_timeout` seconds have passed. The next request is
+    then let through as a trial; another failure re-opens the circuit.
+    """
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            fail_max: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before allowing a trial request
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failure_count = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def is_open(self) -> bool:
+        """Check if the circuit is currently open."""
+        return self.opened_at is not None
+    
+    def before_request(self):
+        """
+        Fail fast if the circuit is open.
+        
+        Raises:
+            CircuitOpenError: If the reset timeout has not yet elapsed
+        """
+        if self.opened_at is None:
+            return
+        
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        if remaining > 0:
+            raise CircuitOpenError(
+                503,
+                f"Circuit open after repeated API failures. Retry after {remaining:.0f} seconds",
+                {"retry_after": remaining}
+            )
+        
+        # Half-open: allow a trial request, a single failure re-opens
+        self.opened_at = None
+        self.failure_count = self.fail_max - 1
+    
+    def record_success(self):
+        """Close the circuit after the API answered."""
+        self.failure_count = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        """Count a transient failure, opening the circuit at the threshold."""
+        self.failure_count += 1
+        if self.failure_count >= self.fail_max and self.opened_at is None:
+            self.opened_at = time.monotonic()
+            logger.warning(
+                f"Circuit opened after {self.failure_count} consecutive failures; "
+                f"rejecting requests for {self.reset_timeout}s"
+            )
+
+
 class SimplerGrantsAPIClient:
     """
     Async HTTP client for the Simpler Grants API.
@@ -44,6 +160,12 @@ class SimplerGrantsAPIClient:
         base_url: str = "https://api.simpler.grants.gov/v1",
         timeout: int = 30,
         max_retries: int = 3,
+        max_retry_wait: float = 5.0,
+        max_retry_time: float = 15.0,
+        circuit_breaker_threshold: int = 5,
+        circuit_breaker_timeout: float = 30.0,
+        response_cache_ttl: int = 0,
+        response_cache_size: int = 256,
     ):
         """
         Initialize the API client.
@@ -52,19 +174,45 @@ class SimplerGrantsAPIClient:
             api_key: API key for authentication
             base_url: Base URL for the API
             timeout: Request timeout in seconds
-            max_retries: Maximum number of retries for failed requests
+            max_retries: Maximum number of attempts for failed requests
+            max_retry_wait: Upper bound in seconds for a single backoff wait
+            max_retry_time: Seconds after which a request stops retrying, so
+                tool calls fail instead of blocking on a struggling API
+            circuit_breaker_threshold: Consecutive failed requests before fast-failing
+            circuit_breaker_timeout: Seconds to fast-fail before trying the API again
+            response_cache_ttl: Seconds to reuse identical search responses (0 disables)
+            response_cache_size: Maximum number of cached search responses
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.max_retry_time = max_retry_time
+        
+        # Exponential backoff with full jitter to avoid synchronized retries
+        self._backoff = wait_random_exponential(multiplier=0.5, max=max_retry_wait)
+        self.circuit_breaker = CircuitBreaker(
+            fail_max=circuit_breaker_threshold,
+            reset_timeout=circuit_breaker_timeout,
+        )
+        
+        # Identical searches share one in-flight request; with a response
+        # cache they then reuse the response until it expires
+        self.response_cache = (
+            InMemoryCache(ttl=response_cache_ttl, max_size=response_cache_size)
+            if response_cache_ttl > 0 else None
+        )
+        self._pending_searches: Dict[str, _PendingSearch] = {}
         
         # Rate limit tracking
         self.rate_limit_remaining: Optional[int] = None
         self.rate_limit_reset: Optional[int] = None
         
-        # HTTP client
+        # HTTP client; with HTTP/2, concurrent requests share one connection
+        # (negotiated per server, falling back to HTTP/1.1)
         self.client = httpx.AsyncClient(
+            http2=h2 is not None,
             timeout=httpx.Timeout(timeout),
             headers={
                 "accept": "application/json",
@@ -101,11 +249,16 @@ class SimplerGrantsAPIClient:
             except (ValueError, TypeError):
                 pass
     
-    @retry(
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
+    def _retry_wait(self, retry_state: RetryCallState) -> float:
+        """Honor Retry-After on rate limits, otherwise back off with jitter."""
+        exc = retry_state.outcome.exception()
+        if isinstance(exc, RateLimitError):
+            try:
+                return min(float(exc.response_data["retry_after"]), self.max_retry_wait)
+            except (KeyError, TypeError, ValueError):
+                pass
+        return self._backoff(retry_state)
+    
     async def _make_request(
         self,
         method: str,
@@ -114,7 +267,55 @@ class SimplerGrantsAPIClient:
         json_data: Optional[Dict] = None,
     ) -> Dict[str, Any]:
         """
-        Make an HTTP request to the API.
+        Make an HTTP request to the API, retrying transient failures.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            params: Query parameters
+            json_data: JSON body data
+            
+        Returns:
+            Parsed JSON response
+            
+        Raises:
+            APIError: For API errors
+            RateLimitError: For rate limit errors
+            CircuitOpenError: If recent requests kept failing
+        """
+        self.circuit_breaker.before_request()
+        
+        try:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception(_is_retryable),
+                # Give up once attempts run out or the next wait would pass the budget
+                stop=stop_after_attempt(self.max_retries) | stop_before_delay(self.max_retry_time),
+                wait=self._retry_wait,
+                before_sleep=before_sleep_log(logger, logging.WARNING),
+                reraise=True,
+            ):
+                with attempt:
+                    response = await self._send_request(method, endpoint, params, json_data)
+        except APIError as e:
+            if _is_retryable(e):
+                self.circuit_breaker.record_failure()
+            else:
+                # The API answered, so it is reachable
+                self.circuit_breaker.record_success()
+            raise
+        
+        self.circuit_breaker.record_success()
+        return response
+    
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a single HTTP request to the API.
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -144,11 +345,11 @@ class SimplerGrantsAPIClient:
             
             # Handle rate limiting
             if response.status_code == 429:
-                retry_after = response.headers.get("Retry-After", "60")
-                logger.warning(f"Rate limited. Retry after {retry_after} seconds")
+                retry_after = response.headers.get("Retry-After")
+                logger.warning(f"Rate limited. Retry after {retry_after or 60} seconds")
                 raise RateLimitError(
                     429,
-                    f"Rate limit exceeded. Retry after {retry_after} seconds",
+                    f"Rate limit exceeded. Retry after {retry_after or 60} seconds",
                     {"retry_after": retry_after}
                 )
             
@@ -167,6 +368,8 @@ class SimplerGrantsAPIClient:
                 )
             
             # Parse JSON response
+            if orjson is not None:
+                return orjson.loads(response.content)
             return response.json()
             
         except httpx.TimeoutException as e:
@@ -263,19 +466,116 @@ class SimplerGrantsAPIClient:
         
         logger.debug(f"Searching opportunities with params: {request_body}")
         
-        response = await self._make_request(
-            "POST",
-            "/opportunities/search",
-            json_data=request_body
-        )
+        response = await self._shared_search(request_body)
         
         # Log summary
-        total = response.get("pagination_info", {}).get("total_records", 0)
-        returned = len(response.get("data", []))
+        total = (response.get("pagination_info") or {}).get("total_records", 0)
+        returned = len(response.get("data") or [])
         logger.info(f"Found {total} opportunities, returned {returned}")
         
         return response
     
+    async def _shared_search(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Search through the response cache, joining identical in-flight searches.
+        
+        Args:
+            request_body: Search request body
+            
+        Returns:
+            Search results with opportunities, a copy whenever the response
+            is shared with the cache or other callers
+        """
+        cache_key = InMemoryCache.generate_cache_key(request_body)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return _copy_response(cached)
+        
+        pending = self._pending_searches.get(cache_key)
+        if pending is None:
+            pending = _PendingSearch(asyncio.ensure_future(self._make_request(
+                "POST",
+                "/opportunities/search",
+                json_data=request_body
+            )))
+            self._pending_searches[cache_key] = pending
+            pending.task.add_done_callback(partial(self._finish_search, cache_key, pending))
+        else:
+            logger.debug(f"Joining in-flight search: {cache_key}")
+        pending.waiters += 1
+        # Shielded, so a cancelled caller does not cancel the others' request
+        response = await asyncio.shield(pending.task)
+        
+        if self.response_cache is not None:
+            self.response_cache.set(cache_key, response)
+        elif pending.waiters == 1:
+            # The only caller may have the response itself
+            return response
+        return _copy_response(response)
+    
+    def _finish_search(self, cache_key: str, pending: _PendingSearch, search: asyncio.Future):
+        """Forget a finished in-flight search."""
+        if self._pending_searches.get(cache_key) is pending:
+            del self._pending_searches[cache_key]
+        # Retrieve a failure here, as every caller may have been cancelled
+        # meanwhile, and asyncio would log it as never retrieved
+        if not search.cancelled():
+            search.exception()
+    
+    async def stream_opportunities(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict] = None,
+        page_size: int = 100,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over matching opportunities one page at a time.
+        
+        Pages are ordered by opportunity_id so results stay stable while
+        paging, and each page is only requested once the previous one has
+        been consumed.
+        
+        Args:
+            query: Search query string
+            filters: Filter parameters
+            page_size: Opportunities requested per page
+            max_results: Stop after yielding this many opportunities
+            
+        Yields:
+            Opportunity records
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        
+        yielded = 0
+        page_offset = 1
+        
+        while True:
+            response = await self.search_opportunities(
+                query=query,
+                filters=filters,
+                pagination={
+                    "page_size": page_size,
+                    "page_offset": page_offset,
+                    "order_by": "opportunity_id",
+                    "sort_direction": "descending"
+                }
+            )
+            data = response.get("data") or []
+            
+            for opportunity in data:
+                yield opportunity
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+            
+            total_pages = (response.get("pagination_info") or {}).get("total_pages")
+            if len(data) < page_size or (total_pages is not None and page_offset >= total_pages):
+                return
+            page_offset += 1
+    
     async def get_opportunity(self, opportunity_id: str) -> Dict[str, Any]:
         """
         Get a specific opportunity by ID.
@@ -1,72 +1,221 @@
 """In-memory cache manager with TTL support."""
 
 import hashlib
+import heapq
+import itertools
 import json
 import logging
 import threading
 import time
 from collections import OrderedDict
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+class _CacheEntry:
+    """A cached value with its expiry time and CLOCK reference bit."""
+    
+    __slots__ = ("value", "expires_at", "referenced")
+    
+    def __init__(self, value: Any, expires_at: int):
+        self.value = value
+        # time.monotonic_ns() deadline, so expiry checks are one int compare
+        self.expires_at = expires_at
+        self.referenced = False
+
+
+class _LookupCounts:
+    """Hit and miss counts recorded by a single thread."""
+    
+    __slots__ = ("hits", "misses")
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+class FrequencySketch:
+    """
+    Count-Min Sketch estimating how often keys were accessed recently.
+    
+    Counters saturate at 15 and are all halved once the number of
+    recorded accesses reaches ten times the width, so popularity fades
+    over time (TinyLFU aging).
+    """
+    
+    # One odd multiplier per row, for independent multiplicative hashes
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT = 15
+    
+    def __init__(self, width: int):
+        """
+        Initialize the sketch.
+        
+        Args:
+            width: Minimum counters per row, rounded up to a power of two
+        """
+        bits = max(6, (width - 1).bit_length())
+        self.width = 1 << bits
+        self._shift = 64 - bits
+        self._rows = [bytearray(self.width) for _ in self.SEEDS]
+        self._sample_size = 10 * self.width
+        self._additions = 0
+    
+    def _indexes(self, key: Any):
+        """Counter index of `key` in each row."""
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> self._shift for seed in self.SEEDS]
+    
+    def increment(self, key: Any) -> None:
+        """Record an access to `key`."""
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+            self._additions //= 2
+    
+    def estimate(self, key: Any) -> int:
+        """Estimate how often `key` was accessed recently."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
 class InMemoryCache:
     """
     Thread-safe in-memory cache with TTL (Time-To-Live) support.
     
     Simple ephemeral cache for API responses to reduce redundant calls
-    and improve performance.
+    and improve performance. Keys may be any hashable value. Eviction uses the CLOCK (second chance)
+    policy: a hit only sets the entry's reference bit, and eviction
+    walks entries in insertion order, sparing and clearing referenced
+    ones until it finds one that was not used since the last pass.
+    
+    With `admission` enabled, a full cache only admits a new key if it
+    has been accessed at least as often as the entry it would evict
+    (TinyLFU), so one-off keys cannot push out popular ones.
     """
     
-    def __init__(self, ttl: int = 300, max_size: int = 1000):
+    def __init__(self, ttl: int = 300, max_size: int = 1000, admission: bool = False):
         """
         Initialize the cache.
         
         Args:
             ttl: Time-to-live in seconds (default: 300 = 5 minutes)
             max_size: Maximum number of items to cache (default: 1000)
+            admission: Filter new keys by access frequency when full
         """
         self.ttl = ttl
+        self._ttl_ns = int(ttl * 1_000_000_000)
         self.max_size = max_size
-        self._cache: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
+        self._sketch = FrequencySketch(8 * max(max_size, 1)) if admission else None
+        # Insertion order doubles as the CLOCK hand's sweep order
+        self._cache: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        # Min-heap of (expires_at, tiebreaker, key) for every stored expiry;
+        # entries removed or refreshed since leave stale items behind
+        self._expiry_heap: List[Tuple[int, int, Hashable]] = []
+        self._heap_counter = itertools.count()
         self._lock = threading.RLock()
+        # Lookups run without the lock, so each thread counts its own
+        # hits and misses and get_stats() adds them up; counts of threads
+        # that have exited are folded into _stats
+        self._local = threading.local()
+        self._lookup_counts: List[Tuple[threading.Thread, _LookupCounts]] = []
         self._stats = {
             "hits": 0,
             "misses": 0,
             "evictions": 0,
             "expirations": 0,
+            "rejections": 0,
         }
         
         logger.info(f"Initialized cache with TTL={ttl}s, max_size={max_size}")
     
-    def _is_expired(self, timestamp: float) -> bool:
-        """Check if a cache entry has expired."""
-        return time.time() - timestamp > self.ttl
+    def _thread_lookup_counts(self) -> _LookupCounts:
+        """Get the calling thread's hit and miss counts, registering them on first use."""
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = _LookupCounts()
+            with self._lock:
+                self._retire_lookup_counts()
+                self._lookup_counts.append((threading.current_thread(), counts))
+        return counts
+    
+    def _retire_lookup_counts(self):
+        """Fold the counts of threads that have exited into the shared totals."""
+        live = []
+        for thread, counts in self._lookup_counts:
+            if thread.is_alive():
+                live.append((thread, counts))
+            else:
+                self._stats["hits"] += counts.hits
+                self._stats["misses"] += counts.misses
+        self._lookup_counts = live
+    
+    def _expiry_from_now(self) -> int:
+        """Expiry time, in monotonic nanoseconds, of an entry stored now."""
+        return time.monotonic_ns() + self._ttl_ns
+    
+    def _advance_clock(self) -> Hashable:
+        """Sweep past referenced entries and return the key under the hand."""
+        while True:
+            key, entry = next(iter(self._cache.items()))
+            if not entry.referenced:
+                return key
+            # Second chance: clear the bit and requeue behind the hand
+            entry.referenced = False
+            self._cache.move_to_end(key)
     
     def _evict_oldest(self):
-        """Evict the oldest entry from cache (LRU)."""
+        """Evict the oldest entry not referenced since the last sweep (CLOCK)."""
         if self._cache:
-            evicted_key, _ = self._cache.popitem(last=False)
+            key = self._advance_clock()
+            del self._cache[key]
             self._stats["evictions"] += 1
-            logger.debug(f"Evicted oldest cache entry: {evicted_key}")
+            logger.debug(f"Evicted oldest cache entry: {key}")
     
-    def _cleanup_expired(self):
-        """Remove all expired entries from cache."""
-        expired_keys = []
-        current_time = time.time()
+    def _admit(self, key: Hashable) -> bool:
+        """Check if `key` is accessed at least as often as the next victim."""
+        victim = self._advance_clock()
+        return self._sketch.estimate(key) >= self._sketch.estimate(victim)
+    
+    def _push_expiry(self, key: Hashable, expires_at: int):
+        """Track that the entry stored under `key` expires at `expires_at`."""
+        heapq.heappush(self._expiry_heap, (expires_at, next(self._heap_counter), key))
         
-        for key, (_, timestamp) in self._cache.items():
-            if current_time - timestamp > self.ttl:
-                expired_keys.append(key)
+        # Stale items pile up when keys are refreshed or evicted; rebuild
+        # from the live entries once they dominate the heap
+        if len(self._expiry_heap) > 2 * max(self.max_size, 32):
+            self._expiry_heap = [
+                (entry.expires_at, next(self._heap_counter), key)
+                for key, entry in self._cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+    
+    def _cleanup_expired(self):
+        """Remove expired entries from cache, oldest first."""
+        expired_count = 0
+        now = time.monotonic_ns()
+        heap = self._expiry_heap
         
-        for key in expired_keys:
-            del self._cache[key]
-            self._stats["expirations"] += 1
+        while heap and heap[0][0] < now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip stale items of entries since removed or refreshed
+            if entry is not None and entry.expires_at == expires_at:
+                del self._cache[key]
+                self._stats["expirations"] += 1
+                expired_count += 1
         
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired entries")
+        if expired_count:
+            logger.debug(f"Cleaned up {expired_count} expired entries")
     
     @staticmethod
     def generate_cache_key(*args, **kwargs) -> str:
@@ -81,13 +230,26 @@ class InMemoryCache:
             "kwargs": kwargs
         }
         
-        # Create a stable JSON representation
-        key_str = json.dumps(key_data, sort_keys=True, default=str)
+        # Create a stable JSON representation; orjson is much faster than
+        # json.dumps here, and serialization dominates for short keys
+        key_bytes = None
+        if orjson is not None:
+            try:
+                key_bytes = orjson.dumps(
+                    key_data,
+                    default=str,
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                )
+            except TypeError:  # e.g. integers wider than 64 bits
+                pass
+        if key_bytes is None:
+            key_bytes = json.dumps(key_data, sort_keys=True, default=str).encode()
         
-        # Generate hash for the key
-        return hashlib.md5(key_str.encode()).hexdigest()
+        # Generate hash for the key (SHA-256 is hardware-accelerated on
+        # modern x86/ARM CPUs and outpaces MD5/BLAKE2b on long queries)
+        return hashlib.sha256(key_bytes).hexdigest()[:32]
     
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get a value from cache.
         
@@ -97,29 +259,35 @@ class InMemoryCache:
         Returns:
             Cached value if found and not expired, None otherwise
         """
-        with self._lock:
-            if key in self._cache:
-                value, timestamp = self._cache[key]
-                
-                if self._is_expired(timestamp):
-                    # Entry has expired
+        counts = self._thread_lookup_counts()
+        if self._sketch is not None:
+            # Approximate by design, so concurrent increments may race
+            self._sketch.increment(key)
+        
+        # Lock-free read: a hit only sets the entry's reference bit
+        entry = self._cache.get(key)
+        if entry is None:
+            counts.misses += 1
+            logger.debug(f"Cache miss: {key}")
+            return None
+        
+        if entry.expires_at < time.monotonic_ns():
+            # Entry has expired, unless another thread replaced it meanwhile
+            with self._lock:
+                if self._cache.get(key) is entry:
                     del self._cache[key]
                     self._stats["expirations"] += 1
-                    self._stats["misses"] += 1
-                    logger.debug(f"Cache miss (expired): {key}")
-                    return None
-                
-                # Move to end (most recently used)
-                self._cache.move_to_end(key)
-                self._stats["hits"] += 1
-                logger.debug(f"Cache hit: {key}")
-                return value
-            
-            self._stats["misses"] += 1
-            logger.debug(f"Cache miss: {key}")
+            counts.misses += 1
+            logger.debug(f"Cache miss (expired): {key}")
             return None
+        
+        # Mark as recently used; eviction gives it a second chance
+        entry.referenced = True
+        counts.hits += 1
+        logger.debug(f"Cache hit: {key}")
+        return entry.value
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: Hashable, value: Any) -> None:
         """
         Set a value in cache.
         
@@ -128,22 +296,41 @@ class InMemoryCache:
             value: Value to cache
         """
         with self._lock:
-            # Clean up expired entries periodically
-            if len(self._cache) > self.max_size * 1.1:  # 10% buffer
-                self._cleanup_expired()
+            entry = self._cache.get(key)
+            if entry is not None:
+                # Refresh in place; the key keeps its place in the sweep
+                entry.value = value
+                entry.expires_at = self._expiry_from_now()
+                entry.referenced = True
+                self._push_expiry(key, entry.expires_at)
+                logger.debug(f"Cached value for key: {key}")
+                return
+            
+            if self.max_size <= 0:
+                return
             
-            # Evict oldest if at capacity
+            if self._sketch is not None:
+                self._sketch.increment(key)
+            
+            # Drop expired entries first, so they are not evicted in place of live ones
+            self._cleanup_expired()
+            
+            # Evict if at capacity, unless the new key is too rarely used
             if len(self._cache) >= self.max_size:
+                if self._sketch is not None and not self._admit(key):
+                    self._stats["rejections"] += 1
+                    logger.debug(f"Rejected cache admission for key: {key}")
+                    return
                 self._evict_oldest()
             
-            # Store value with current timestamp
-            self._cache[key] = (value, time.time())
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
+            # Store value with its expiry time
+            expires_at = self._expiry_from_now()
+            self._cache[key] = _CacheEntry(value, expires_at)
+            self._push_expiry(key, expires_at)
             
             logger.debug(f"Cached value for key: {key}")
     
-    def invalidate(self, key: str) -> bool:
+    def invalidate(self, key: Hashable) -> bool:
         """
         Invalidate (remove) a specific cache entry.
         
@@ -165,6 +352,7 @@ class InMemoryCache:
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._expiry_heap.clear()
             logger.info(f"Cleared cache ({count} entries)")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -175,19 +363,23 @@ class InMemoryCache:
             Dictionary containing cache statistics
         """
         with self._lock:
-            total_requests = self._stats["hits"] + self._stats["misses"]
-            hit_rate = (
-                self._stats["hits"] / total_requests if total_requests > 0 else 0
+            self._retire_lookup_counts()
+            hits = self._stats["hits"] + sum(counts.hits for _, counts in self._lookup_counts)
+            misses = self._stats["misses"] + sum(
+                counts.misses for _, counts in self._lookup_counts
             )
+            total_requests = hits + misses
+            hit_rate = hits / total_requests if total_requests > 0 else 0
             
             return {
                 "size": len(self._cache),
                 "max_size": self.max_size,
                 "ttl_seconds": self.ttl,
-                "hits": self._stats["hits"],
-                "misses": self._stats["misses"],
+                "hits": hits,
+                "misses": misses,
                 "evictions": self._stats["evictions"],
                 "expirations": self._stats["expirations"],
+                "rejections": self._stats["rejections"],
                 "hit_rate": round(hit_rate, 3),
                 "total_requests": total_requests,
             }
@@ -197,7 +389,7 @@ class InMemoryCache:
         with self._lock:
             return len(self._cache)
     
-    def __contains__(self, key: str) -> bool:
+    def __contains__(self, key: Hashable) -> bool:
         """Check if key exists in cache (even if expired)."""
         with self._lock:
             return key in self._cache
@@ -5,9 +5,21 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Union
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_sorted(data: Any) -> bytes:
+    """Serialize normalized key data to compact JSON with sorted keys."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+
 class CacheKeyGenerator:
     """
     Optimized cache key generator with multiple strategies.
@@ -120,10 +132,10 @@ class CacheKeyGenerator:
             "tool": tool_name,
             "params": normalized
         }
-        key_str = json.dumps(key_data, sort_keys=True, separators=(",", ":"))
+        key_bytes = _dumps_sorted(key_data)
         
         # Generate hash (using SHA256 for better distribution)
-        hash_value = hashlib.sha256(key_str.encode()).hexdigest()[:16]
+        hash_value = hashlib.sha256(key_bytes).hexdigest()[:16]
         
         return f"{prefix}:{hash_value}"
     
@@ -158,8 +170,7 @@ class CacheKeyGenerator:
                 primary_normalized[key] = cls._normalize_value(value)
         
         # Generate primary hash (shorter)
-        primary_str = json.dumps(primary_normalized, sort_keys=True, separators=(",", ":"))
-        primary_hash = hashlib.md5(primary_str.encode()).hexdigest()[:8]
+        primary_hash = hashlib.md5(_dumps_sorted(primary_normalized)).hexdigest()[:8]
         
         # Handle secondary parameters if provided
         if secondary_params:
@@ -168,8 +179,7 @@ class CacheKeyGenerator:
                 if value is not None:
                     secondary_normalized[key] = cls._normalize_value(value)
             
-            secondary_str = json.dumps(secondary_normalized, sort_keys=True, separators=(",", ":"))
-            secondary_hash = hashlib.md5(secondary_str.encode()).hexdigest()[:8]
+            secondary_hash = hashlib.md5(_dumps_sorted(secondary_normalized)).hexdigest()[:8]
             
             return f"{prefix}:{primary_hash}:{secondary_hash}"
         
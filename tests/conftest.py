@@ -1,5 +1,7 @@
 """Test configuration following testing_v3.md specifications."""
 
+import asyncio
+import copy
 import json
 import os
 import sys
@@ -12,6 +14,11 @@ import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # Optional, and unavailable on Windows
+    uvloop = None
+
 # Add src to Python path for tests
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
@@ -30,6 +37,9 @@ TEST_API_KEY = os.getenv("API_KEY", "test_api_key_12345")
 REAL_API_KEY = os.getenv("API_KEY", "test_key")  # Will use real key from .env
 USE_REAL_API = os.getenv("USE_REAL_API", "false").lower() == "true"
 API_BASE_URL = "https://api.simpler.grants.gov/v1"
+REPLAY_SNAPSHOTS = bool(os.getenv("GRANTS_MCP_REPLAY"))
+RECORD_SNAPSHOTS = bool(os.getenv("GRANTS_MCP_RECORD"))
+SNAPSHOT_PATH = Path(__file__).parent / "fixtures" / "real_api_snapshots.json"
 
 # Test settings for different environments
 TEST_SETTINGS = Settings(
@@ -51,6 +61,31 @@ REAL_API_SETTINGS = Settings(
 )
 
 
+SAMPLE_OPPORTUNITY = {
+    "opportunity_id": "12345",
+    "opportunity_number": "TEST-2024-001",
+    "opportunity_title": "Test Grant Opportunity",
+    "opportunity_status": "posted",
+    "agency": "TEST",
+    "agency_code": "TST",
+    "agency_name": "Test Agency",
+    "category": "Science and Technology",
+    "summary": {
+        "award_ceiling": 500000,
+        "award_floor": 100000,
+        "estimated_total_program_funding": 5000000,
+        "expected_number_of_awards": 10,
+        "post_date": "2024-01-01",
+        "close_date": "2024-03-31",
+        "summary_description": "Test grant for research projects",
+        "applicant_eligibility_description": "Universities and research institutions",
+        "additional_info_url": "https://example.com/grant-info",
+        "agency_email_address": "grants@test.gov",
+        "agency_phone_number": "555-0100"
+    }
+}
+
+
 @pytest.fixture
 def test_mode():
     """Determine if we're using real API or mocked."""
@@ -69,7 +104,13 @@ def cache():
     return InMemoryCache(ttl=60, max_size=100)
 
 
-@pytest_asyncio.fixture
+@pytest.fixture(scope="module")
+def api_client():
+    """Shared offline API client for tests that patch its request layer."""
+    return SimplerGrantsAPIClient(api_key="test_key", max_retry_wait=0)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def mcp_server(test_settings):
     """Get MCP server instance configured for testing."""
     server = GrantsAnalysisServer(settings=test_settings)
@@ -77,9 +118,9 @@ async def mcp_server(test_settings):
     await server.api_client.close()
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def real_api_client():
-    """Create a real API client for integration tests."""
+    """Real API client shared by the live tests, so they reuse one connection pool."""
     client = SimplerGrantsAPIClient(
         api_key=REAL_API_KEY,
         base_url=API_BASE_URL
@@ -88,7 +129,32 @@ async def real_api_client():
     await client.close()
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def live_api_warmup(real_api_client):
+    """Prefetch the responses shared by the live tests in one concurrent batch."""
+    recorder = SnapshotRecorder()
+    requests = {
+        "health": lambda: real_api_client.check_health(),
+        "posted": lambda: real_api_client.search_opportunities(
+            filters={"opportunity_status": {"one_of": ["posted"]}},
+            pagination={"page_size": 3}
+        ),
+        "page1": lambda: real_api_client.search_opportunities(
+            pagination={"page_size": 5, "page_offset": 1}
+        ),
+        "page2": lambda: real_api_client.search_opportunities(
+            pagination={"page_size": 5, "page_offset": 2}
+        ),
+        "sample": lambda: real_api_client.search_opportunities(pagination={"page_size": 20}),
+    }
+    responses = await asyncio.gather(*(
+        recorder.record(name, api_call) for name, api_call in requests.items()
+    ))
+    recorder.save()
+    return dict(zip(requests, responses))
+
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def test_api_client(test_mode):
     """Create appropriate API client based on test mode."""
     if test_mode:
@@ -112,29 +178,13 @@ async def test_api_client(test_mode):
 @pytest.fixture
 def sample_opportunity():
     """Create a sample opportunity for testing."""
-    return {
-        "opportunity_id": 12345,
-        "opportunity_number": "TEST-2024-001",
-        "opportunity_title": "Test Grant Opportunity",
-        "opportunity_status": "posted",
-        "agency": "TEST",
-        "agency_code": "TST",
-        "agency_name": "Test Agency",
-        "category": "Science and Technology",
-        "summary": {
-            "award_ceiling": 500000,
-            "award_floor": 100000,
-            "estimated_total_program_funding": 5000000,
-            "expected_number_of_awards": 10,
-            "post_date": "2024-01-01",
-            "close_date": "2024-03-31",
-            "summary_description": "Test grant for research projects",
-            "applicant_eligibility_description": "Universities and research institutions",
-            "additional_info_url": "https://example.com/grant-info",
-            "agency_email_address": "grants@test.gov",
-            "agency_phone_number": "555-0100"
-        }
-    }
+    return copy.deepcopy(SAMPLE_OPPORTUNITY)
+
+
+@pytest.fixture(scope="session")
+def sample_opportunity_model():
+    """The sample opportunity, validated into an OpportunityV1 once per session."""
+    return OpportunityV1(**SAMPLE_OPPORTUNITY)
 
 
 @pytest.fixture
@@ -154,27 +204,66 @@ def sample_api_response(sample_opportunity):
     }
 
 
+class SnapshotRecorder:
+    """
+    Record real API responses, or replay them when GRANTS_MCP_REPLAY is set.
+    
+    Recorded responses are only written to the snapshot file when
+    GRANTS_MCP_RECORD is set. Record without xdist (``-p no:xdist``), as
+    concurrent workers would overwrite each other's snapshots.
+    """
+    
+    def __init__(
+        self,
+        path: Path = SNAPSHOT_PATH,
+        replay: bool = REPLAY_SNAPSHOTS,
+        recording: bool = RECORD_SNAPSHOTS
+    ):
+        self.path = path
+        self.replay = replay
+        self.recording = recording and not replay
+        self.snapshots = self._load(path) if replay else {}
+        
+    @staticmethod
+    def _load(path: Path) -> dict:
+        """Load previously recorded snapshots from disk."""
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+        
+    async def record(self, name: str, api_call):
+        """Record an API response snapshot, or return the recorded one in replay mode."""
+        if self.replay:
+            if name not in self.snapshots:
+                pytest.skip(
+                    f"No recorded API snapshot {name!r} in {self.path.name}; "
+                    "record one with GRANTS_MCP_RECORD=1"
+                )
+            return self.snapshots[name]["response"]
+        response = await api_call()
+        self.snapshots[name] = {
+            "timestamp": datetime.now().isoformat(),
+            "response": response
+        }
+        return response
+        
+    def save(self, filepath: Optional[str] = None):
+        """Merge recorded snapshots into the snapshot file, when recording."""
+        if not self.recording:
+            return
+        path = Path(filepath) if filepath else self.path
+        snapshots = {**self._load(path), **self.snapshots}
+        # Write a temporary file and swap it in, so readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshots, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+
 @pytest.fixture
 def api_snapshot_recorder():
     """Record real API responses for fixture generation."""
-    class SnapshotRecorder:
-        def __init__(self):
-            self.snapshots = {}
-            
-        async def record(self, name: str, api_call):
-            """Record an API response snapshot."""
-            response = await api_call()
-            self.snapshots[name] = {
-                "timestamp": datetime.now().isoformat(),
-                "response": response
-            }
-            return response
-            
-        def save(self, filepath: str):
-            """Save snapshots to file."""
-            with open(filepath, 'w') as f:
-                json.dump(self.snapshots, f, indent=2, default=str)
-                
     return SnapshotRecorder()
 
 
@@ -249,6 +338,21 @@ def performance_tracker():
     return PerformanceTracker()
 
 
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on one session-wide event loop."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
 # Register custom markers
 def pytest_configure(config):
     """Register custom markers."""
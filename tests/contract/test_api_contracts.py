@@ -1,8 +1,7 @@
 """Contract tests for API schema validation and MCP protocol compliance."""
 
-import asyncio
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from pydantic import ValidationError
@@ -263,8 +262,7 @@ class TestMCPProtocolCompliance:
         
         # Mock API client
         mock_api_client = Mock()
-        mock_api_client.search_opportunities.return_value = asyncio.create_future()
-        mock_api_client.search_opportunities.return_value.set_result({
+        mock_api_client.search_opportunities = AsyncMock(return_value={
             "data": [],
             "pagination_info": {"total_records": 0}
         })
@@ -1,247 +1,198 @@
 """Edge case tests for error handling, network failures, and malformed data."""
 
 import asyncio
+import gc
 import json
-from unittest.mock import AsyncMock, Mock, patch
+from contextlib import contextmanager
+from functools import partial
+from itertools import count
+from unittest.mock import patch
 from datetime import datetime, timedelta
 
+import httpx
 import pytest
-import aiohttp
 
-from mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
+from mcp_server.tools.utils.api_client import (
+    APIError,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitError,
+    SimplerGrantsAPIClient,
+)
 from mcp_server.tools.utils.cache_manager import InMemoryCache
 from mcp_server.config.settings import Settings
 
 
+pytestmark = pytest.mark.edge_case
+
+EMPTY_RESULTS = {"data": [], "pagination_info": {"total_records": 0}}
+
+MALFORMED_RESPONSES = [
+    {},  # Empty response
+    {"data": None},  # Missing data
+    {"data": []},  # Empty data, missing pagination_info
+    {"pagination_info": {"total_records": 10}},  # Missing data field
+    {"data": [{"opportunity_id": 123}]},  # Missing pagination_info
+]
+
+INVALID_PAGINATION_ERRORS = (ValueError, APIError)
+
+MALFORMED_CACHE_KEYS = [
+    None,  # None key
+    "",  # Empty string
+    " ",  # Whitespace only
+    "key with spaces and special chars !@#$%^&*()",
+    "very_long_key_" + "x" * 1000,  # Very long key
+    "unicode_key_ñáéíóú_🎉",  # Unicode characters
+    {"not": "a_string"},  # Non-string key (should be converted)
+]
+
+CIRCULAR_REFERENCE = {"ref": None}
+CIRCULAR_REFERENCE["ref"] = CIRCULAR_REFERENCE
+
+MALFORMED_CACHE_VALUES = [
+    None,  # None value
+    "",  # Empty string
+    [],  # Empty list
+    {},  # Empty dict
+    float('inf'),  # Infinity
+    float('nan'),  # NaN
+    {"circular": None},  # Circular reference (simulated)
+]
+
+
+@contextmanager
+def fake_http(client, handler):
+    """Route the client's HTTP traffic through an in-process transport."""
+    transport = httpx.MockTransport(handler)
+    fake = httpx.AsyncClient(transport=transport, headers=client.client.headers)
+    breaker = CircuitBreaker(
+        fail_max=client.circuit_breaker.fail_max,
+        reset_timeout=client.circuit_breaker.reset_timeout,
+    )
+    with patch.object(client, "client", fake), patch.object(client, "circuit_breaker", breaker):
+        yield
+
+
+def _respond_with(payload, request, status=200, headers=None):
+    """Transport handler that answers every request with a JSON payload."""
+    return httpx.Response(status, json=payload, headers=headers)
+
+
 class TestNetworkFailures:
     """Test handling of various network failure scenarios."""
     
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_connection_timeout_handling(self):
+    async def test_connection_timeout_handling(self, api_client):
         """Test handling of connection timeouts."""
         
-        async def timeout_side_effect(*args, **kwargs):
-            raise asyncio.TimeoutError("Connection timeout")
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
+        def timeout_handler(request):
+            raise httpx.ConnectTimeout("Connection timeout", request=request)
         
-        with patch.object(client, '_make_request', side_effect=timeout_side_effect):
-            with pytest.raises(asyncio.TimeoutError):
-                await client.search_opportunities(query="test")
+        with fake_http(api_client, timeout_handler):
+            with pytest.raises(APIError, match="Request timeout") as exc_info:
+                await api_client.search_opportunities(query="test")
+            assert exc_info.value.status_code == 0
                 
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_connection_error_handling(self):
+    async def test_connection_error_handling(self, api_client):
         """Test handling of connection errors."""
         
-        async def connection_error_side_effect(*args, **kwargs):
-            raise aiohttp.ClientConnectorError(
-                connection_key=None,
-                os_error=OSError("Connection refused")
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
+        def connection_error_handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
         
-        with patch.object(client, '_make_request', side_effect=connection_error_side_effect):
-            with pytest.raises(aiohttp.ClientConnectorError):
-                await client.search_opportunities(query="test")
+        with fake_http(api_client, connection_error_handler):
+            with pytest.raises(APIError, match="Network error") as exc_info:
+                await api_client.search_opportunities(query="test")
+            assert exc_info.value.status_code == 0
                 
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_ssl_certificate_error(self):
+    async def test_ssl_certificate_error(self, api_client):
         """Test handling of SSL certificate errors."""
         
-        async def ssl_error_side_effect(*args, **kwargs):
-            raise aiohttp.ClientSSLError("SSL certificate verification failed")
+        def ssl_error_handler(request):
+            raise httpx.ConnectError("SSL certificate verification failed", request=request)
         
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=ssl_error_side_effect):
-            with pytest.raises(aiohttp.ClientSSLError):
-                await client.search_opportunities(query="test")
+        with fake_http(api_client, ssl_error_handler):
+            with pytest.raises(APIError, match="SSL certificate"):
+                await api_client.search_opportunities(query="test")
                 
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_dns_resolution_failure(self):
+    async def test_dns_resolution_failure(self, api_client):
         """Test handling of DNS resolution failures."""
         
-        async def dns_error_side_effect(*args, **kwargs):
-            raise aiohttp.ClientConnectorError(
-                connection_key=None,
-                os_error=OSError("Name or service not known")
-            )
+        def dns_error_handler(request):
+            raise httpx.ConnectError("Name or service not known", request=request)
         
-        client = SimplerGrantsAPIClient(api_key="test_key")
+        with fake_http(api_client, dns_error_handler):
+            with pytest.raises(APIError, match="Name or service not known"):
+                await api_client.search_opportunities(query="test")
+                
+    @pytest.mark.asyncio
+    async def test_search_with_http2_enabled(self):
+        """Test that a client built with HTTP/2 (h2 installed) searches normally."""
+        pytest.importorskip("h2")
+        
+        async with SimplerGrantsAPIClient(api_key="test_key") as client:
+            assert client.client._transport._pool._http2
+            # Keep the client's HTTP/2 configuration, but answer in-process
+            with patch.object(client.client, "_transport", httpx.MockTransport(
+                partial(_respond_with, EMPTY_RESULTS)
+            )):
+                result = await client.search_opportunities(query="test")
         
-        with patch.object(client, '_make_request', side_effect=dns_error_side_effect):
-            with pytest.raises(aiohttp.ClientConnectorError):
-                await client.search_opportunities(query="test")
+        assert result == EMPTY_RESULTS
 
 
 class TestAPIErrorResponses:
     """Test handling of various API error responses."""
     
-    @pytest.mark.edge_case
-    @pytest.mark.asyncio
-    async def test_http_401_unauthorized(self):
-        """Test handling of 401 Unauthorized responses."""
-        
-        mock_response = Mock()
-        mock_response.status = 401
-        mock_response.json.return_value = asyncio.create_future()
-        mock_response.json.return_value.set_result({"error": "Invalid API key"})
-        
-        async def unauthorized_side_effect(*args, **kwargs):
-            raise aiohttp.ClientResponseError(
-                request_info=None,
-                history=(),
-                status=401,
-                message="Unauthorized"
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="invalid_key")
-        
-        with patch.object(client, '_make_request', side_effect=unauthorized_side_effect):
-            with pytest.raises(aiohttp.ClientResponseError) as exc_info:
-                await client.search_opportunities(query="test")
-            assert exc_info.value.status == 401
-            
-    @pytest.mark.edge_case
-    @pytest.mark.asyncio
-    async def test_http_403_forbidden(self):
-        """Test handling of 403 Forbidden responses."""
-        
-        async def forbidden_side_effect(*args, **kwargs):
-            raise aiohttp.ClientResponseError(
-                request_info=None,
-                history=(),
-                status=403,
-                message="Forbidden"
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=forbidden_side_effect):
-            with pytest.raises(aiohttp.ClientResponseError) as exc_info:
-                await client.search_opportunities(query="test")
-            assert exc_info.value.status == 403
-            
-    @pytest.mark.edge_case
-    @pytest.mark.asyncio
-    async def test_http_429_rate_limit(self):
-        """Test handling of 429 Rate Limit Exceeded responses."""
-        
-        async def rate_limit_side_effect(*args, **kwargs):
-            raise aiohttp.ClientResponseError(
-                request_info=None,
-                history=(),
-                status=429,
-                message="Rate Limit Exceeded",
-                headers={"Retry-After": "60"}
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=rate_limit_side_effect):
-            with pytest.raises(aiohttp.ClientResponseError) as exc_info:
-                await client.search_opportunities(query="test")
-            assert exc_info.value.status == 429
-            
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_http_500_internal_server_error(self):
-        """Test handling of 500 Internal Server Error responses."""
-        
-        async def server_error_side_effect(*args, **kwargs):
-            raise aiohttp.ClientResponseError(
-                request_info=None,
-                history=(),
-                status=500,
-                message="Internal Server Error"
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=server_error_side_effect):
-            with pytest.raises(aiohttp.ClientResponseError) as exc_info:
-                await client.search_opportunities(query="test")
-            assert exc_info.value.status == 500
-            
-    @pytest.mark.edge_case
-    @pytest.mark.asyncio
-    async def test_http_503_service_unavailable(self):
-        """Test handling of 503 Service Unavailable responses."""
-        
-        async def service_unavailable_side_effect(*args, **kwargs):
-            raise aiohttp.ClientResponseError(
-                request_info=None,
-                history=(),
-                status=503,
-                message="Service Unavailable"
-            )
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=service_unavailable_side_effect):
-            with pytest.raises(aiohttp.ClientResponseError) as exc_info:
-                await client.search_opportunities(query="test")
-            assert exc_info.value.status == 503
+    @pytest.mark.parametrize("status,message,headers", [
+        (401, "Unauthorized", None),
+        (403, "Forbidden", None),
+        (429, "Rate Limit Exceeded", {"Retry-After": "60"}),
+        (500, "Internal Server Error", None),
+        (503, "Service Unavailable", None),
+    ])
+    async def test_http_error_status(self, api_client, status, message, headers):
+        """Test handling of HTTP error status responses."""
+        
+        handler = partial(_respond_with, {"message": message}, status=status, headers=headers)
+        
+        with fake_http(api_client, handler):
+            with pytest.raises(APIError) as exc_info:
+                await api_client.search_opportunities(query="test")
+            assert exc_info.value.status_code == status
+            assert isinstance(exc_info.value, RateLimitError) == (status == 429)
 
 
 class TestMalformedDataHandling:
     """Test handling of malformed or unexpected data."""
     
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_invalid_json_response(self):
+    async def test_invalid_json_response(self, api_client):
         """Test handling of invalid JSON responses."""
         
-        async def invalid_json_side_effect(*args, **kwargs):
-            mock_response = Mock()
-            mock_response.status = 200
-            mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "doc", 0)
-            mock_response.text.return_value = asyncio.create_future()
-            mock_response.text.return_value.set_result("Invalid JSON response")
-            return mock_response
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
+        def invalid_json_handler(request):
+            return httpx.Response(200, text="Invalid JSON response")
         
-        with patch.object(client, '_make_request', side_effect=invalid_json_side_effect):
+        with fake_http(api_client, invalid_json_handler):
             with pytest.raises(json.JSONDecodeError):
-                await client.search_opportunities(query="test")
+                await api_client.search_opportunities(query="test")
                 
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_missing_required_fields(self):
+    @pytest.mark.parametrize("malformed", MALFORMED_RESPONSES)
+    async def test_missing_required_fields(self, api_client, malformed):
         """Test handling of API responses missing required fields."""
         
-        malformed_responses = [
-            {},  # Empty response
-            {"data": None},  # Missing data
-            {"data": []},  # Empty data, missing pagination_info
-            {"pagination_info": {"total_records": 10}},  # Missing data field
-            {"data": [{"opportunity_id": 123}]},  # Missing pagination_info
-        ]
-        
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        for response in malformed_responses:
-            async def malformed_side_effect(*args, **kwargs):
-                mock_response = Mock()
-                mock_response.status = 200
-                mock_response.json.return_value = asyncio.create_future()
-                mock_response.json.return_value.set_result(response)
-                return mock_response
-            
-            with patch.object(client, '_make_request', side_effect=malformed_side_effect):
-                result = await client.search_opportunities(query="test")
-                # Client should handle gracefully, possibly returning empty results
-                assert isinstance(result, dict)
+        with fake_http(api_client, partial(_respond_with, malformed)):
+            result = await api_client.search_opportunities(query="test")
+            # Client should handle gracefully, possibly returning empty results
+            assert isinstance(result, dict)
                 
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_malformed_opportunity_data(self):
+    async def test_malformed_opportunity_data(self, api_client):
         """Test handling of opportunities with malformed data."""
         
         malformed_opportunity = {
@@ -261,120 +212,104 @@ class TestMalformedDataHandling:
             "pagination_info": {"total_records": 1}
         }
         
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        async def malformed_side_effect(*args, **kwargs):
-            mock_response = Mock()
-            mock_response.status = 200
-            mock_response.json.return_value = asyncio.create_future()
-            mock_response.json.return_value.set_result(malformed_response)
-            return mock_response
-        
-        with patch.object(client, '_make_request', side_effect=malformed_side_effect):
-            result = await client.search_opportunities(query="test")
+        with fake_http(api_client, partial(_respond_with, malformed_response)):
+            result = await api_client.search_opportunities(query="test")
             assert "data" in result
             assert len(result["data"]) == 1
             # Verify the malformed data is preserved but doesn't break processing
             
-    @pytest.mark.edge_case
-    def test_cache_with_malformed_keys(self):
+    @pytest.mark.parametrize("key", MALFORMED_CACHE_KEYS)
+    def test_cache_with_malformed_keys(self, key):
         """Test cache handling of malformed or problematic keys."""
         cache = InMemoryCache(ttl=60, max_size=100)
         
-        problematic_keys = [
-            None,  # None key
-            "",  # Empty string
-            " ",  # Whitespace only
-            "key with spaces and special chars !@#$%^&*()",
-            "very_long_key_" + "x" * 1000,  # Very long key
-            "unicode_key_ñáéíóú_🎉",  # Unicode characters
-            {"not": "a_string"},  # Non-string key (should be converted)
-        ]
-        
-        for key in problematic_keys:
-            try:
-                cache.set(key, f"value_for_{key}")
-                result = cache.get(key)
-                # Should either work or fail gracefully
-                assert result is None or isinstance(result, str)
-            except Exception as e:
-                # Should not raise unexpected exceptions
-                assert isinstance(e, (TypeError, ValueError, KeyError))
+        try:
+            cache.set(key, f"value_for_{key}")
+            result = cache.get(key)
+            # Should either work or fail gracefully
+            assert result is None or isinstance(result, str)
+        except Exception as e:
+            # Should not raise unexpected exceptions
+            assert isinstance(e, (TypeError, ValueError, KeyError))
                 
-    @pytest.mark.edge_case
-    def test_cache_with_malformed_values(self):
+    @pytest.mark.parametrize("value", MALFORMED_CACHE_VALUES)
+    def test_cache_with_malformed_values(self, value):
         """Test cache handling of malformed or problematic values."""
         cache = InMemoryCache(ttl=60, max_size=100)
         
-        problematic_values = [
-            None,  # None value
-            "",  # Empty string
-            [],  # Empty list
-            {},  # Empty dict
-            float('inf'),  # Infinity
-            float('nan'),  # NaN
-            {"circular": None},  # Circular reference (simulated)
-        ]
-        
-        # Add circular reference
-        circular = {"ref": None}
-        circular["ref"] = circular
-        problematic_values.append(circular)
-        
-        for i, value in enumerate(problematic_values):
-            try:
-                cache.set(f"key_{i}", value)
-                result = cache.get(f"key_{i}")
-                # Should handle gracefully
-                assert result is not None or value is None
-            except Exception as e:
-                # Should not raise unexpected exceptions
-                assert isinstance(e, (TypeError, ValueError, RecursionError))
+        try:
+            cache.set("key", value)
+            result = cache.get("key")
+            # Should handle gracefully
+            assert result is not None or value is None
+        except Exception as e:
+            # Should not raise unexpected exceptions
+            assert isinstance(e, (TypeError, ValueError))
+                
+    def test_cache_with_circular_value(self):
+        """Test that self-referencing values are stored without being walked."""
+        cache = InMemoryCache(ttl=60, max_size=100)
+        
+        cache.set("key", CIRCULAR_REFERENCE)
+        
+        assert cache.get("key") is CIRCULAR_REFERENCE
 
 
 class TestBoundaryValues:
     """Test handling of boundary values and edge cases."""
     
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_zero_page_size_request(self):
-        """Test API request with zero page size."""
-        client = SimplerGrantsAPIClient(api_key="test_key")
+    @pytest.mark.parametrize("pagination", [
+        {"page_size": 0, "page_offset": 1},  # Zero page size
+        {"page_size": 10, "page_offset": -1},  # Negative page offset
+        {"page_size": 999999, "page_offset": 1},  # Extremely large page size
+    ])
+    async def test_invalid_pagination(self, api_client, pagination):
+        """Test API requests with out-of-range pagination."""
         
-        # Should handle gracefully or raise appropriate error
-        with pytest.raises((ValueError, aiohttp.ClientResponseError)):
-            await client.search_opportunities(
-                query="test",
-                pagination={"page_size": 0, "page_offset": 1}
-            )
-            
-    @pytest.mark.edge_case
-    @pytest.mark.asyncio
-    async def test_negative_page_offset(self):
-        """Test API request with negative page offset."""
-        client = SimplerGrantsAPIClient(api_key="test_key")
+        handler = partial(_respond_with, {"message": "Validation error"}, status=422)
         
         # Should handle gracefully or raise appropriate error
-        with pytest.raises((ValueError, aiohttp.ClientResponseError)):
-            await client.search_opportunities(
-                query="test",
-                pagination={"page_size": 10, "page_offset": -1}
-            )
+        with fake_http(api_client, handler):
+            with pytest.raises(INVALID_PAGINATION_ERRORS):
+                await api_client.search_opportunities(
+                    query="test",
+                    pagination=pagination
+                )
             
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_extremely_large_page_size(self):
-        """Test API request with extremely large page size."""
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        # Should handle gracefully or raise appropriate error
-        with pytest.raises((ValueError, aiohttp.ClientResponseError)):
-            await client.search_opportunities(
-                query="test",
-                pagination={"page_size": 999999, "page_offset": 1}
+    @pytest.mark.parametrize("max_results, expected_pages", [
+        (None, 3),  # Stops at the short last page
+        (4, 2),  # Stops once enough results were yielded
+    ])
+    async def test_stream_opportunities_pages(self, api_client, max_results, expected_pages):
+        """Test that streaming walks pages until results run out or hit the cap."""
+        pages = []
+        
+        def paged_handler(request):
+            page_offset = json.loads(request.content)["pagination"]["page_offset"]
+            pages.append(page_offset)
+            first_id = (page_offset - 1) * 2
+            data = [
+                {"opportunity_id": str(first_id + i)}
+                for i in range(2 if page_offset < 3 else 1)
+            ]
+            return _respond_with(
+                {"data": data, "pagination_info": {"total_records": 5, "total_pages": 3}},
+                request
             )
-            
-    @pytest.mark.edge_case
+        
+        with fake_http(api_client, paged_handler):
+            opportunity_ids = [
+                opportunity["opportunity_id"]
+                async for opportunity in api_client.stream_opportunities(
+                    page_size=2, max_results=max_results
+                )
+            ]
+        
+        assert opportunity_ids == ["0", "1", "2", "3", "4"][:max_results]
+        assert pages == list(range(1, expected_pages + 1))
+        
     def test_cache_zero_ttl(self):
         """Test cache behavior with zero TTL."""
         cache = InMemoryCache(ttl=0, max_size=100)
@@ -384,7 +319,6 @@ class TestBoundaryValues:
         result = cache.get("key")
         assert result is None
         
-    @pytest.mark.edge_case
     def test_cache_zero_max_size(self):
         """Test cache behavior with zero max size."""
         cache = InMemoryCache(ttl=60, max_size=0)
@@ -395,7 +329,6 @@ class TestBoundaryValues:
         assert result is None
         assert len(cache) == 0
         
-    @pytest.mark.edge_case
     def test_empty_search_query(self):
         """Test handling of empty search queries."""
         from mcp_server.tools.discovery.opportunity_discovery_tool import format_search_results
@@ -409,7 +342,6 @@ class TestBoundaryValues:
         formatted = format_search_results(empty_results, "", {}, 1, 10)
         assert "No grants found" in formatted or "0 grants" in formatted
         
-    @pytest.mark.edge_case
     def test_very_long_search_query(self):
         """Test handling of extremely long search queries."""
         very_long_query = "artificial intelligence " * 1000  # ~21KB query
@@ -423,111 +355,268 @@ class TestBoundaryValues:
 class TestRateLimitingEdgeCases:
     """Test rate limiting edge cases and scenarios."""
     
-    @pytest.mark.edge_case
     @pytest.mark.asyncio
-    async def test_burst_requests_handling(self):
-        """Test handling of burst requests that exceed rate limits."""
+    async def test_burst_requests_handling(self, api_client):
+        """Test that a burst hitting rate limits trips the circuit breaker."""
         
         call_count = 0
         
-        async def rate_limited_side_effect(*args, **kwargs):
+        def rate_limited_handler(request):
             nonlocal call_count
             call_count += 1
             
             if call_count <= 5:
                 # First 5 requests succeed
-                return Mock(status=200, json=AsyncMock(return_value={"data": [], "pagination_info": {"total_records": 0}}))
+                return _respond_with(EMPTY_RESULTS, request)
             else:
                 # Subsequent requests are rate limited
-                raise aiohttp.ClientResponseError(
-                    request_info=None,
-                    history=(),
-                    status=429,
-                    message="Rate Limit Exceeded"
-                )
+                return _respond_with({"message": "Rate Limit Exceeded"}, request, status=429)
         
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=rate_limited_side_effect):
+        with fake_http(api_client, rate_limited_handler):
+            api_client.circuit_breaker.fail_max = 1
+            
             # Make burst of requests
             results = []
             errors = []
             
             for i in range(10):
                 try:
-                    result = await client.search_opportunities(query=f"test {i}")
+                    result = await api_client.search_opportunities(query=f"test {i}")
                     results.append(result)
-                except aiohttp.ClientResponseError as e:
+                except APIError as e:
                     errors.append(e)
             
-            # Should have some successful and some rate-limited requests
-            assert len(results) == 5  # First 5 succeeded
-            assert len(errors) == 5   # Last 5 were rate limited
-            assert all(e.status == 429 for e in errors)
+            # Request 6 is rate limited and opens the circuit
+            assert len(results) == 5
+            assert len(errors) == 5
+            assert isinstance(errors[0], RateLimitError)
+            
+            # Requests 7-10 fail fast without reaching the API
+            assert all(isinstance(e, CircuitOpenError) for e in errors[1:])
+            assert call_count == 5 + api_client.max_retries
+            
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_recovers_after_reset_timeout(self, api_client):
+        """Test that the circuit lets a trial request through and closes on success."""
+        
+        healthy = False
+        
+        def flaky_handler(request):
+            if healthy:
+                return _respond_with(EMPTY_RESULTS, request)
+            return _respond_with({"message": "Service Unavailable"}, request, status=503)
+        
+        with fake_http(api_client, flaky_handler):
+            api_client.circuit_breaker.fail_max = 1
+            api_client.circuit_breaker.reset_timeout = 0
+            
+            with pytest.raises(APIError):
+                await api_client.search_opportunities(query="test")
+            assert api_client.circuit_breaker.is_open
             
-    @pytest.mark.edge_case
-    def test_concurrent_rate_limit_tracking(self):
+            healthy = True
+            result = await api_client.search_opportunities(query="test")
+            
+            assert result == EMPTY_RESULTS
+            assert not api_client.circuit_breaker.is_open
+            
+    @pytest.mark.asyncio
+    async def test_response_cache_shares_identical_searches(self):
+        """Test that identical searches share one request when response caching is on."""
+        
+        request_count = 0
+        
+        async def slow_handler(request):
+            nonlocal request_count
+            request_count += 1
+            await asyncio.sleep(0.01)
+            return _respond_with(EMPTY_RESULTS, request)
+        
+        async with SimplerGrantsAPIClient(api_key="test_key", response_cache_ttl=60) as client:
+            with fake_http(client, slow_handler):
+                concurrent = await asyncio.gather(*(
+                    client.search_opportunities(query="test") for _ in range(3)
+                ))
+                repeated = await client.search_opportunities(query="test")
+                other = await client.search_opportunities(query="other")
+        
+        assert concurrent == [EMPTY_RESULTS] * 3
+        assert repeated == other == EMPTY_RESULTS
+        assert request_count == 2
+        
+    @pytest.mark.asyncio
+    async def test_identical_searches_share_one_request(self):
+        """Test that identical in-flight searches share one request without a response cache."""
+        
+        request_count = 0
+        
+        async def slow_handler(request):
+            nonlocal request_count
+            request_count += 1
+            await asyncio.sleep(0.01)
+            return _respond_with(EMPTY_RESULTS, request)
+        
+        async with SimplerGrantsAPIClient(api_key="test_key") as client:
+            with fake_http(client, slow_handler):
+                concurrent = await asyncio.gather(*(
+                    client.search_opportunities(query="test") for _ in range(3)
+                ))
+                repeated = await client.search_opportunities(query="test")
+        
+        assert concurrent == [EMPTY_RESULTS] * 3
+        assert repeated == EMPTY_RESULTS
+        assert request_count == 2
+        
+    @pytest.mark.asyncio
+    async def test_shared_search_results_are_independent(self):
+        """Test that callers sharing a search or cached response cannot change each other's results."""
+        
+        results = {"data": [{"opportunity_id": 1}], "pagination_info": {"total_records": 1}}
+        
+        async def slow_handler(request):
+            await asyncio.sleep(0.01)
+            return _respond_with(results, request)
+        
+        async with SimplerGrantsAPIClient(api_key="test_key", response_cache_ttl=60) as client:
+            with fake_http(client, slow_handler):
+                first, second = await asyncio.gather(*(
+                    client.search_opportunities(query="test") for _ in range(2)
+                ))
+                first["data"].append({"opportunity_id": 2})
+                first["pagination_info"]["total_records"] = 2
+                cached = await client.search_opportunities(query="test")
+                cached["data"].clear()
+                cached_again = await client.search_opportunities(query="test")
+        
+        assert second == cached_again == results
+        
+    @pytest.mark.asyncio
+    async def test_abandoned_search_failure_is_retrieved(self):
+        """Test that a search failing after its caller was cancelled is not reported as unretrieved."""
+        
+        async def failing_handler(request):
+            await asyncio.sleep(0.01)
+            return _respond_with({"message": "Bad request"}, request, status=400)
+        
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        previous_handler = loop.get_exception_handler()
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+        try:
+            async with SimplerGrantsAPIClient(api_key="test_key") as client:
+                with fake_http(client, failing_handler):
+                    search = asyncio.ensure_future(client.search_opportunities(query="test"))
+                    await asyncio.sleep(0)
+                    search.cancel()
+                    await asyncio.sleep(0.05)
+            del search
+            gc.collect()
+        finally:
+            loop.set_exception_handler(previous_handler)
+        
+        assert not unhandled
+        
+    @pytest.mark.asyncio
+    async def test_concurrent_rate_limit_tracking(self):
         """Test rate limit tracking with concurrent requests."""
         
         # This would be implemented if we had actual rate limiting logic
         # For now, we test that concurrent operations don't break
         
         cache = InMemoryCache(ttl=60, max_size=100)
+        keygen = count()
         
-        import threading
-        import time
-        
-        def worker(worker_id):
+        async def worker(worker_id):
             """Simulate concurrent API usage tracking."""
             for i in range(100):
                 # Simulate rate limit tracking
-                key = f"rate_limit_{time.time()}"
-                cache.set(key, {"worker": worker_id, "request": i, "timestamp": time.time()})
+                key = f"rate_limit_{next(keygen)}"
+                cache.set(key, {"worker": worker_id, "request": i})
+                await asyncio.sleep(0)
                 
-        threads = []
-        for i in range(10):
-            thread = threading.Thread(target=worker, args=(i,))
-            threads.append(thread)
-            thread.start()
+        await asyncio.gather(*(worker(i) for i in range(10)))
             
-        for thread in threads:
-            thread.join()
-            
-        # Should handle concurrent rate limit tracking without issues
+        # Every key is unique, so the cache fills up and evicts the overflow
         stats = cache.get_stats()
-        assert stats["size"] > 0
+        assert stats["size"] == cache.max_size
+        assert stats["evictions"] == 1000 - cache.max_size
         
-    @pytest.mark.edge_case
     @pytest.mark.asyncio 
-    async def test_retry_logic_edge_cases(self):
-        """Test retry logic with various edge cases."""
+    async def test_retry_logic_edge_cases(self, api_client):
+        """Test that transient failures are retried until a request succeeds."""
         
         attempt_count = 0
         
-        async def intermittent_failure_side_effect(*args, **kwargs):
+        def intermittent_failure_handler(request):
             nonlocal attempt_count
             attempt_count += 1
             
             if attempt_count < 3:
                 # First 2 attempts fail
-                raise aiohttp.ClientConnectorError(
-                    connection_key=None,
-                    os_error=OSError("Connection refused")
-                )
+                raise httpx.ConnectError("Connection refused", request=request)
             else:
                 # Third attempt succeeds
-                mock_response = Mock()
-                mock_response.status = 200
-                mock_response.json.return_value = asyncio.create_future()
-                mock_response.json.return_value.set_result({"data": [], "pagination_info": {"total_records": 0}})
-                return mock_response
-        
-        # This would test actual retry logic if implemented
-        # For now, we just test that the function signature works
-        client = SimplerGrantsAPIClient(api_key="test_key")
-        
-        with patch.object(client, '_make_request', side_effect=intermittent_failure_side_effect):
-            # If retry logic existed, this would eventually succeed
-            # For now, it will fail on first attempt
-            with pytest.raises(aiohttp.ClientConnectorError):
-                await client.search_opportunities(query="test")
\ No newline at end of file
+                return _respond_with(EMPTY_RESULTS, request)
+        
+        with fake_http(api_client, intermittent_failure_handler):
+            result = await api_client.search_opportunities(query="test")
+        
+        assert result == EMPTY_RESULTS
+        assert attempt_count == 3
+        
+    @pytest.mark.asyncio
+    async def test_retry_gives_up_after_max_attempts(self, api_client):
+        """Test that persistent failures stop after max_retries attempts."""
+        
+        attempt_count = 0
+        
+        def unavailable_handler(request):
+            nonlocal attempt_count
+            attempt_count += 1
+            return _respond_with({"message": "Service Unavailable"}, request, status=503)
+        
+        with fake_http(api_client, unavailable_handler):
+            with pytest.raises(APIError) as exc_info:
+                await api_client.search_opportunities(query="test")
+        
+        assert exc_info.value.status_code == 503
+        assert attempt_count == api_client.max_retries
+        
+    @pytest.mark.asyncio
+    async def test_retry_stops_within_time_budget(self):
+        """Test that a retry whose wait would pass max_retry_time is not attempted."""
+        
+        attempt_count = 0
+        
+        def rate_limited_handler(request):
+            nonlocal attempt_count
+            attempt_count += 1
+            return _respond_with(
+                {"message": "Too Many Requests"}, request, status=429, headers={"Retry-After": "60"}
+            )
+        
+        async with SimplerGrantsAPIClient(
+            api_key="test_key", max_retry_wait=30, max_retry_time=1
+        ) as client:
+            with fake_http(client, rate_limited_handler):
+                with pytest.raises(RateLimitError):
+                    await asyncio.wait_for(client.search_opportunities(query="test"), timeout=5)
+        
+        assert attempt_count == 1
+        
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, api_client):
+        """Test that non-transient errors fail on the first attempt."""
+        
+        attempt_count = 0
+        
+        def unauthorized_handler(request):
+            nonlocal attempt_count
+            attempt_count += 1
+            return _respond_with({"message": "Unauthorized"}, request, status=401)
+        
+        with fake_http(api_client, unauthorized_handler):
+            with pytest.raises(APIError):
+                await api_client.search_opportunities(query="test")
+        
+        assert attempt_count == 1
@@ -0,0 +1,57 @@
+"""Shared fixtures for integration tests."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from fastmcp import FastMCP
+
+from mcp_server.config.settings import Settings
+from mcp_server.tools.discovery.opportunity_discovery_tool import (
+    register_opportunity_discovery_tool,
+)
+from mcp_server.tools.utils.cache_manager import InMemoryCache
+
+
+async def _get_tool(mcp: FastMCP, name: str):
+    """Look up a registered tool function by name."""
+    tools_by_name = {tool.name: tool.fn for tool in await mcp.list_tools()}
+    return tools_by_name[name]
+
+
+@pytest.fixture(scope="module")
+def tool_context(api_client):
+    """Server context shared by the tools registered in a module."""
+    return {
+        "cache": InMemoryCache(ttl=60, max_size=100),
+        "api_client": api_client,
+        "settings": Settings(api_key="test_key"),
+        "search_history": []
+    }
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def discovery_tool(tool_context):
+    """Register the opportunity discovery tool once per module and return it.
+
+    Tests control the API response through the ``patched_search`` fixture.
+    """
+    mcp = FastMCP("test")
+    register_opportunity_discovery_tool(mcp, tool_context)
+    return await _get_tool(mcp, "opportunity_discovery")
+
+
+@pytest.fixture(scope="module")
+def _search_mock(api_client):
+    """Replace ``api_client.search_opportunities`` once for the whole module."""
+    original = api_client.search_opportunities
+    api_client.search_opportunities = AsyncMock()
+    yield api_client.search_opportunities
+    api_client.search_opportunities = original
+
+
+@pytest.fixture
+def patched_search(_search_mock):
+    """The module's search mock, with calls and configured responses cleared."""
+    _search_mock.reset_mock(return_value=True, side_effect=True)
+    return _search_mock
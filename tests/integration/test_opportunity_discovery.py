@@ -1,304 +1,278 @@
 """Integration tests for opportunity discovery tool."""
 
-from unittest.mock import AsyncMock, patch
+from types import MappingProxyType
 
 import pytest
 
 from mcp_server.models.grants_schemas import GrantsAPIResponse, OpportunityV1
 from mcp_server.tools.discovery.opportunity_discovery_tool import (
     calculate_summary_statistics,
+    calculate_summary_statistics_batch,
     create_summary,
     format_grant_details,
-    register_opportunity_discovery_tool,
+    opportunities_to_columns,
 )
 
+# Shared read-only payload for searches that find nothing
+EMPTY_RESPONSE = MappingProxyType({
+    "data": [],
+    "pagination_info": {
+        "page_size": 25,
+        "page_number": 1,
+        "total_records": 0,
+        "total_pages": 0
+    }
+})
+
+# Substrings the formatted output for the sample opportunity must contain
+GRANT_DETAIL_NEEDLES = (
+    "Test Grant Opportunity",
+    "TEST-2024-001",
+    "Test Agency",
+    "$100,000",
+    "$500,000",
+    "2024-03-31",
+    "grants@test.gov",
+)
+SUMMARY_NEEDLES = (
+    "Search Results for \"test search\"",
+    "Total Grants Found: 1",
+    "Page 1 of 1",
+    "DETAILED GRANT LISTINGS",
+)
+
+BASE_OPPORTUNITY = {
+    "opportunity_number": "TEST-001",
+    "opportunity_status": "posted",
+    "agency": "TEST",
+    "agency_code": "TST",
+    "agency_name": "Test Agency",
+}
+
+# (opportunity specs, expected calculate_summary_statistics output)
+STATISTICS_CASES = {
+    "single": (
+        [
+            {
+                **BASE_OPPORTUNITY,
+                "opportunity_id": "12345",
+                "opportunity_title": "Test Grant Opportunity",
+                "category": "Science and Technology",
+                "summary": {
+                    "award_ceiling": 500000,
+                    "award_floor": 100000,
+                    "close_date": "2024-03-31"
+                }
+            }
+        ],
+        {
+            "agencies": {"TST": 1},
+            "funding_ranges": {
+                "min_floor": 100000,
+                "max_ceiling": 500000,
+                "avg_award": 500000
+            },
+            "deadline_distribution": {"03": 1},
+            "category_breakdown": {"Science and Technology": 1},
+            "status_breakdown": {"posted": 1},
+        },
+    ),
+    "missing_fields": (
+        [
+            {
+                **BASE_OPPORTUNITY,
+                "opportunity_id": "1",
+                "opportunity_title": "Test 1",
+                "summary": {"award_ceiling": None, "award_floor": None}
+            },
+            {
+                **BASE_OPPORTUNITY,
+                "opportunity_id": "2",
+                "opportunity_number": "TEST-002",
+                "opportunity_title": "Test 2",
+                "opportunity_status": "forecasted",
+                "summary": {"award_ceiling": 100000, "award_floor": 50000}
+            },
+        ],
+        {
+            "agencies": {"TST": 2},
+            "funding_ranges": {
+                "min_floor": 50000,
+                "max_ceiling": 100000,
+                "avg_award": 100000
+            },
+            "deadline_distribution": {},
+            "category_breakdown": {"Uncategorized": 2},
+            "status_breakdown": {"posted": 1, "forecasted": 1},
+        },
+    ),
+    "empty": (
+        [],
+        {
+            "agencies": {},
+            "funding_ranges": {
+                "min_floor": None,
+                "max_ceiling": None,
+                "avg_award": None
+            },
+            "deadline_distribution": {},
+            "category_breakdown": {},
+            "status_breakdown": {},
+        },
+    ),
+}
+
 
 class TestOpportunityDiscovery:
     """Test opportunity discovery tool functionality."""
     
     @pytest.mark.asyncio
     @pytest.mark.mock_only
-    async def test_discovery_with_mock_api(self, mcp_server, sample_api_response):
+    async def test_discovery_with_mock_api(self, patched_search, discovery_tool, sample_api_response):
         """Test opportunity discovery with mocked API response."""
         # Mock the API client
-        with patch.object(
-            mcp_server.api_client,
-            'search_opportunities',
-            new_callable=AsyncMock
-        ) as mock_search:
-            mock_search.return_value = sample_api_response
-            
-            # Register the tool
-            from fastmcp import FastMCP
-            mcp = FastMCP("test")
-            context = {
-                "cache": mcp_server.cache,
-                "api_client": mcp_server.api_client,
-                "settings": mcp_server.settings,
-                "search_history": []
-            }
-            register_opportunity_discovery_tool(mcp, context)
-            
-            # Get the tool function
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == "opportunity_discovery":
-                    tool_func = tool.fn
-                    break
-            
-            assert tool_func is not None
-            
-            # Call the tool
-            result = await tool_func(
-                query="climate change",
-                max_results=10
-            )
-            
-            # Verify result
-            assert "Search Results for \"climate change\"" in result
-            assert "Total Grants Found: 1" in result
-            assert "Test Grant Opportunity" in result
-            assert mock_search.called
+        patched_search.return_value = sample_api_response
+        
+        # Call the tool
+        result = await discovery_tool(
+            query="climate change",
+            max_results=10
+        )
+        
+        # Verify result
+        assert "Search Results for \"climate change\"" in result
+        assert "Total Grants Found: 1" in result
+        assert "Test Grant Opportunity" in result
+        assert patched_search.called
     
     @pytest.mark.asyncio
-    async def test_discovery_uses_cache(self, mcp_server):
+    async def test_discovery_uses_cache(self, patched_search, discovery_tool):
         """Test that discovery tool uses cache effectively."""
         # First call - should hit API
-        with patch.object(
-            mcp_server.api_client,
-            'search_opportunities',
-            new_callable=AsyncMock
-        ) as mock_search:
-            mock_search.return_value = {
-                "data": [],
-                "pagination_info": {
-                    "page_size": 25,
-                    "page_number": 1,
-                    "total_records": 0,
-                    "total_pages": 0
-                }
-            }
-            
-            # Register the tool
-            from fastmcp import FastMCP
-            mcp = FastMCP("test")
-            context = {
-                "cache": mcp_server.cache,
-                "api_client": mcp_server.api_client,
-                "settings": mcp_server.settings,
-                "search_history": []
+        patched_search.return_value = EMPTY_RESPONSE
+        
+        # First call
+        result1 = await discovery_tool(query="test", max_results=10)
+        assert patched_search.call_count == 1
+        
+        # Second call with same parameters - should use cache
+        result2 = await discovery_tool(query="test", max_results=10)
+        assert patched_search.call_count == 1  # Still 1, not 2
+        
+        # Results should be identical
+        assert result1 == result2
+    
+    @pytest.mark.asyncio
+    async def test_discovery_cache_key_ignores_argument_order(
+        self, patched_search, discovery_tool
+    ):
+        """Test that reordered but equivalent arguments hit the same cache entry."""
+        patched_search.return_value = EMPTY_RESPONSE
+        
+        await discovery_tool(
+            query="ordering",
+            max_results=10,
+            filters={
+                "agency": {"one_of": ["NSF", "DOE"]},
+                "opportunity_status": {"one_of": ["posted"]}
             }
-            register_opportunity_discovery_tool(mcp, context)
-            
-            # Get the tool function
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == "opportunity_discovery":
-                    tool_func = tool.fn
-                    break
-            
-            # First call
-            result1 = await tool_func(query="test", max_results=10)
-            assert mock_search.call_count == 1
-            
-            # Second call with same parameters - should use cache
-            result2 = await tool_func(query="test", max_results=10)
-            assert mock_search.call_count == 1  # Still 1, not 2
-            
-            # Results should be identical
-            assert result1 == result2
+        )
+        await discovery_tool(
+            max_results=10,
+            filters={
+                "opportunity_status": {"one_of": ["posted"]},
+                "agency": {"one_of": ["DOE", "NSF"]}
+            },
+            query="ordering"
+        )
+        
+        assert patched_search.call_count == 1
     
     @pytest.mark.asyncio
-    async def test_discovery_handles_api_error(self, mcp_server):
+    async def test_discovery_handles_api_error(self, patched_search, discovery_tool):
         """Test error handling in discovery tool."""
         from mcp_server.tools.utils.api_client import APIError
         
         # Mock API to raise error
-        with patch.object(
-            mcp_server.api_client,
-            'search_opportunities',
-            new_callable=AsyncMock
-        ) as mock_search:
-            mock_search.side_effect = APIError(500, "Internal Server Error")
-            
-            # Register the tool
-            from fastmcp import FastMCP
-            mcp = FastMCP("test")
-            context = {
-                "cache": mcp_server.cache,
-                "api_client": mcp_server.api_client,
-                "settings": mcp_server.settings,
-                "search_history": []
-            }
-            register_opportunity_discovery_tool(mcp, context)
-            
-            # Get the tool function
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == "opportunity_discovery":
-                    tool_func = tool.fn
-                    break
-            
-            # Call should not raise but return error message
-            result = await tool_func(query="test")
-            assert "Error searching for opportunities" in result
+        patched_search.side_effect = APIError(500, "Internal Server Error")
+        
+        # Call should not raise but return error message
+        result = await discovery_tool(query="test")
+        assert "Error searching for opportunities" in result
     
-    def test_format_grant_details(self, sample_opportunity):
+    def test_format_grant_details(self, sample_opportunity_model):
         """Test grant formatting function."""
-        opportunity = OpportunityV1(**sample_opportunity)
-        formatted = format_grant_details(opportunity)
+        formatted = format_grant_details(sample_opportunity_model)
         
-        assert "Test Grant Opportunity" in formatted
-        assert "TEST-2024-001" in formatted
-        assert "Test Agency" in formatted
-        assert "$100,000" in formatted or "100000" in formatted
-        assert "$500,000" in formatted or "500000" in formatted
-        assert "2024-03-31" in formatted
-        assert "grants@test.gov" in formatted
+        missing = [needle for needle in GRANT_DETAIL_NEEDLES if needle not in formatted]
+        assert not missing, missing
     
-    def test_create_summary(self, sample_opportunity):
+    def test_create_summary(self, sample_opportunity_model):
         """Test summary creation."""
-        opportunity = OpportunityV1(**sample_opportunity)
         summary = create_summary(
-            [opportunity],
+            [sample_opportunity_model],
             "test search",
             page=1,
             grants_per_page=3,
             total_found=1
         )
         
-        assert "Search Results for \"test search\"" in summary
-        assert "Total Grants Found: 1" in summary
-        assert "Page 1 of 1" in summary
-        assert "DETAILED GRANT LISTINGS" in summary
+        missing = [needle for needle in SUMMARY_NEEDLES if needle not in summary]
+        assert not missing, missing
     
-    def test_calculate_summary_statistics(self, sample_opportunity):
+    @pytest.mark.parametrize(
+        "opportunity_specs, expected",
+        STATISTICS_CASES.values(),
+        ids=STATISTICS_CASES.keys()
+    )
+    def test_calculate_summary_statistics(self, opportunity_specs, expected):
         """Test summary statistics calculation."""
-        opportunity = OpportunityV1(**sample_opportunity)
-        stats = calculate_summary_statistics([opportunity])
-        
-        assert stats["agencies"]["TST"] == 1
-        assert stats["category_breakdown"]["Science and Technology"] == 1
-        assert stats["status_breakdown"]["posted"] == 1
-        assert stats["funding_ranges"]["min_floor"] == 100000
-        assert stats["funding_ranges"]["max_ceiling"] == 500000
-        assert stats["funding_ranges"]["avg_award"] == 500000
+        opportunities = [OpportunityV1(**spec) for spec in opportunity_specs]
+        assert calculate_summary_statistics(opportunities) == expected
+    
+    @pytest.mark.parametrize(
+        "opportunity_specs, expected",
+        STATISTICS_CASES.values(),
+        ids=STATISTICS_CASES.keys()
+    )
+    def test_calculate_summary_statistics_batch(self, opportunity_specs, expected):
+        """Test that columnar statistics match the per-opportunity calculation."""
+        opportunities = [OpportunityV1(**spec) for spec in opportunity_specs]
+        columns = opportunities_to_columns(opportunities)
+        assert calculate_summary_statistics_batch(columns) == expected
 
 
 class TestOpportunityDiscoveryEdgeCases:
     """Test edge cases in opportunity discovery."""
     
     @pytest.mark.asyncio
-    async def test_discovery_with_empty_results(self, mcp_server):
+    async def test_discovery_with_empty_results(self, patched_search, discovery_tool):
         """Test handling of empty search results."""
-        with patch.object(
-            mcp_server.api_client,
-            'search_opportunities',
-            new_callable=AsyncMock
-        ) as mock_search:
-            mock_search.return_value = {
-                "data": [],
-                "pagination_info": {
-                    "page_size": 25,
-                    "page_number": 1,
-                    "total_records": 0,
-                    "total_pages": 0
-                }
-            }
-            
-            from fastmcp import FastMCP
-            mcp = FastMCP("test")
-            context = {
-                "cache": mcp_server.cache,
-                "api_client": mcp_server.api_client,
-                "settings": mcp_server.settings,
-                "search_history": []
-            }
-            register_opportunity_discovery_tool(mcp, context)
-            
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == "opportunity_discovery":
-                    tool_func = tool.fn
-                    break
-            
-            result = await tool_func(query="nonexistent")
-            assert "Total Grants Found: 0" in result
+        patched_search.return_value = EMPTY_RESPONSE
+        
+        result = await discovery_tool(query="nonexistent")
+        assert "Total Grants Found: 0" in result
     
     @pytest.mark.asyncio
-    async def test_discovery_with_malformed_data(self, mcp_server):
+    async def test_discovery_with_malformed_data(self, patched_search, discovery_tool):
         """Test handling of malformed API data."""
-        with patch.object(
-            mcp_server.api_client,
-            'search_opportunities',
-            new_callable=AsyncMock
-        ) as mock_search:
-            # Return data with missing required fields
-            mock_search.return_value = {
-                "data": [
-                    {
-                        "opportunity_id": 999,
-                        # Missing other required fields
-                    }
-                ],
-                "pagination_info": {
-                    "page_size": 25,
-                    "page_number": 1,
-                    "total_records": 1,
-                    "total_pages": 1
+        # Return data with missing required fields
+        patched_search.return_value = {
+            "data": [
+                {
+                    "opportunity_id": 999,
+                    # Missing other required fields
                 }
+            ],
+            "pagination_info": {
+                "page_size": 25,
+                "page_number": 1,
+                "total_records": 1,
+                "total_pages": 1
             }
-            
-            from fastmcp import FastMCP
-            mcp = FastMCP("test")
-            context = {
-                "cache": mcp_server.cache,
-                "api_client": mcp_server.api_client,
-                "settings": mcp_server.settings,
-                "search_history": []
-            }
-            register_opportunity_discovery_tool(mcp, context)
-            
-            tool_func = None
-            for tool in mcp.tools:
-                if tool.name == "opportunity_discovery":
-                    tool_func = tool.fn
-                    break
-            
-            # Should handle gracefully
-            result = await tool_func(query="test")
-            # Result should still be formatted, even if data is incomplete
-            assert "Search Results" in result
-    
-    def test_statistics_with_missing_fields(self):
-        """Test statistics calculation with missing data fields."""
-        opportunities = [
-            OpportunityV1(
-                opportunity_id=1,
-                opportunity_number="TEST-001",
-                opportunity_title="Test 1",
-                opportunity_status="posted",
-                agency="TEST",
-                agency_code="TST",
-                agency_name="Test Agency",
-                summary={"award_ceiling": None, "award_floor": None}
-            ),
-            OpportunityV1(
-                opportunity_id=2,
-                opportunity_number="TEST-002",
-                opportunity_title="Test 2",
-                opportunity_status="forecasted",
-                agency="TEST",
-                agency_code="TST",
-                agency_name="Test Agency",
-                summary={"award_ceiling": 100000, "award_floor": 50000}
-            )
-        ]
-        
-        stats = calculate_summary_statistics(opportunities)
+        }
         
-        assert stats["agencies"]["TST"] == 2
-        assert stats["funding_ranges"]["min_floor"] == 50000
-        assert stats["funding_ranges"]["max_ceiling"] == 100000
-        assert stats["status_breakdown"]["posted"] == 1
-        assert stats["status_breakdown"]["forecasted"] == 1
\ No newline at end of file
+        # Should handle gracefully
+        result = await discovery_tool(query="test")
+        # Result should still be formatted, even if data is incomplete
+        assert "Search Results" in result
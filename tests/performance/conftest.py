@@ -0,0 +1,61 @@
+"""Shared fixtures for performance tests."""
+
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # Optional, and unavailable on Windows
+    uvloop = None
+
+from mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
+
+MOCK_SEARCH_RESPONSE = {
+    "data": [{"opportunity_id": 1, "title": "Grant 1"}],
+    "pagination_info": {"total_records": 1}
+}
+
+
+@pytest.fixture
+def eager_loop():
+    """Event loop for benchmarks that drive coroutines with ``run_until_complete``.
+
+    On Python 3.12+ tasks start eagerly, so coroutines that finish without
+    suspending (such as mocked API calls) skip a trip through the scheduler.
+    Uses uvloop when it is installed, like the async tests.
+    """
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def stub_search(monkeypatch):
+    """Make ``SimplerGrantsAPIClient.search_opportunities`` return a fixed response.
+
+    The stub is a plain coroutine function rather than an ``AsyncMock``, so
+    benchmarks do not pay for mock call recording. Call the returned function
+    again to switch responses. A ``latency`` in seconds makes each search
+    sleep first, like a network round trip, so concurrent searches overlap.
+    """
+    def stub(response, latency=0):
+        async def search_opportunities(self, *args, **kwargs):
+            if latency:
+                await asyncio.sleep(latency)
+            return response
+        monkeypatch.setattr(SimplerGrantsAPIClient, "search_opportunities", search_opportunities)
+    return stub
+
+
+@pytest.fixture
+def mocked_search_client(stub_search):
+    """API client whose searches return ``MOCK_SEARCH_RESPONSE`` without any I/O.
+
+    The stub is installed once per test, outside any benchmarked code.
+    """
+    stub_search(MOCK_SEARCH_RESPONSE)
+    return SimplerGrantsAPIClient(api_key="test_key")
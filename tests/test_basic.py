@@ -2,12 +2,15 @@
 """Basic test to verify the Python MCP implementation works."""
 
 import asyncio
+import functools
 import os
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add src to path when run as a script; under pytest the root conftest does it
+SRC_PATH = str(Path(__file__).parent.parent / "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
 
 from dotenv import load_dotenv
 from mcp_server.config.settings import Settings
@@ -15,13 +18,19 @@ from mcp_server.tools.utils.cache_manager import InMemoryCache
 from mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
 
 
+@functools.cache
+def load_environment() -> bool:
+    """Load the .env file once per process."""
+    return load_dotenv()
+
+
 async def test_basic_functionality():
     """Test basic components work."""
     print("Testing Grants MCP Python Implementation...")
     print("=" * 50)
     
     # Load environment
-    load_dotenv()
+    load_environment()
     api_key = os.getenv("API_KEY")
     
     if not api_key:
@@ -1,10 +1,10 @@
 """Tests for discovery tools."""
 
-import asyncio
-import json
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
+
+from fastmcp import FastMCP
 
 from src.mcp_server.models.grants_schemas import (
     AgencyV1,
@@ -17,34 +17,39 @@ from src.mcp_server.tools.discovery.agency_landscape_tool import (
     analyze_agency_portfolio,
     identify_cross_agency_patterns,
     format_agency_landscape_report,
+    register_agency_landscape_tool,
 )
 from src.mcp_server.tools.discovery.funding_trend_scanner_tool import (
     analyze_temporal_trends,
     identify_funding_patterns,
     detect_emerging_topics,
+    filter_by_post_date,
     format_funding_trends_report,
+    register_funding_trend_scanner_tool,
 )
+from src.mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
 
 
 class TestAgencyLandscapeTool(unittest.TestCase):
     """Test suite for agency landscape analysis tool."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.sample_agencies = [
-            AgencyV1(
+    @classmethod
+    def setUpClass(cls):
+        """Build the trusted fixtures once, skipping validation; no test mutates them."""
+        cls.sample_agencies = [
+            AgencyV1.model_construct(
                 agency_code="NSF",
                 agency_name="National Science Foundation",
             ),
-            AgencyV1(
+            AgencyV1.model_construct(
                 agency_code="NIH",
                 agency_name="National Institutes of Health",
             ),
         ]
         
-        self.sample_opportunities = [
-            OpportunityV1(
+        cls.sample_opportunities = [
+            OpportunityV1.model_construct(
                 opportunity_id="123",
                 opportunity_number="NSF-2024-001",
                 opportunity_title="AI Research Grant",
@@ -53,7 +58,7 @@ class TestAgencyLandscapeTool(unittest.TestCase):
                 agency_code="NSF",
                 agency_name="National Science Foundation",
                 category="Science",
-                summary=OpportunitySummary(
+                summary=OpportunitySummary.model_construct(
                     award_ceiling=500000,
                     award_floor=100000,
                     estimated_total_program_funding=5000000,
@@ -62,7 +67,7 @@ class TestAgencyLandscapeTool(unittest.TestCase):
                     close_date="2024-12-31",
                 )
             ),
-            OpportunityV1(
+            OpportunityV1.model_construct(
                 opportunity_id="124",
                 opportunity_number="NSF-2024-002",
                 opportunity_title="Climate Research",
@@ -71,7 +76,7 @@ class TestAgencyLandscapeTool(unittest.TestCase):
                 agency_code="NSF",
                 agency_name="National Science Foundation",
                 category="Environment",
-                summary=OpportunitySummary(
+                summary=OpportunitySummary.model_construct(
                     award_ceiling=1000000,
                     award_floor=250000,
                     estimated_total_program_funding=10000000,
@@ -174,11 +179,16 @@ class TestAgencyLandscapeTool(unittest.TestCase):
 class TestFundingTrendScannerTool(unittest.TestCase):
     """Test suite for funding trend scanner tool."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Build the trusted fixtures once, skipping validation; no test mutates them."""
         now = datetime.now()
-        self.sample_opportunities = [
-            OpportunityV1(
+        iso_dates = {
+            days: (now + timedelta(days=days)).isoformat()
+            for days in (-60, -10, -5, 30, 60, 90)
+        }
+        cls.sample_opportunities = [
+            OpportunityV1.model_construct(
                 opportunity_id="125",
                 opportunity_number="GRANT-2024-001",
                 opportunity_title="Artificial Intelligence Research Grant",
@@ -188,17 +198,17 @@ class TestFundingTrendScannerTool(unittest.TestCase):
                 agency_name="National Science Foundation",
                 category="Technology",
                 category_explanation="AI and ML research",
-                summary=OpportunitySummary(
+                summary=OpportunitySummary.model_construct(
                     award_ceiling=500000,
                     award_floor=100000,
                     estimated_total_program_funding=5000000,
                     expected_number_of_awards=10,
-                    post_date=(now - timedelta(days=10)).isoformat(),
-                    close_date=(now + timedelta(days=30)).isoformat(),
+                    post_date=iso_dates[-10],
+                    close_date=iso_dates[30],
                     summary_description="Support for AI research",
                 )
             ),
-            OpportunityV1(
+            OpportunityV1.model_construct(
                 opportunity_id="126",
                 opportunity_number="GRANT-2024-002",
                 opportunity_title="Climate Change Mitigation",
@@ -207,17 +217,17 @@ class TestFundingTrendScannerTool(unittest.TestCase):
                 agency_code="EPA",
                 agency_name="Environmental Protection Agency",
                 category="Environment",
-                summary=OpportunitySummary(
+                summary=OpportunitySummary.model_construct(
                     award_ceiling=1000000,
                     award_floor=250000,
                     estimated_total_program_funding=20000000,
                     expected_number_of_awards=20,
-                    post_date=(now - timedelta(days=60)).isoformat(),
-                    close_date=(now + timedelta(days=60)).isoformat(),
+                    post_date=iso_dates[-60],
+                    close_date=iso_dates[60],
                     summary_description="Climate resilience and sustainability",
                 )
             ),
-            OpportunityV1(
+            OpportunityV1.model_construct(
                 opportunity_id="127",
                 opportunity_number="GRANT-2024-003",
                 opportunity_title="Quantum Computing Initiative",
@@ -226,13 +236,13 @@ class TestFundingTrendScannerTool(unittest.TestCase):
                 agency_code="DOE",
                 agency_name="Department of Energy",
                 category="Technology",
-                summary=OpportunitySummary(
+                summary=OpportunitySummary.model_construct(
                     award_ceiling=10000000,
                     award_floor=1000000,
                     estimated_total_program_funding=100000000,
                     expected_number_of_awards=3,
-                    post_date=(now - timedelta(days=5)).isoformat(),
-                    close_date=(now + timedelta(days=90)).isoformat(),
+                    post_date=iso_dates[-5],
+                    close_date=iso_dates[90],
                     summary_description="Quantum computing research",
                     funding_instrument="Cooperative Agreement",
                 )
@@ -255,6 +265,22 @@ class TestFundingTrendScannerTool(unittest.TestCase):
         self.assertIn("deadline_distribution", trends)
         self.assertGreater(trends["deadline_distribution"].get("30_days", 0), 0)
     
+    def test_analyze_temporal_trends_utc_dates(self):
+        """Test that UTC-suffixed dates are analyzed like naive ones."""
+        now = datetime.now()
+        summary = self.sample_opportunities[0].summary.model_copy(
+            update={
+                "post_date": (now - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "close_date": (now + timedelta(days=20)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+        opportunity = self.sample_opportunities[0].model_copy(update={"summary": summary})
+        
+        trends = analyze_temporal_trends([opportunity], 90)
+        self.assertEqual(trends["posting_frequency"], {"week_1": 1})
+        self.assertEqual(trends["deadline_distribution"], {"30_days": 1})
+        self.assertEqual(trends["funding_velocity"]["recent"], 5000000)
+    
     def test_identify_funding_patterns(self):
         """Test funding pattern identification."""
         patterns = identify_funding_patterns(self.sample_opportunities)
@@ -285,6 +311,26 @@ class TestFundingTrendScannerTool(unittest.TestCase):
         # Check emerging themes
         self.assertIn("emerging_themes", topics)
     
+    def test_filter_by_post_date(self):
+        """Test post date filtering, including undated and UTC-suffixed dates."""
+        undated = self.sample_opportunities[0].model_copy(
+            update={"opportunity_id": "128", "summary": OpportunitySummary.model_construct()}
+        )
+        utc_dated = self.sample_opportunities[0].model_copy(
+            update={
+                "opportunity_id": "129",
+                "summary": OpportunitySummary.model_construct(post_date="2000-01-01T00:00:00Z"),
+            }
+        )
+        opportunities = [*self.sample_opportunities, undated, utc_dated]
+        cutoff_date = datetime.now() - timedelta(days=30)
+        
+        filtered = filter_by_post_date(opportunities, cutoff_date)
+        self.assertEqual([opp.opportunity_id for opp in filtered], ["125", "127", "128"])
+        
+        filtered = filter_by_post_date(opportunities, cutoff_date, include_undated=False)
+        self.assertEqual([opp.opportunity_id for opp in filtered], ["125", "127"])
+    
     def test_format_funding_trends_report(self):
         """Test trend report formatting."""
         temporal_trends = {
@@ -337,70 +383,94 @@ class TestFundingTrendScannerTool(unittest.TestCase):
         self.assertIn("Quantum Computing Initiative", report)
 
 
-class TestDiscoveryToolsIntegration(unittest.TestCase):
-    """Integration tests for discovery tools."""
-    
-    @patch('src.mcp_server.tools.utils.api_client.SimplerGrantsAPIClient')
-    async def test_agency_landscape_tool_integration(self, mock_api_client_class):
-        """Test agency landscape tool integration."""
-        from fastmcp import FastMCP
-        from src.mcp_server.tools.discovery.agency_landscape_tool import (
-            register_agency_landscape_tool
-        )
-        
-        # Set up mock API client
-        mock_api_client = AsyncMock()
-        mock_api_client_class.return_value = mock_api_client
-        
-        # Mock API responses
-        mock_api_client.search_agencies.return_value = {
-            "data": [
-                {
-                    "agency_code": "NSF",
-                    "agency_name": "National Science Foundation",
-                }
-            ],
-            "pagination_info": {
-                "page_size": 100,
-                "page_offset": 1,
-                "total_records": 1,
+_NOW = datetime.now()
+
+# Mock API responses, prebuilt as the dicts the API client returns
+_AGENCY_RESPONSE = {
+    "data": [
+        {
+            "agency_code": "NSF",
+            "agency_name": "National Science Foundation",
+        }
+    ],
+    "pagination_info": {
+        "page_size": 100,
+        "page_offset": 1,
+        "total_records": 1,
+    }
+}
+
+_OPP_RESPONSE = {
+    "data": [
+        {
+            "opportunity_id": "123",
+            "opportunity_number": "NSF-2024-001",
+            "opportunity_title": "Test Grant",
+            "opportunity_status": "posted",
+            "agency": "NSF",
+            "agency_code": "NSF",
+            "agency_name": "National Science Foundation",
+            "category": "Science",
+            "summary": {
+                "award_ceiling": 500000,
+                "award_floor": 100000,
             }
         }
-        
-        mock_api_client.search_opportunities.return_value = {
-            "data": [
-                {
-                    "opportunity_id": "123",
-                    "opportunity_number": "NSF-2024-001",
-                    "opportunity_title": "Test Grant",
-                    "opportunity_status": "posted",
-                    "agency": "NSF",
-                    "agency_code": "NSF",
-                    "agency_name": "National Science Foundation",
-                    "category": "Science",
-                    "summary": {
-                        "award_ceiling": 500000,
-                        "award_floor": 100000,
-                    }
-                }
-            ],
-            "pagination_info": {
-                "page_size": 50,
-                "page_offset": 1,
-                "total_records": 1,
+    ],
+    "pagination_info": {
+        "page_size": 50,
+        "page_offset": 1,
+        "total_records": 1,
+    }
+}
+
+# Mock API response with trends data
+_TRENDS_RESPONSE = {
+    "data": [
+        {
+            "opportunity_id": "123",
+            "opportunity_number": "GRANT-2024-001",
+            "opportunity_title": "AI Research",
+            "opportunity_status": "posted",
+            "agency": "NSF",
+            "agency_code": "NSF",
+            "agency_name": "National Science Foundation",
+            "category": "Technology",
+            "summary": {
+                "award_ceiling": 500000,
+                "post_date": (_NOW - timedelta(days=10)).isoformat(),
+                "close_date": (_NOW + timedelta(days=30)).isoformat(),
+                "summary_description": "artificial intelligence research",
             }
         }
+    ],
+    "pagination_info": {
+        "page_size": 100,
+        "page_offset": 1,
+        "total_records": 1,
+    }
+}
+
+
+class TestDiscoveryToolsIntegration(unittest.IsolatedAsyncioTestCase):
+    """Integration tests for discovery tools."""
+    
+    def setUp(self):
+        """Set up a mock API client and an MCP server context around it."""
+        self.mock_api_client = AsyncMock(spec=SimplerGrantsAPIClient)
+        self.mcp = FastMCP("test_server")
+        self.context = {"cache": InMemoryCache(), "api_client": self.mock_api_client}
+    
+    async def test_agency_landscape_tool_integration(self):
+        """Test agency landscape tool integration."""
+        self.mock_api_client.search_agencies.return_value = _AGENCY_RESPONSE
+        self.mock_api_client.search_opportunities.return_value = _OPP_RESPONSE
         
-        # Create MCP server and register tool
-        mcp = FastMCP("test_server")
-        cache = InMemoryCache()
-        context = {"cache": cache, "api_client": mock_api_client}
-        
-        register_agency_landscape_tool(mcp, context)
+        register_agency_landscape_tool(self.mcp, self.context)
         
         # Test tool execution
-        tool = mcp._tools["agency_landscape"]
-        result = await tool.func(
+        tools = {tool.name: tool.fn for tool in await self.mcp.list_tools()}
+        result = await tools["agency_landscape"](
             include_opportunities=True,
             max_agencies=1
         )
@@ -408,56 +478,15 @@ class TestDiscoveryToolsIntegration(unittest.TestCase):
         self.assertIn("AGENCY LANDSCAPE ANALYSIS", result)
         self.assertIn("NSF", result)
     
-    @patch('src.mcp_server.tools.utils.api_client.SimplerGrantsAPIClient')
-    async def test_funding_trend_scanner_integration(self, mock_api_client_class):
+    async def test_funding_trend_scanner_integration(self):
         """Test funding trend scanner tool integration."""
-        from fastmcp import FastMCP
-        from src.mcp_server.tools.discovery.funding_trend_scanner_tool import (
-            register_funding_trend_scanner_tool
-        )
+        self.mock_api_client.search_opportunities.return_value = _TRENDS_RESPONSE
         
-        # Set up mock API client
-        mock_api_client = AsyncMock()
-        mock_api_client_class.return_value = mock_api_client
-        
-        # Mock API response with trends data
-        now = datetime.now()
-        mock_api_client.search_opportunities.return_value = {
-            "data": [
-                {
-                    "opportunity_id": "123",
-                    "opportunity_number": "GRANT-2024-001",
-                    "opportunity_title": "AI Research",
-                    "opportunity_status": "posted",
-                    "agency": "NSF",
-                    "agency_code": "NSF",
-                    "agency_name": "National Science Foundation",
-                    "category": "Technology",
-                    "summary": {
-                        "award_ceiling": 500000,
-                        "post_date": (now - timedelta(days=10)).isoformat(),
-                        "close_date": (now + timedelta(days=30)).isoformat(),
-                        "summary_description": "artificial intelligence research",
-                    }
-                }
-            ],
-            "pagination_info": {
-                "page_size": 100,
-                "page_offset": 1,
-                "total_records": 1,
-            }
-        }
-        
-        # Create MCP server and register tool
-        mcp = FastMCP("test_server")
-        cache = InMemoryCache()
-        context = {"cache": cache, "api_client": mock_api_client}
-        
-        register_funding_trend_scanner_tool(mcp, context)
+        register_funding_trend_scanner_tool(self.mcp, self.context)
         
         # Test tool execution
-        tool = mcp._tools["funding_trend_scanner"]
-        result = await tool.func(
+        tools = {tool.name: tool.fn for tool in await self.mcp.list_tools()}
+        result = await tools["funding_trend_scanner"](
             time_window_days=30,
             include_forecasted=False
         )
@@ -466,11 +495,5 @@ class TestDiscoveryToolsIntegration(unittest.TestCase):
         self.assertIn("TEMPORAL TRENDS", result)
 
 
-def run_async_test(coro):
-    """Helper to run async tests."""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(coro)
-
-
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,11 +1,11 @@
-#!/usr/bin/env python3
 """Test discovery tools with real API."""
 
-import asyncio
-import json
 import os
 from datetime import datetime
 
+import pytest
+import pytest_asyncio
+
 from src.mcp_server.config.settings import Settings
 from src.mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
@@ -23,18 +23,26 @@ from src.mcp_server.tools.discovery.funding_trend_scanner_tool import (
 from src.mcp_server.models.grants_schemas import GrantsAPIResponse
 
 
-async def test_opportunity_discovery():
-    """Test the opportunity discovery tool."""
-    print("\n" + "=" * 60)
-    print("Testing Opportunity Discovery Tool")
-    print("=" * 60)
-    
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def discovery_api_client():
+    """Real API client shared by the tests in this module."""
     api_key = os.getenv("SIMPLER_GRANTS_API_KEY", "test_key")
     settings = Settings(api_key=api_key)
-    api_client = SimplerGrantsAPIClient(
+    client = SimplerGrantsAPIClient(
         api_key=settings.api_key,
         base_url=settings.api_base_url
     )
+    yield client
+    await client.close()
+
+
+@pytest.mark.real_api
+@pytest.mark.asyncio
+async def test_opportunity_discovery(discovery_api_client):
+    """Test the opportunity discovery tool."""
+    print("\n" + "=" * 60)
+    print("Testing Opportunity Discovery Tool")
+    print("=" * 60)
     
     try:
         # Search for AI-related grants
@@ -44,12 +52,12 @@ async def test_opportunity_discovery():
         }
         
         print("\nSearching for AI-related grants...")
-        response = await api_client.search_opportunities(
+        response = await discovery_api_client.search_opportunities(
             filters=filters,
             pagination={"page_size": 5, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**response)
+        api_response = GrantsAPIResponse.model_validate(response)
         opportunities = api_response.get_opportunities()
         
         print(f"Found {len(opportunities)} opportunities")
@@ -65,32 +73,25 @@ async def test_opportunity_discovery():
         
     except Exception as e:
         print(f"❌ Error testing opportunity discovery: {e}")
-    finally:
-        await api_client.close()
 
 
-async def test_agency_landscape():
+@pytest.mark.real_api
+@pytest.mark.asyncio
+async def test_agency_landscape(discovery_api_client):
     """Test the agency landscape tool."""
     print("\n" + "=" * 60)
     print("Testing Agency Landscape Tool")
     print("=" * 60)
     
-    api_key = os.getenv("SIMPLER_GRANTS_API_KEY", "test_key")
-    settings = Settings(api_key=api_key)
-    api_client = SimplerGrantsAPIClient(
-        api_key=settings.api_key,
-        base_url=settings.api_base_url
-    )
-    
     try:
         # Get top agencies
         print("\nFetching agency information...")
-        agency_response = await api_client.search_agencies(
+        agency_response = await discovery_api_client.search_agencies(
             filters={},
             pagination={"page_size": 5, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**agency_response)
+        api_response = GrantsAPIResponse.model_validate(agency_response)
         agencies = api_response.get_agencies()
         
         print(f"Found {len(agencies)} agencies")
@@ -101,7 +102,7 @@ async def test_agency_landscape():
             print(f"\nAnalyzing portfolio for {agency.agency_name} ({agency.agency_code})...")
             
             # Get opportunities for this agency
-            opp_response = await api_client.search_opportunities(
+            opp_response = await discovery_api_client.search_opportunities(
                 filters={
                     "agency_code": agency.agency_code,
                     "opportunity_status": {"one_of": ["posted"]}
@@ -109,7 +110,7 @@ async def test_agency_landscape():
                 pagination={"page_size": 10, "page_offset": 1}
             )
             
-            opp_api_response = GrantsAPIResponse(**opp_response)
+            opp_api_response = GrantsAPIResponse.model_validate(opp_response)
             opportunities = opp_api_response.get_opportunities()
             
             if opportunities:
@@ -125,23 +126,16 @@ async def test_agency_landscape():
         
     except Exception as e:
         print(f"❌ Error testing agency landscape: {e}")
-    finally:
-        await api_client.close()
 
 
-async def test_funding_trends():
+@pytest.mark.real_api
+@pytest.mark.asyncio
+async def test_funding_trends(discovery_api_client):
     """Test the funding trend scanner tool."""
     print("\n" + "=" * 60)
     print("Testing Funding Trend Scanner Tool")
     print("=" * 60)
     
-    api_key = os.getenv("SIMPLER_GRANTS_API_KEY", "test_key")
-    settings = Settings(api_key=api_key)
-    api_client = SimplerGrantsAPIClient(
-        api_key=settings.api_key,
-        base_url=settings.api_base_url
-    )
-    
     try:
         # Get recent opportunities for trend analysis
         print("\nFetching recent opportunities for trend analysis...")
@@ -150,12 +144,12 @@ async def test_funding_trends():
             "opportunity_status": {"one_of": ["posted"]},
         }
         
-        response = await api_client.search_opportunities(
+        response = await discovery_api_client.search_opportunities(
             filters=filters,
             pagination={"page_size": 50, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**response)
+        api_response = GrantsAPIResponse.model_validate(response)
         opportunities = api_response.get_opportunities()
         
         print(f"Analyzing {len(opportunities)} opportunities...")
@@ -197,10 +191,9 @@ async def test_funding_trends():
         
     except Exception as e:
         print(f"❌ Error testing funding trends: {e}")
-    finally:
-        await api_client.close()
 
 
+@pytest.mark.asyncio
 async def test_cache_functionality():
     """Test cache functionality with tools."""
     print("\n" + "=" * 60)
@@ -236,28 +229,3 @@ async def test_cache_functionality():
     
     print("\n✅ Cache functionality working correctly")
 
-
-async def main():
-    """Run all tests."""
-    print("\n" + "🚀" * 30)
-    print("Testing Discovery Tools with Real API")
-    print("🚀" * 30)
-    
-    # Check for API key
-    if not os.getenv("SIMPLER_GRANTS_API_KEY"):
-        print("\n⚠️  Warning: SIMPLER_GRANTS_API_KEY not set")
-        print("   Some tests may fail or return limited results")
-    
-    # Run tests
-    await test_opportunity_discovery()
-    await test_agency_landscape()
-    await test_funding_trends()
-    await test_cache_functionality()
-    
-    print("\n" + "=" * 60)
-    print("All tests completed!")
-    print("=" * 60)
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
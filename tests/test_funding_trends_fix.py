@@ -1,35 +1,31 @@
-#!/usr/bin/env python3
 """Test the funding trend scanner fix."""
 
 import asyncio
 from datetime import datetime, timedelta
 
-from src.mcp_server.config.settings import Settings
-from src.mcp_server.tools.utils.api_client import SimplerGrantsAPIClient
+import numpy as np
+import pytest
+
 from src.mcp_server.tools.utils.cache_manager import InMemoryCache
 from src.mcp_server.tools.utils.cache_utils import CacheKeyGenerator
 from src.mcp_server.models.grants_schemas import GrantsAPIResponse
+from src.mcp_server.tools.discovery.opportunity_discovery_tool import award_columns
 from src.mcp_server.tools.discovery.funding_trend_scanner_tool import (
     analyze_temporal_trends,
     identify_funding_patterns,
     detect_emerging_topics,
+    filter_by_post_date,
     format_funding_trends_report,
 )
 
 
-async def test_funding_trend_scanner():
+@pytest.mark.real_api
+@pytest.mark.asyncio
+async def test_funding_trend_scanner(real_api_client):
     """Test the fixed funding trend scanner."""
-    api_key = "YOUR_API_KEY_HERE"  # Replace with actual API key
-    
     print("Testing Funding Trend Scanner Fix")
     print("=" * 40)
     
-    settings = Settings(api_key=api_key)
-    api_client = SimplerGrantsAPIClient(
-        api_key=settings.api_key,
-        base_url=settings.api_base_url
-    )
-    
     try:
         print("\n1. Testing API without date filter...")
         
@@ -38,12 +34,12 @@ async def test_funding_trend_scanner():
             "opportunity_status": {"one_of": ["posted", "forecasted"]},
         }
         
-        response = await api_client.search_opportunities(
+        response = await real_api_client.search_opportunities(
             filters=filters,
             pagination={"page_size": 20, "page_offset": 1}
         )
         
-        api_response = GrantsAPIResponse(**response)
+        api_response = GrantsAPIResponse.model_validate(response)
         all_opportunities = api_response.get_opportunities()
         
         print(f"   ✅ Fetched {len(all_opportunities)} opportunities")
@@ -53,18 +49,8 @@ async def test_funding_trend_scanner():
         time_window_days = 90
         cutoff_date = datetime.now() - timedelta(days=time_window_days)
         
-        filtered_opportunities = []
-        for opp in all_opportunities:
-            if opp.summary.post_date:
-                try:
-                    post_date = datetime.fromisoformat(opp.summary.post_date.replace("Z", "+00:00"))
-                    if post_date >= cutoff_date:
-                        filtered_opportunities.append(opp)
-                except:
-                    filtered_opportunities.append(opp)
-            else:
-                # Include forecasted opportunities
-                filtered_opportunities.append(opp)
+        # Forecasted opportunities without a post date are included
+        filtered_opportunities = filter_by_post_date(all_opportunities, cutoff_date)
         
         print(f"   ✅ Filtered to {len(filtered_opportunities)} opportunities within {time_window_days} days")
         
@@ -72,23 +58,26 @@ async def test_funding_trend_scanner():
         print("\n3. Testing trend analysis functions...")
         
         if filtered_opportunities:
-            temporal_trends = analyze_temporal_trends(filtered_opportunities, time_window_days)
-            print(f"   ✅ Temporal trends analyzed")
+            # Award amounts are extracted once and shared, as the tool does
+            awards = award_columns(filtered_opportunities)
             
-            funding_patterns = identify_funding_patterns(filtered_opportunities)
+            # The analyses are independent, so run them concurrently as the tool does
+            temporal_trends, funding_patterns, emerging_topics = await asyncio.gather(
+                asyncio.to_thread(
+                    analyze_temporal_trends, filtered_opportunities, time_window_days, awards
+                ),
+                asyncio.to_thread(identify_funding_patterns, filtered_opportunities, awards),
+                asyncio.to_thread(detect_emerging_topics, filtered_opportunities),
+            )
+            print(f"   ✅ Temporal trends analyzed")
             print(f"   ✅ Funding patterns identified")
-            
-            emerging_topics = detect_emerging_topics(filtered_opportunities)
             print(f"   ✅ Emerging topics detected")
             
             # Test report generation
             metadata = {
                 "total_opportunities": len(filtered_opportunities),
                 "time_window_days": time_window_days,
-                "total_funding": sum(
-                    opp.summary.estimated_total_program_funding or 0
-                    for opp in filtered_opportunities
-                ),
+                "total_funding": np.nansum(awards["estimated_total_program_funding"]).item(),
             }
             
             report = format_funding_trends_report(
@@ -103,9 +92,8 @@ async def test_funding_trend_scanner():
             # Show a snippet of the report
             print("\n4. Sample report output:")
             print("-" * 40)
-            lines = report.split('\n')[:15]
-            for line in lines:
-                print(line)
+            lines = report.split('\n', 15)[:15]
+            print("\n".join(lines))
             print("...")
         
         print("\n" + "=" * 40)
@@ -120,10 +108,3 @@ async def test_funding_trend_scanner():
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
-        
-    finally:
-        await api_client.close()
-
-
-if __name__ == "__main__":
-    asyncio.run(test_funding_trend_scanner())
\ No newline at end of file
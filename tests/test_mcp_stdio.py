@@ -1,28 +1,77 @@
 #!/usr/bin/env python3
 """Test MCP server with stdio transport (simulates Claude Desktop)."""
 
+import asyncio
 import json
-import subprocess
 import sys
-import time
 
-def test_mcp_stdio():
+import pytest
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Optional, and unavailable on Windows
+    uvloop = None
+
+# Seconds to wait for a response; the first one also waits on server startup
+STARTUP_TIMEOUT = 10
+RESPONSE_TIMEOUT = 5
+
+
+def encode_frame(message):
+    """Encode a JSON-RPC message as a newline-terminated frame."""
+    if orjson is not None:
+        return orjson.dumps(message) + b"\n"
+    return json.dumps(message).encode() + b"\n"
+
+
+def decode_frame(line):
+    """Decode a JSON-RPC message from a frame the server wrote."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+async def send_requests(proc, *requests):
+    """Send JSON-RPC requests to the server in a single write."""
+    proc.stdin.write(b"".join(map(encode_frame, requests)))
+    await proc.stdin.drain()
+
+
+async def read_line(proc, timeout=RESPONSE_TIMEOUT):
+    """Wait for the next line the server writes, empty once it has exited."""
+    return await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+
+
+async def drain(stream, buffer):
+    """Read a stream into a buffer until it closes, so its pipe never fills up."""
+    while chunk := await stream.read(4096):
+        buffer += chunk
+
+
+@pytest.mark.asyncio
+async def test_mcp_stdio():
     """Test the MCP server with stdio transport."""
     print("Testing MCP Server with stdio transport...")
     print("=" * 50)
-    
+
     # Start the MCP server as a subprocess
-    proc = subprocess.Popen(
-        [sys.executable, "main.py"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "main.py",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
     )
-    
+    # The server logs to stderr throughout; drain it so a full pipe cannot stall it
+    stderr_buf = bytearray()
+    stderr_drain = asyncio.create_task(drain(proc.stderr, stderr_buf))
+
     try:
-        # Send an initialize request (MCP protocol)
+        # An initialize request (MCP protocol) and a list tools request
         init_request = {
             "jsonrpc": "2.0",
             "id": 1,
@@ -36,70 +85,64 @@ def test_mcp_stdio():
                 }
             }
         }
-        
-        print(f"Sending initialize request...")
-        proc.stdin.write(json.dumps(init_request) + "\n")
-        proc.stdin.flush()
-        
-        # Give it time to process
-        time.sleep(2)
-        
-        # Check if process is still running
-        if proc.poll() is not None:
-            stderr = proc.stderr.read()
-            stdout = proc.stdout.read()
-            print(f"Server exited with code {proc.returncode}")
-            print(f"STDERR: {stderr[:500]}")
-            print(f"STDOUT: {stdout[:500]}")
-            return False
-        
-        print("✅ Server is running and accepting connections")
-        
-        # Send a list tools request
         list_tools = {
             "jsonrpc": "2.0",
             "id": 2,
             "method": "tools/list",
             "params": {}
         }
-        
-        print(f"Sending tools/list request...")
-        proc.stdin.write(json.dumps(list_tools) + "\n")
-        proc.stdin.flush()
-        
-        time.sleep(1)
-        
+
+        print(f"Sending initialize and tools/list requests...")
+        await send_requests(proc, init_request, list_tools)
+        line = await read_line(proc, timeout=STARTUP_TIMEOUT)
+
+        # End of output instead of a response means the server exited
+        if not line:
+            await proc.wait()
+            await stderr_drain
+            stderr = stderr_buf.decode()
+            stdout = (await proc.stdout.read()).decode()
+            pytest.fail(
+                f"Server exited with code {proc.returncode}\n"
+                f"STDERR: {stderr[:500]}\n"
+                f"STDOUT: {stdout[:500]}"
+            )
+
+        response_ids = {decode_frame(line)["id"]}
+        print("✅ Server is running and accepting connections")
+
+        response_ids.add(decode_frame(await read_line(proc))["id"])
+        assert response_ids == {init_request["id"], list_tools["id"]}
+
         # Terminate the server
         proc.terminate()
-        proc.wait(timeout=5)
-        
+        await asyncio.wait_for(proc.wait(), timeout=5)
+        await stderr_drain
+
         # Read any output
-        stderr = proc.stderr.read()
-        
+        stderr = stderr_buf.decode()
+
         # Check for errors in stderr
         if "ERROR" in stderr and "Already running asyncio" not in stderr:
             print(f"⚠️  Errors found in server log:")
             print(stderr[:500])
         else:
             print("✅ Server ran without critical errors")
-        
+
         print("\n" + "=" * 50)
         print("MCP server is working correctly!")
         print("\nTo use with Claude Desktop:")
         print("1. Restart Claude Desktop")
         print("2. Check for 'grantsmanship' in the MCP tools")
         print("3. Try: 'Search for renewable energy grants'")
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error during test: {e}")
-        proc.terminate()
-        return False
+
     finally:
-        if proc.poll() is None:
+        if proc.returncode is None:
             proc.terminate()
+            await proc.wait()
+        await stderr_drain
 
 if __name__ == "__main__":
-    success = test_mcp_stdio()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    # Use uvloop when it is installed, like the async tests under pytest
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(test_mcp_stdio())
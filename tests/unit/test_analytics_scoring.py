@@ -2,6 +2,8 @@
 
 import pytest
 import asyncio
+import json
+import numpy as np
 from datetime import datetime
 from unittest.mock import Mock, AsyncMock
 
@@ -10,7 +12,7 @@ from mcp_server.tools.analytics.metrics.competition_metrics import CompetitionIn
 from mcp_server.tools.analytics.metrics.success_metrics import SuccessProbabilityCalculator
 from mcp_server.tools.analytics.metrics.roi_metrics import ROICalculator
 from mcp_server.tools.analytics.metrics.timing_metrics import TimingCalculator
-from mcp_server.tools.analytics.scoring_engine import GrantScoringEngine
+from mcp_server.tools.analytics.scoring_engine import GrantScoringEngine, SCORE_COMPONENTS
 
 
 @pytest.fixture
@@ -201,6 +203,57 @@ class TestTimingCalculator:
         invalid = self.calculator.parse_deadline("invalid-date")
         assert invalid is None
     
+    def test_deadline_batch_parsing(self):
+        """Test batch deadline parsing against single deadline parsing."""
+        close_dates = [
+            "2024-06-15", " 2024-06-20T23:59:59", "2024-06-25 12:00:00", "06/30/2024",
+            "March 1, 2024", "2024-02-30", "invalid-date", "", None
+        ]
+        
+        deadlines = self.calculator.parse_deadlines_batch(close_dates)
+        
+        expected = [self.calculator.parse_deadline(d) for d in close_dates]
+        assert [None if np.isnat(d) else d.item() for d in deadlines] == expected
+        
+        # Each deadline counts the deadlines within two weeks, itself included
+        concurrent = self.calculator.count_concurrent_deadlines_batch(deadlines)
+        assert concurrent.tolist() == [3, 4, 4, 3, 1, 0, 0, 0, 0]
+        for close_date, count in zip(close_dates, concurrent.tolist()):
+            assert self.calculator.assess_deadline_competition(
+                close_date, close_dates, concurrent_count=count
+            ) == self.calculator.assess_deadline_competition(close_date, close_dates)
+    
+    def test_concurrent_deadlines_batch_with_time_of_day(self):
+        """Test batch concurrent counts on deadlines with a time of day."""
+        close_dates = [
+            "2026-12-01T00:00:00", "2026-12-15T12:00:00", "2026-12-15T00:00:00",
+            "2026-11-16T12:00:00", "2026-11-16T00:00:00"
+        ]
+        
+        deadlines = self.calculator.parse_deadlines_batch(close_dates)
+        concurrent = self.calculator.count_concurrent_deadlines_batch(deadlines)
+        
+        factors = [
+            self.calculator.assess_deadline_competition(d, close_dates, concurrent_count=count)
+            for d, count in zip(close_dates, concurrent.tolist())
+        ]
+        assert factors == [
+            self.calculator.assess_deadline_competition(d, close_dates) for d in close_dates
+        ]
+    
+    def test_days_until_deadline_with_reference_time(self):
+        """Test that days remaining are counted from the given reference time."""
+        now = datetime(2024, 6, 1, 12, 0, 0)
+        close_dates = ["2024-06-15", "06/30/2024", "2024-05-01", "invalid-date"]
+        
+        days = [self.calculator.calculate_days_until_deadline(d, now) for d in close_dates]
+        assert days == [13, 28, 0, None]
+        
+        batch_days = self.calculator.calculate_days_until_deadline_batch(
+            self.calculator.parse_deadlines_batch(close_dates), now
+        )
+        assert [None if np.isnan(d) else int(d) for d in batch_days] == days
+    
     def test_optimal_preparation_days(self):
         """Test optimal preparation time calculation."""
         optimal_days = self.calculator.get_optimal_preparation_days(
@@ -270,6 +323,17 @@ class TestGrantScoringEngine:
         assert abs(sum(weights.values()) - 1.0) < 0.01  # Should still sum to 1.0
         assert all(0 <= weight <= 1 for weight in weights.values())
     
+    def test_weight_vector(self, user_profile):
+        """Test the cached weight vector follows the custom weights."""
+        weights = self.scoring_engine.get_custom_weights(user_profile)
+        weight_vector = self.scoring_engine.get_weight_vector(user_profile)
+        
+        assert weight_vector.tolist() == [weights[c] for c in SCORE_COMPONENTS]
+        assert self.scoring_engine.get_weight_vector(dict(user_profile)) is weight_vector
+        assert self.scoring_engine.get_weight_vector(
+            {**user_profile, "career_stage": "senior"}
+        ) is not weight_vector
+    
     def test_recommendation_generation(self, sample_opportunity):
         """Test recommendation generation."""
         component_scores = {
@@ -288,6 +352,34 @@ class TestGrantScoringEngine:
         assert len(recommendation) > 0
         assert "RECOMMENDED" in recommendation or "PRIORITY" in recommendation or "CONDITIONAL" in recommendation
     
+    def test_batch_score_vectorized_matches_scalar(self, sample_opportunity, user_profile):
+        """Test vectorized base metrics against the per-opportunity calculators."""
+        sparse_opportunity = sample_opportunity.model_copy(update={
+            "agency_code": "NIH-NCI",
+            "summary": OpportunitySummary(close_date="not a date", funding_category="Health")
+        })
+        opportunities = [sample_opportunity, sparse_opportunity]
+        
+        precomputed = self.scoring_engine._batch_score_vectorized(opportunities, user_profile)
+        
+        engine = self.scoring_engine
+        for opportunity, metrics in zip(opportunities, precomputed):
+            competition = engine.competition_calculator.calculate_competition_score(opportunity)
+            success = engine.success_calculator.calculate_success_probability_score(
+                opportunity, competition.components["estimated_applications"], user_profile
+            )
+            roi = engine.roi_calculator.calculate_roi_score(opportunity, success.value, user_profile)
+            timing = engine.timing_calculator.calculate_timing_score(opportunity, user_profile)
+        
+            assert metrics["estimated_applications"] == competition.components["estimated_applications"]
+            assert metrics["basic_ci"] == competition.components["basic_ci"]
+            assert metrics["base_sps"] == success.components["base_success_probability"]
+            assert metrics["application_cost"] == roi.components["application_cost"]
+            assert metrics["basic_roi"] == roi.components["basic_roi"]
+            assert metrics["days_available"] == timing.components["days_available"]
+            assert metrics["optimal_days"] == timing.components["optimal_days"]
+            assert metrics["preparation_adequacy"] == timing.components["preparation_adequacy"]
+    
     @pytest.mark.asyncio
     async def test_single_opportunity_scoring(self, sample_opportunity, user_profile, mock_db_manager):
         """Test scoring a single opportunity."""
@@ -322,6 +414,7 @@ class TestGrantScoringEngine:
         assert len(batch_result.scores) <= 1
         assert batch_result.scoring_time_ms > 0
         assert isinstance(batch_result.cache_hit_rate, float)
+        mock_db_manager.store_grant_scores_batch.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -351,5 +444,33 @@ async def test_database_integration():
     assert retrieved["overall_score"] == 75.5
 
 
+
+@pytest.mark.asyncio
+async def test_database_batch_store(tmp_path):
+    """Test storing a batch of grant scores in one transaction."""
+    from mcp_server.tools.analytics.database.session_manager import AsyncSQLiteManager
+    
+    db_manager = AsyncSQLiteManager(str(tmp_path / "analytics.db"))
+    await db_manager.initialize()
+    
+    stored = await db_manager.store_grant_scores_batch([
+        (
+            f"test-{i}", f"Test Grant {i}", 70.0 + i, {"technical_fit": 80.0},
+            {"test": i, "probability": np.float64(0.5)}, "Good opportunity"
+        )
+        for i in range(3)
+    ])
+    assert stored is True
+    
+    retrieved = await db_manager.get_grant_score("test-2", max_age_hours=24)
+    assert retrieved is not None
+    assert retrieved["overall_score"] == 72.0
+    assert retrieved["technical_fit_score"] == 80.0
+    assert json.loads(retrieved["score_breakdown"]) == {"test": 2, "probability": 0.5}
+    
+    assert await db_manager.store_grant_scores_batch([]) is True
+    await db_manager.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -65,6 +65,35 @@ class TestInMemoryCache:
         assert cache.get("key3") == "value3"  # Still exists
         assert cache.get("key4") == "value4"  # Newly added
     
+    def test_cache_overwrite_at_capacity_does_not_evict(self):
+        """Test that updating an existing key in a full cache keeps every entry."""
+        cache = InMemoryCache(ttl=60, max_size=2)
+        
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key1", "updated")
+        
+        assert cache.get("key1") == "updated"
+        assert cache.get("key2") == "value2"
+        assert cache.get_stats()["evictions"] == 0
+    
+    def test_cache_admission_protects_popular_entries(self):
+        """Test that with admission on, one-off keys cannot evict popular ones."""
+        cache = InMemoryCache(ttl=60, max_size=2, admission=True)
+        
+        cache.set("popular1", "value1")
+        cache.set("popular2", "value2")
+        for _ in range(5):
+            cache.get("popular1")
+            cache.get("popular2")
+        
+        for i in range(10):
+            cache.set(f"one_off{i}", f"value{i}")
+        
+        assert cache.get("popular1") == "value1"
+        assert cache.get("popular2") == "value2"
+        assert cache.get_stats()["rejections"] == 10
+    
     def test_cache_handles_concurrent_access(self):
         """Test thread-safe cache operations."""
         cache = InMemoryCache(ttl=60, max_size=100)
@@ -102,6 +131,37 @@ class TestInMemoryCache:
         for i in range(50):
             assert cache.get(f"key{i}") == f"value{i}"
     
+    def test_cache_counts_concurrent_lookups_exactly(self):
+        """Test that lock-free lookups from many threads are all counted."""
+        cache = InMemoryCache(ttl=60, max_size=10)
+        cache.set("key", "value")
+        
+        def lookup(_):
+            for _ in range(1000):
+                cache.get("key")
+                cache.get("missing")
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lookup, range(8)))
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 8000
+        assert stats["misses"] == 8000
+    
+    def test_cache_keeps_counts_of_finished_threads(self):
+        """Test that lookups from threads that have exited stay counted."""
+        cache = InMemoryCache(ttl=60, max_size=10)
+        cache.set("key", "value")
+        
+        for _ in range(20):
+            thread = threading.Thread(target=cache.get, args=("key",))
+            thread.start()
+            thread.join()
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 20
+        assert stats["misses"] == 0
+    
     def test_cache_generate_key(self):
         """Test cache key generation."""
         # Same arguments should produce same key
@@ -219,6 +279,23 @@ class TestInMemoryCache:
         assert cache.get("key1") is None
         assert cache.get("key2") == "value2"
     
+    def test_cache_drops_expired_before_evicting(self):
+        """Test that a full cache drops expired entries instead of evicting live ones."""
+        cache = InMemoryCache(ttl=1, max_size=2)
+        
+        cache.set("old", "value")
+        cache.get("old")  # Referenced, so CLOCK alone would spare it
+        time.sleep(1.1)
+        
+        cache.set("live", "value")
+        cache.set("new", "value")
+        
+        assert cache.get("live") == "value"
+        assert cache.get("new") == "value"
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["evictions"] == 0
+    
     def test_cache_contains(self):
         """Test cache containment check."""
         cache = InMemoryCache(ttl=60, max_size=10)